@@ -0,0 +1,69 @@
+"""Benchmark de la búsqueda de clientes por prefijo con --clientes clientes.
+
+Compara recorrer la lista comparando prefijos (lo único posible antes) contra
+IndicePrefijos, para prefijos de distinto largo, y mide el armado del índice y
+las altas incrementales.
+
+Uso: python benchmarks/bench_busqueda.py [--clientes 1000000] [--consultas 2000] [--limite 25]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from busqueda import IndicePrefijos, normalizar
+from cliente import Cliente
+
+NOMBRES = ["Ana", "Juan", "María", "José", "Lucía", "Martín", "Sofía", "Diego", "Valentina", "Tomás",
+           "Camila", "Mateo", "Julieta", "Nicolás", "Florencia", "Joaquín", "Agustina", "Facundo"]
+APELLIDOS = ["González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez",
+             "García", "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=2_000)
+    parser.add_argument("--limite", type=int, default=25)
+    args = parser.parse_args()
+
+    azar = random.Random(1)
+    # apellidos con un sufijo para que haya muchos distintos
+    clientes = [Cliente._sin_validar(azar.choice(NOMBRES), f"{azar.choice(APELLIDOS)}{i % 5000}",
+                                     str(10_000_000 + i)) for i in range(args.clientes)]
+
+    indice = IndicePrefijos()
+    inicio = time.perf_counter()
+    indice.agregar_lote(clientes[:-1000])
+    print(f"Armado del índice: {time.perf_counter() - inicio:.2f}s para {args.clientes - 1000:,} clientes")
+    inicio = time.perf_counter()
+    for cliente in clientes[-1000:]:
+        indice.agregar(cliente)
+    print(f"Alta incremental:  {(time.perf_counter() - inicio) / 1000 * 1e6:.1f} µs/cliente (con fusiones)")
+
+    for consulta in ["g", "gom", "gomez12", "1000", "sofia perez3"]:
+        terminos = normalizar(consulta).split()
+        inicio = time.perf_counter()
+        esperado = []
+        # lo que había que hacer sin índice: recorrer todos los clientes
+        for c in clientes:
+            palabras = normalizar(f"{c.nombre} {c.apellido}").split() + [c.dni]
+            if all(any(p.startswith(t) for p in palabras) for t in terminos):
+                esperado.append(c.dni)
+                if len(esperado) == args.limite:
+                    break
+        t_lineal = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for _ in range(args.consultas):
+            resultado = indice.buscar(consulta, args.limite)
+        t_indice = (time.perf_counter() - inicio) / args.consultas
+        assert len(resultado) == len(esperado)
+        print(f"{consulta!r:>16}: recorrido {t_lineal * 1e3:9.2f} ms | índice {t_indice * 1e3:7.3f} ms "
+              f"({len(resultado)} resultados)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark de la caché de reportes: pedido repetido de un cliente sin cambios.
+
+Sin fpdf2 se mide solo el acierto (clave por versiones + búsqueda LRU) con un
+contenido de relleno; con fpdf2 también el costo de generar el PDF.
+
+Uso: python benchmarks/bench_cache_reportes.py [--pedidos 100000] [--clientes 1000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import reporte_pdf
+from almacenamiento import Banco
+from reporte_pdf import CacheReportes, PDFGenerator, clave_reporte
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    parser.add_argument("--clientes", type=int, default=1_000)
+    args = parser.parse_args()
+
+    banco = Banco()
+    for i in range(args.clientes):
+        dni = str(10_000_000 + i)
+        banco.crear_cliente("Bench", "Cache", dni)
+        banco.crear_cuenta_ahorro(dni).ingresar(100)
+        banco.crear_cuenta_corriente(dni).ingresar(50)
+    clientes = [(c, banco.listar_cuentas_por_cliente(c.dni)) for c in banco.listar_clientes()]
+
+    if reporte_pdf.FPDF is not None:
+        generador = PDFGenerator()
+        inicio = time.perf_counter()
+        for cliente, cuentas in clientes[:50]:
+            generador.generar_pdf_bytes(cliente, cuentas)
+        print(f"Generar PDF:      {(time.perf_counter() - inicio) / 50 * 1e3:10.2f} ms/reporte")
+        generar = generador.generar_desde_datos
+    else:
+        print("fpdf2 no está instalado: se usa un contenido de relleno de 2 KiB")
+        generar = None
+
+    cache = CacheReportes(max_bytes=256 * 2 ** 20)
+    azar = random.Random(1)
+    pedidos = [azar.choice(clientes) for _ in range(args.pedidos)]
+    inicio = time.perf_counter()
+    for cliente, cuentas in pedidos:
+        datos = (cliente, cuentas)
+        cache.obtener(clave_reporte(cliente, cuentas),
+                      (lambda d=datos: generar(reporte_pdf.datos_cliente(*d))) if generar else (lambda: b"x" * 2048))
+    segundos = time.perf_counter() - inicio
+    estadisticas = cache.estadisticas()
+    print(f"Con caché:        {segundos / args.pedidos * 1e6:10.2f} µs/pedido promedio "
+          f"({estadisticas['tasa_aciertos']:.1%} aciertos, {estadisticas['bytes'] / 2 ** 20:.1f} MiB)")
+
+    inicio = time.perf_counter()
+    for cliente, cuentas in pedidos:
+        cache.obtener(clave_reporte(cliente, cuentas), lambda: b"")
+    print(f"Solo aciertos:    {(time.perf_counter() - inicio) / args.pedidos * 1e6:10.2f} µs/pedido")
+
+
+if __name__ == "__main__":
+    main()
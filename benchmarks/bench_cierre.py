@@ -0,0 +1,84 @@
+"""Benchmark del cierre diario: tiempo real según la cantidad de procesos del pool.
+
+Arma un banco con --cuentas cuentas (mitad de ahorro, mitad corrientes en
+descubierto) y corre el cierre sin pool y con 1, 2, 4... procesos hasta
+--procesos (por defecto, los núcleos disponibles). Con --sqlite el banco se
+guarda en un archivo y cada corrida parte de una copia: los procesos leen sus
+cuentas del archivo y el proceso principal solo reparte números y asienta.
+
+Uso: python benchmarks/bench_cierre.py [--cuentas 200000] [--procesos 8] [--shard 10000] [--sqlite]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cierre_diario import cierre_diario
+from cliente import Cliente
+from cuenta import CuentaAhorro, CuentaCorriente
+from transaccion import fecha_a_ns
+
+FECHA = date(2024, 5, 31)
+
+
+def armar_banco(cuentas: int, motor=None) -> Banco:
+    azar = random.Random(1)
+    banco = Banco(motor)
+    clientes = [Cliente._sin_validar("Bench", "Cierre", str(10_000_000 + i)) for i in range(cuentas // 2)]
+    ahorros = [CuentaAhorro(c, 0.0001) for c in clientes]
+    corrientes = [CuentaCorriente(c, 5_000) for c in clientes]
+    banco.agregar_lote(clientes, ahorros + corrientes)
+    # unos movimientos durante el día para que los estados tengan renglones
+    for hora in (9, 13, 17):
+        ns = fecha_a_ns(datetime(FECHA.year, FECHA.month, FECHA.day, hora))
+        banco.acreditar_en_bloque([(c, round(azar.uniform(1, 1_000), 2)) for c in ahorros], ns)
+        banco.acreditar_en_bloque([(c, -round(azar.uniform(1, 1_000), 2)) for c in corrientes], ns)
+    return banco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuentas", type=int, default=200_000)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard", type=int, default=10_000)
+    parser.add_argument("--sqlite", action="store_true", help="banco en un archivo SQLite en lugar de en memoria")
+    args = parser.parse_args()
+
+    print(f"{args.cuentas} cuentas {'en SQLite' if args.sqlite else 'en memoria'}, shards de {args.shard}, "
+          f"{os.cpu_count()} núcleos")
+    base = None
+    niveles = [0] + [p for p in (1, 2, 4, 8, 16, 32, 64) if p <= args.procesos]
+    with tempfile.TemporaryDirectory() as trabajo:
+        original = os.path.join(trabajo, "original.db")
+        if args.sqlite:
+            motor = MotorSQLite(original)
+            armar_banco(args.cuentas, motor)
+            motor.cerrar()
+        for procesos in niveles:
+            motor = None
+            if args.sqlite:
+                copia = os.path.join(trabajo, f"cierre-{procesos}.db")
+                shutil.copy(original, copia)
+                motor = MotorSQLite(copia)
+            banco = armar_banco(args.cuentas) if motor is None else Banco(motor)
+            salida = os.path.join(trabajo, f"estados-{procesos}")
+            resumen = cierre_diario(banco, FECHA, salida, procesos=procesos, tam_shard=args.shard)
+            if motor is not None:
+                motor.cerrar()
+            base = base or resumen["segundos"]
+            etapas = "  ".join(f"{k} {v:.1f}s" for k, v in resumen["etapas"].items())
+            nombre = "sin pool" if procesos == 0 else f"{procesos} procesos"
+            print(f"{nombre:<12} {resumen['segundos']:7.2f}s  {resumen['cuentas_por_segundo']:>9,.0f} cuentas/s  "
+                  f"x{base / resumen['segundos']:.2f}  [{etapas}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Prueba de estrés: N hilos operando sobre M cuentas compartidas.
+
+Cada hilo deposita y retira montos al azar en cuentas al azar (los retiros sin
+saldo se rechazan). Al final verifica que el saldo de cada cuenta sea igual a la
+suma de su libro mayor y a la suma de las operaciones aceptadas.
+
+Uso: python benchmarks/bench_concurrencia.py [--hilos 8] [--cuentas 100] [--ops 20000] [--db banco.db]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--cuentas", type=int, default=100)
+    parser.add_argument("--ops", type=int, default=20_000, help="operaciones por hilo")
+    parser.add_argument("--db", help="usar MotorSQLite en este archivo (se borra antes)")
+    args = parser.parse_args()
+
+    if args.db:
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + sufijo):
+                os.remove(args.db + sufijo)
+        banco = Banco(MotorSQLite(args.db))
+    else:
+        banco = Banco()
+    numeros = []
+    for i in range(args.cuentas):
+        dni = str(10_000_000 + i)
+        banco.crear_cliente("Nombre", "Apellido", dni)
+        numeros.append(banco.crear_cuenta_ahorro(dni).numero_cuenta)
+
+    # neto aceptado por hilo y por cuenta: se suma al final, sin compartir estado
+    netos = [dict.fromkeys(numeros, 0) for _ in range(args.hilos)]
+    rechazos = [0] * args.hilos
+    barrera = threading.Barrier(args.hilos + 1)
+
+    def trabajar(indice: int):
+        azar = random.Random(indice)
+        neto = netos[indice]
+        barrera.wait()
+        for _ in range(args.ops):
+            numero = azar.choice(numeros)
+            cuenta = banco.buscar_cuenta_por_num(numero)
+            monto = azar.randint(1, 100)
+            if azar.random() < 0.5:
+                cuenta.ingresar(monto)
+                neto[numero] += monto
+            else:
+                try:
+                    cuenta.retirar(monto)
+                    neto[numero] -= monto
+                except ValueError:
+                    rechazos[indice] += 1
+
+    hilos = [threading.Thread(target=trabajar, args=(i,)) for i in range(args.hilos)]
+    for h in hilos:
+        h.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.join()
+    duracion = time.perf_counter() - inicio
+
+    errores = 0
+    for numero in numeros:
+        cuenta = banco.buscar_cuenta_por_num(numero)
+        esperado = sum(neto[numero] for neto in netos)
+        if cuenta.saldo != cuenta.libro.suma_deltas() or cuenta.saldo != esperado or cuenta.saldo < 0:
+            errores += 1
+            print(f"Inconsistente {numero}: saldo={cuenta.saldo} libro={cuenta.libro.suma_deltas()} esperado={esperado}")
+    total = args.hilos * args.ops
+    print(f"{args.hilos} hilos x {args.ops} ops sobre {args.cuentas} cuentas: "
+          f"{total / duracion:,.0f} ops/s, {sum(rechazos)} retiros rechazados")
+    print("OK: todos los saldos coinciden con su libro" if not errores else f"ERROR: {errores} cuentas inconsistentes")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
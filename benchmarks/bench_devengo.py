@@ -0,0 +1,85 @@
+"""Benchmark de puesta al día de intereses tras períodos sin devengar.
+
+Cada cuenta tiene un depósito inicial y algunos movimientos repartidos en el año;
+se comparan --dias llamadas a aplicar_interes (simulando cada cierre diario, con
+los movimientos intercalados) contra una sola llamada a devengar_interes.
+
+Uso: python benchmarks/bench_devengo.py [--cuentas 2000] [--dias 365]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cliente import Cliente
+from cuenta import CuentaAhorro
+from transaccion import Transaccion
+
+INICIO = datetime(2024, 1, 1)
+
+
+def armar_movimientos(cuentas: int, dias: int):
+    azar = random.Random(1)
+    planes = []
+    for _ in range(cuentas):
+        plan = [(INICIO, round(azar.uniform(100, 10_000), 2))]
+        for _ in range(azar.randint(0, 12)):
+            plan.append((INICIO + timedelta(days=azar.uniform(0, dias)), round(azar.uniform(1, 500), 2)))
+        planes.append(sorted(plan))
+    return planes
+
+
+def nueva_cuenta(plan, hasta=None):
+    cuenta = CuentaAhorro(Cliente._sin_validar("Bench", "Devengo", "10000000"), tasa_interes=0.0001)
+    for fecha, monto in plan:
+        if hasta is None or fecha <= hasta:
+            cuenta._aplicar([(Transaccion("DEP", monto, fecha), monto)])
+    return cuenta
+
+
+def por_periodo(plan, dias: int) -> float:
+    # lo que había que hacer para ponerse al día: un aplicar_interes por cierre
+    cuenta = nueva_cuenta(plan[:1])
+    pendientes = plan[1:]
+    for dia in range(1, dias + 1):
+        cierre = INICIO + timedelta(days=dia)
+        while pendientes and pendientes[0][0] <= cierre:
+            fecha, monto = pendientes.pop(0)
+            cuenta._aplicar([(Transaccion("DEP", monto, fecha), monto)])
+        cuenta.aplicar_interes()
+    return cuenta.saldo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuentas", type=int, default=2_000)
+    parser.add_argument("--dias", type=int, default=365)
+    args = parser.parse_args()
+
+    planes = armar_movimientos(args.cuentas, args.dias)
+    hasta = INICIO + timedelta(days=args.dias, hours=1)
+
+    inicio = time.perf_counter()
+    esperados = [por_periodo(plan, args.dias) for plan in planes]
+    t_periodos = time.perf_counter() - inicio
+
+    cuentas = [nueva_cuenta(plan) for plan in planes]
+    inicio = time.perf_counter()
+    for cuenta in cuentas:
+        cuenta.devengar_interes(hasta)
+    t_cerrada = time.perf_counter() - inicio
+
+    for cuenta, esperado in zip(cuentas, esperados):
+        assert abs(cuenta.saldo - esperado) < 1e-6 * max(1.0, abs(esperado))
+    print(f"{args.cuentas} cuentas, {args.dias} períodos diarios sin devengar")
+    print(f"aplicar_interes por período: {args.cuentas / t_periodos:>12,.0f} cuentas/s")
+    print(f"devengar_interes (cerrada):  {args.cuentas / t_cerrada:>12,.0f} cuentas/s "
+          f"({t_periodos / t_cerrada:,.0f}x, mismos saldos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark del extracto completo de una cuenta con --movimientos movimientos.
+
+Mide el pico de memoria (tracemalloc) y el tiempo de recorrer todo el extracto
+página por página, de armar la lista completa de transacciones y de escribir el
+PDF completo a disco con PDFGenerator.generar_extracto. El PDF se genera dos
+veces: una sin tracemalloc para el tiempo (tracemalloc lo hace ~10 veces más
+lento) y otra con tracemalloc para el pico.
+
+Uso: python benchmarks/bench_extracto.py [--movimientos 1000000] [--filas 40] [--sin-pdf]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import reporte_pdf
+from cliente import Cliente
+from cuenta import CuentaAhorro
+from libro_mayor import LibroMayor
+from reporte_pdf import PDFGenerator, paginas_de_cuenta
+from transaccion import fecha_a_ns
+
+
+def medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico / 2 ** 20
+
+
+def cronometrar(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movimientos", type=int, default=1_000_000)
+    parser.add_argument("--filas", type=int, default=40)
+    parser.add_argument("--sin-pdf", action="store_true", help="no generar el PDF")
+    args = parser.parse_args()
+    n = args.movimientos
+
+    # un movimiento por minuto desde 2020
+    inicio_ns = fecha_a_ns(datetime(2020, 1, 1))
+    tipos = ["DEP" if i % 3 else "RET" for i in range(n)]
+    montos = [1.0 + i % 100 for i in range(n)]
+    libro = LibroMayor()
+    libro.extender(tipos, montos, [m if t == "DEP" else -m for t, m in zip(tipos, montos)],
+                   [inicio_ns + i * 60_000_000_000 for i in range(n)])
+    del tipos, montos
+    cuenta = CuentaAhorro(Cliente("Bench", "Extracto", "10000000"))
+    cuenta._cargar_historial(libro.saldo_acumulado(), libro)
+    desde, hasta = datetime(2019, 1, 1), datetime(2100, 1, 1)
+
+    def paginar():
+        paginas = 0
+        for pagina in paginas_de_cuenta(cuenta, desde, hasta, args.filas):
+            paginas += 1
+            ultimo = pagina["saldo_final"]
+        return paginas, ultimo
+
+    (paginas, saldo), t_pag, pico_pag = medir(paginar)
+    assert abs(saldo - cuenta.saldo) < 1e-6
+    print(f"{n:,} movimientos, {paginas:,} páginas de {args.filas} filas")
+    print(f"Paginar en streaming: {t_pag:7.2f}s  pico {pico_pag:8.2f} MiB")
+
+    _, t_lista, pico_lista = medir(lambda: len(cuenta.obtener_transacciones()))
+    print(f"Cargar todo y cortar: {t_lista:7.2f}s  pico {pico_lista:8.2f} MiB")
+
+    if args.sin_pdf:
+        return
+    if reporte_pdf.FPDF is None:
+        print("fpdf2 no está instalado: no se mide el PDF")
+        return
+    with tempfile.TemporaryDirectory() as directorio:
+        generador = PDFGenerator("extracto.pdf", directorio)
+
+        def generar():
+            generador.generar_extracto(cuenta, desde, hasta, filas_por_pagina=args.filas)
+
+        t_pdf = cronometrar(generar)
+        _, _, pico_pdf = medir(generar)
+        tamano = (Path(directorio) / "extracto.pdf").stat().st_size / 2 ** 20
+    print(f"PDF completo a disco: {t_pdf:7.2f}s  pico {pico_pdf:8.2f} MiB  ({tamano:,.1f} MiB de PDF)")
+
+
+if __name__ == "__main__":
+    main()
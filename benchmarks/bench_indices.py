@@ -0,0 +1,52 @@
+"""Benchmark de búsquedas en Banco por DNI y número de cuenta.
+
+Uso: python benchmarks/bench_indices.py [--clientes 1000000] [--consultas 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    banco = Banco()
+    inicio = time.perf_counter()
+    for i in range(args.clientes):
+        banco.crear_cliente("Nombre", "Apellido", str(10_000_000 + i))
+    t_clientes = time.perf_counter() - inicio
+    print(f"Alta de {args.clientes} clientes: {t_clientes:.2f}s ({args.clientes / t_clientes:,.0f}/s)")
+
+    inicio = time.perf_counter()
+    numeros = []
+    for i in range(0, args.clientes, 10):
+        numeros.append(banco.crear_cuenta_ahorro(str(10_000_000 + i)).numero_cuenta)
+    t_cuentas = time.perf_counter() - inicio
+    print(f"Alta de {len(numeros)} cuentas: {t_cuentas:.2f}s ({len(numeros) / t_cuentas:,.0f}/s)")
+
+    dnis = [str(10_000_000 + random.randrange(args.clientes)) for _ in range(args.consultas)]
+    inicio = time.perf_counter()
+    for dni in dnis:
+        banco.buscar_cliente_por_dni(dni)
+    t = time.perf_counter() - inicio
+    print(f"buscar_cliente_por_dni: {t / args.consultas * 1e6:.2f} µs/consulta")
+
+    muestra = [random.choice(numeros) for _ in range(args.consultas)]
+    inicio = time.perf_counter()
+    for numero in muestra:
+        banco.buscar_cuenta_por_num(numero)
+    t = time.perf_counter() - inicio
+    print(f"buscar_cuenta_por_num: {t / args.consultas * 1e6:.2f} µs/consulta")
+
+
+if __name__ == "__main__":
+    main()
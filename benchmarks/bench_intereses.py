@@ -0,0 +1,67 @@
+"""Benchmark de acreditación de intereses: aplicar_interes cuenta por cuenta vs intereses.acumular_intereses.
+
+En memoria la diferencia es chica (cada cuenta tiene su propio libro); con --db
+se mide sobre SQLite, donde el camino masivo guarda todo en una transacción.
+
+Uso: python benchmarks/bench_intereses.py [--cuentas 500000] [--db /tmp/intereses.db]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cliente import Cliente
+from cuenta import CuentaAhorro
+from intereses import acumular_intereses, np
+
+
+def armar_banco(cuentas: int, ruta_db=None) -> Banco:
+    azar = random.Random(1)
+    if ruta_db:
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(ruta_db + sufijo):
+                os.remove(ruta_db + sufijo)
+    banco = Banco(MotorSQLite(ruta_db)) if ruta_db else Banco()
+    clientes = [Cliente._sin_validar("Bench", "Intereses", str(10_000_000 + i)) for i in range(cuentas)]
+    ahorros = [CuentaAhorro(c, round(azar.uniform(0.001, 0.05), 4)) for c in clientes]
+    banco.agregar_lote(clientes, ahorros)
+    # saldos iniciales de a bloques (también en SQLite): mismos montos en cada corrida
+    saldos = [round(azar.uniform(0.01, 10_000), 2) for _ in ahorros]
+    for i in range(0, cuentas, 50_000):
+        banco.acreditar_en_bloque(list(zip(ahorros[i:i + 50_000], saldos[i:i + 50_000])))
+    return banco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cuentas", type=int, default=500_000)
+    parser.add_argument("--db", help="medir sobre SQLite en este archivo (se borra antes)")
+    args = parser.parse_args()
+
+    banco = armar_banco(args.cuentas, args.db)
+    inicio = time.perf_counter()
+    for cuenta in banco.iterar_cuentas():
+        cuenta.aplicar_interes()
+    t_suelto = time.perf_counter() - inicio
+    esperado = [c.saldo for c in banco.iterar_cuentas()]
+    print(f"aplicar_interes por cuenta: {args.cuentas / t_suelto:>12,.0f} cuentas/s")
+
+    for usar_numpy in ([False, True] if np is not None else [False]):
+        banco = armar_banco(args.cuentas, args.db)
+        resumen = acumular_intereses(banco, usar_numpy=usar_numpy)
+        assert [c.saldo for c in banco.iterar_cuentas()] == esperado
+        nombre = "NumPy" if usar_numpy else "Python puro"
+        print(f"acumular_intereses ({nombre}): {resumen['cuentas_por_segundo']:>8,.0f} cuentas/s "
+              f"(resultados idénticos)")
+    if np is None:
+        print("NumPy no está instalado: se midió solo el camino en Python puro")
+
+
+if __name__ == "__main__":
+    main()
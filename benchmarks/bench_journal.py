@@ -0,0 +1,70 @@
+"""Benchmark de throughput durable del journal según el tamaño del lote de fsync.
+
+Para cada tamaño de lote lanza tantos hilos como el lote (al menos --hilos-min),
+cada uno depositando en su propia cuenta, y mide operaciones durables por segundo.
+
+Uso: python benchmarks/bench_journal.py [--ops 20000] [--dir /tmp]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from journal import Journal
+
+
+def medir(ruta: str, tam_lote: int, ops: int, hilos: int) -> dict:
+    journal = Journal(ruta, tam_lote=tam_lote, espera_max=0.002)
+    banco = Banco(journal=journal)
+    banco.crear_cliente("Bench", "Journal", "10000000")
+    cuentas = [banco.crear_cuenta_ahorro("10000000") for _ in range(hilos)]
+    por_hilo = max(1, ops // hilos)
+    barrera = threading.Barrier(hilos + 1)
+    fsyncs_previos = journal.fsyncs
+
+    def trabajar(cuenta):
+        barrera.wait()
+        for _ in range(por_hilo):
+            cuenta.ingresar(1)
+
+    trabajadores = [threading.Thread(target=trabajar, args=(c,)) for c in cuentas]
+    for t in trabajadores:
+        t.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.join()
+    duracion = time.perf_counter() - inicio
+    fsyncs = journal.fsyncs - fsyncs_previos
+    journal.cerrar()
+    total = por_hilo * hilos
+    return {"ops": total, "segundos": duracion, "fsyncs": fsyncs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--hilos-min", type=int, default=1)
+    parser.add_argument("--dir", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    print(f"{'lote':>5} {'hilos':>6} {'ops':>8} {'fsyncs':>8} {'ops/fsync':>10} {'ops/s':>12}")
+    for tam_lote in (1, 8, 64, 512):
+        ruta = os.path.join(args.dir, f"bench_{tam_lote}.journal")
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        hilos = max(tam_lote, args.hilos_min)
+        r = medir(ruta, tam_lote, args.ops, hilos)
+        os.remove(ruta)
+        print(f"{tam_lote:>5} {hilos:>6} {r['ops']:>8} {r['fsyncs']:>8} "
+              f"{r['ops'] / max(r['fsyncs'], 1):>10.1f} {r['ops'] / r['segundos']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
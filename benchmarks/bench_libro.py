@@ -0,0 +1,54 @@
+"""Benchmark de memoria y recorrido: lista de Transaccion vs LibroMayor columnar.
+
+Uso: python benchmarks/bench_libro.py [--movimientos 1000000]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from libro_mayor import LibroMayor
+from transaccion import Transaccion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movimientos", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.movimientos
+
+    tracemalloc.start()
+    lista = [Transaccion("DEP" if i % 3 else "RET", 1.0 + i % 100) for i in range(n)]
+    memoria_lista, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    total_lista = sum(t.monto for t in lista if t.tipo == "DEP")
+    t_lista = time.perf_counter() - inicio
+
+    tipos = [t.tipo for t in lista]
+    montos = [t.monto for t in lista]
+    deltas = [m if tp == "DEP" else -m for tp, m in zip(tipos, montos)]
+    fechas = list(range(n))
+    del lista
+    tracemalloc.start()
+    libro = LibroMayor()
+    libro.extender(tipos, montos, deltas, fechas)
+    memoria_libro, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    total_libro = libro.suma_montos("DEP")
+    t_libro = time.perf_counter() - inicio
+    assert total_libro == total_lista
+
+    print(f"Lista de Transaccion: {memoria_lista / n:.0f} bytes/mov, suma DEP {t_lista * 1e3:.1f} ms")
+    print(f"LibroMayor:           {memoria_libro / n:.0f} bytes/mov, suma DEP {t_libro * 1e3:.1f} ms")
+    inicio = time.perf_counter()
+    sum(libro.deltas())
+    print(f"Suma de deltas (saldo) en LibroMayor: {(time.perf_counter() - inicio) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
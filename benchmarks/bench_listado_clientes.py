@@ -0,0 +1,59 @@
+"""Benchmark del listado de clientes: tabla completa vs una página.
+
+Para cada tamaño de banco mide cuánto tarda traer los clientes que va a mostrar
+ClienteListView y cuántos datos de filas se mandarían al navegador (JSON de las
+celdas, sin la estructura de controles de Flet, que multiplica por varias veces).
+
+Uso: python benchmarks/bench_listado_clientes.py [--clientes 5000 50000 500000] [--pagina 25] [--db /tmp/l.db]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cliente import Cliente
+
+
+def medir(funcion, repeticiones: int = 5):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        clientes = funcion()
+    segundos = (time.perf_counter() - inicio) / repeticiones
+    datos = len(json.dumps([[c.dni, c.nombre, c.apellido] for c in clientes]).encode())
+    return segundos, len(clientes), datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, nargs="+", default=[5_000, 50_000, 500_000])
+    parser.add_argument("--pagina", type=int, default=25)
+    parser.add_argument("--db", help="medir sobre SQLite en este archivo (se borra antes)")
+    args = parser.parse_args()
+
+    for n in args.clientes:
+        if args.db:
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(args.db + sufijo):
+                    os.remove(args.db + sufijo)
+        banco = Banco(MotorSQLite(args.db)) if args.db else Banco()
+        banco.agregar_lote([Cliente._sin_validar("Bench", "Listado", str(10_000_000 + i)) for i in range(n)], [])
+        if args.db:
+            # banco recién abierto: nada en memoria
+            banco._motor.cerrar()
+            banco = Banco(MotorSQLite(args.db))
+        ultima = (n - 1) // args.pagina * args.pagina
+        t_todo, filas_todo, datos_todo = medir(banco.listar_clientes, 1)
+        t_pag, filas_pag, datos_pag = medir(lambda: banco.listar_clientes_pagina(ultima, args.pagina))
+        print(f"{n:>9,} clientes | tabla completa: {t_todo * 1e3:9.2f} ms {filas_todo:>8,} filas "
+              f"{datos_todo / 1024:>9,.0f} KiB | última página: {t_pag * 1e3:7.3f} ms {filas_pag:>3} filas "
+              f"{datos_pag / 1024:5.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark de operaciones sueltas vs Banco.procesar_lote.
+
+Uso: python benchmarks/bench_lote.py [--operaciones 500000] [--cuentas 1000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+
+
+def armar_banco(cuentas: int):
+    banco = Banco()
+    numeros = []
+    for i in range(cuentas):
+        dni = str(10_000_000 + i)
+        banco.crear_cliente("Nombre", "Apellido", dni)
+        numeros.append(banco.crear_cuenta_corriente(dni, limite_descubierto=100).numero_cuenta)
+    return banco, numeros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operaciones", type=int, default=500_000)
+    parser.add_argument("--cuentas", type=int, default=1_000)
+    args = parser.parse_args()
+
+    banco, numeros = armar_banco(args.cuentas)
+    operaciones = [(random.choice(numeros), random.choice(("DEP", "DEP", "RET")), float(random.randint(1, 50)))
+                   for _ in range(args.operaciones)]
+
+    inicio = time.perf_counter()
+    rechazos = 0
+    for numero, tipo, monto in operaciones:
+        cuenta = banco.buscar_cuenta_por_num(numero)
+        try:
+            cuenta.ingresar(monto) if tipo == "DEP" else cuenta.retirar(monto)
+        except ValueError:
+            rechazos += 1
+    t_sueltas = time.perf_counter() - inicio
+    print(f"Sueltas: {args.operaciones / t_sueltas:,.0f} ops/s ({rechazos} rechazadas)")
+
+    banco, numeros_lote = armar_banco(args.cuentas)
+    traduccion = dict(zip(numeros, numeros_lote))
+    operaciones = [(traduccion[n], t, m) for n, t, m in operaciones]
+    inicio = time.perf_counter()
+    resultados = banco.procesar_lote(operaciones)
+    t_lote = time.perf_counter() - inicio
+    rechazos_lote = sum(r is not None for r in resultados)
+    print(f"Lote:    {args.operaciones / t_lote:,.0f} ops/s ({rechazos_lote} rechazadas)")
+
+
+if __name__ == "__main__":
+    main()
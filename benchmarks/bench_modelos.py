@@ -0,0 +1,48 @@
+"""Microbenchmark de construcción y RSS de Transaccion: modelo anterior vs actual.
+
+El modelo anterior es la Transaccion de sistemabancario.py (con __dict__, uuid4 y
+datetime en cada alta). Cada variante corre en un subproceso para medir su RSS.
+
+Uso: python benchmarks/bench_modelos.py [--transacciones 10000000]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+
+def medir(variante: str, n: int):
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if variante == "anterior":
+        from sistemabancario import Transaccion
+    else:
+        from transaccion import Transaccion
+    inicio = time.perf_counter()
+    transacciones = [Transaccion("DEP", 1.0) for _ in range(n)]
+    duracion = time.perf_counter() - inicio
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_inicial
+    print(f"{variante:>9}: {n / duracion:>12,.0f} altas/s  RSS +{rss / 1024:,.0f} MiB "
+          f"({rss * 1024 / n:.0f} bytes/tx)")
+    return transacciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transacciones", type=int, default=10_000_000)
+    parser.add_argument("--variante", choices=("anterior", "actual"))
+    args = parser.parse_args()
+    if args.variante:
+        medir(args.variante, args.transacciones)
+        return
+    for variante in ("anterior", "actual"):
+        subprocess.run([sys.executable, __file__, "--variante", variante,
+                        "--transacciones", str(args.transacciones)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark de navegación entre listado y detalle: vistas rearmadas vs cache de vistas.
+
+Simula una sesión que va y vuelve entre "/" y el detalle de varios clientes
+(como en main.Navegacion) y mide la latencia de cada cambio de ruta del lado del
+servidor: con --max-vistas 0 cada navegación rearma la vista (comportamiento
+anterior); con el valor por defecto se reutilizan las vistas armadas. No mide el
+viaje al navegador. Necesita Flet instalado.
+
+Uso: python benchmarks/bench_navegacion.py [--clientes 10000] [--navegaciones 2000] [--detalles 4]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from main import MAX_VISTAS, Navegacion
+
+
+class PaginaSinNavegador:
+    """Lo que las vistas usan de ft.Page, sin conexión a un navegador"""
+
+    def __init__(self):
+        self.route = "/"
+        self.controls = []
+        self.overlay = []
+        self.web = False
+        self.on_route_change = None
+
+    def go(self, ruta: str):
+        self.route = ruta
+        self.on_route_change(None)
+
+    def update(self):
+        pass
+
+
+def armar_banco(clientes: int) -> Banco:
+    banco = Banco()
+    banco.crear_clientes_lote(("Bench", f"Navegacion{i}", str(20_000_000 + i)) for i in range(clientes))
+    for dni in (str(20_000_000 + i) for i in range(min(clientes, 50))):
+        ahorro = banco.crear_cuenta_ahorro(dni)
+        corriente = banco.crear_cuenta_corriente(dni, 500.0)
+        for monto in (100, 250, 75):
+            ahorro.ingresar(monto)
+            corriente.ingresar(monto)
+    return banco
+
+
+def medir(banco: Banco, max_vistas: int, navegaciones: int, detalles: int) -> list:
+    pagina = PaginaSinNavegador()
+    navegacion = Navegacion(pagina, banco, max_vistas)
+    pagina.on_route_change = navegacion.route_change
+    rutas = ["/"] + [f"/detalle/{20_000_000 + i}" for i in range(detalles)]
+    tiempos = []
+    for i in range(navegaciones):
+        inicio = time.perf_counter()
+        pagina.go(rutas[i % len(rutas)])
+        tiempos.append(time.perf_counter() - inicio)
+    # cada vista de detalle agrega su FilePicker; las que la cache soltó lo sacaron
+    assert len(pagina.overlay) <= max(max_vistas, 1)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--navegaciones", type=int, default=2_000)
+    parser.add_argument("--detalles", type=int, default=4, help="clientes distintos cuyo detalle se visita")
+    parser.add_argument("--max-vistas", type=int, default=MAX_VISTAS)
+    args = parser.parse_args()
+
+    banco = armar_banco(args.clientes)
+    for nombre, max_vistas in (("sin cache", 0), (f"cache de {args.max_vistas} vistas", args.max_vistas)):
+        tiempos = medir(banco, max_vistas, args.navegaciones, args.detalles)
+        tiempos.sort()
+        print(f"{nombre:>20}: mediana {statistics.median(tiempos) * 1000:8.3f} ms  "
+              f"p95 {tiempos[int(len(tiempos) * 0.95)] * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
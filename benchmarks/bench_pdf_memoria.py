@@ -0,0 +1,47 @@
+"""Benchmark del reporte interactivo: PDF a disco vs PDF en memoria (requiere fpdf2).
+
+Uso: python benchmarks/bench_pdf_memoria.py [--reportes 200]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from reporte_pdf import PDFGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reportes", type=int, default=200)
+    args = parser.parse_args()
+
+    banco = Banco()
+    banco.crear_cliente("Ana", "Torres", "66666666")
+    for _ in range(2):
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        cuenta.aplicar_lote([("DEP", 10.0 + i) for i in range(50)])
+    cliente = banco.buscar_cliente_por_dni("66666666")
+    cuentas = banco.listar_cuentas_por_cliente("66666666")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = time.perf_counter()
+        for i in range(args.reportes):
+            PDFGenerator(f"cliente_{i}.pdf", directorio).generar_pdf_cliente(cliente, cuentas)
+        t_disco = (time.perf_counter() - inicio) / args.reportes
+        escritos = sum(p.stat().st_size for p in Path(directorio).iterdir())
+
+    inicio = time.perf_counter()
+    for i in range(args.reportes):
+        PDFGenerator(f"cliente_{i}.pdf").generar_pdf_bytes(cliente, cuentas)
+    t_memoria = (time.perf_counter() - inicio) / args.reportes
+
+    print(f"A disco:    {t_disco * 1e3:8.2f} ms/reporte ({escritos / 1024:,.0f} KiB escritos)")
+    print(f"En memoria: {t_memoria * 1e3:8.2f} ms/reporte (0 KiB escritos)")
+
+
+if __name__ == "__main__":
+    main()
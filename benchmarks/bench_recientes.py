@@ -0,0 +1,53 @@
+"""Benchmark del armado de la tabla "últimos movimientos" de la vista de detalle.
+
+Compara copiar el historial y recortar (lo que hacían ClienteDetailView y
+PDFGenerator) contra el buffer de movimientos recientes, para una cuenta con
+--movimientos movimientos. Las filas se formatean igual que en la vista (sin Flet).
+
+Uso: python benchmarks/bench_recientes.py [--movimientos 1000000] [--repeticiones 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cliente import Cliente
+from cuenta import CuentaAhorro
+
+
+def filas(transacciones):
+    return [(tx.fecha.strftime("%d/%m/%Y %H:%M"), tx.tipo, f"${tx.monto:,.2f}") for tx in transacciones]
+
+
+def medir(funcion, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movimientos", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    cuenta = CuentaAhorro(Cliente("Bench", "Recientes", "10000000"))
+    lote = 100_000
+    for inicio in range(0, args.movimientos, lote):
+        cuenta.aplicar_lote([("DEP", 1.0 + i % 100) for i in range(min(lote, args.movimientos - inicio))])
+
+    antes = filas(cuenta.obtener_transacciones()[-10:])
+    assert filas(cuenta.ultimas_transacciones(10)) == antes
+
+    t_copia = medir(lambda: filas(cuenta.obtener_transacciones()[-10:]), max(1, args.repeticiones // 100))
+    t_buffer = medir(lambda: filas(cuenta.ultimas_transacciones(10)), args.repeticiones)
+    print(f"Cuenta con {len(cuenta.libro):,} movimientos, tabla de 10 filas")
+    print(f"Copiar historial y recortar: {t_copia * 1e3:10.2f} ms/render")
+    print(f"Buffer de recientes:         {t_buffer * 1e3:10.3f} ms/render ({t_copia / t_buffer:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
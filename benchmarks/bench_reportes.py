@@ -0,0 +1,63 @@
+"""Benchmark de reportes PDF masivos: PDFs por segundo según la cantidad de procesos.
+
+Requiere fpdf2. Arma --clientes clientes con una cuenta de ahorro y una corriente
+con algunos movimientos cada una y genera todos los reportes sin pool y con 1, 2,
+4... procesos hasta --procesos. Con --sqlite el banco se guarda en un archivo y
+los procesos leen de ahí los movimientos de cada cliente.
+
+Uso: python benchmarks/bench_reportes.py [--clientes 5000] [--procesos 8] [--lote 100] [--sqlite]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cliente import Cliente
+from cuenta import CuentaAhorro, CuentaCorriente
+from reportes_lote import generar_reportes
+
+
+def armar_banco(clientes: int, motor=None) -> Banco:
+    banco = Banco(motor)
+    lista = [Cliente._sin_validar("Bench", "Reportes", str(10_000_000 + i)) for i in range(clientes)]
+    ahorros = [CuentaAhorro(c) for c in lista]
+    corrientes = [CuentaCorriente(c, 1_000) for c in lista]
+    banco.agregar_lote(lista, ahorros + corrientes)
+    for i in range(12):
+        banco.acreditar_en_bloque([(c, 10.0 + i) for c in ahorros])
+        banco.acreditar_en_bloque([(c, -5.0 - i) for c in corrientes])
+    return banco
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=5_000)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--lote", type=int, default=100)
+    parser.add_argument("--sqlite", action="store_true", help="banco en un archivo SQLite en lugar de en memoria")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as trabajo:
+        motor = MotorSQLite(os.path.join(trabajo, "banco.db")) if args.sqlite else None
+        banco = armar_banco(args.clientes, motor)
+        print(f"{args.clientes} clientes {'en SQLite' if args.sqlite else 'en memoria'}, lotes de {args.lote}, "
+              f"{os.cpu_count()} núcleos")
+        base = None
+        for procesos in [0] + [p for p in (1, 2, 4, 8, 16, 32, 64) if p <= args.procesos]:
+            with tempfile.TemporaryDirectory() as salida:
+                resumen = generar_reportes(banco, salida, "2024-05", procesos=procesos, tam_lote=args.lote)
+            base = base or resumen["pdfs_por_segundo"]
+            nombre = "sin pool" if procesos == 0 else f"{procesos} procesos"
+            print(f"{nombre:<12} {resumen['pdfs_por_segundo']:>8,.1f} PDFs/s  "
+                  f"x{resumen['pdfs_por_segundo'] / base:.2f}")
+        if motor is not None:
+            motor.cerrar()
+
+
+if __name__ == "__main__":
+    main()
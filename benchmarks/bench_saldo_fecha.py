@@ -0,0 +1,64 @@
+"""Benchmark de saldo a fecha: recorrer el historial vs búsqueda binaria en el libro.
+
+Uso: python benchmarks/bench_saldo_fecha.py [--movimientos 1000000] [--consultas 1000]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cliente import Cliente
+from cuenta import CuentaAhorro
+from libro_mayor import LibroMayor
+from transaccion import fecha_a_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movimientos", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=1_000)
+    args = parser.parse_args()
+    n = args.movimientos
+
+    # un movimiento por minuto desde 2020
+    inicio_ns = fecha_a_ns(datetime(2020, 1, 1))
+    fechas = [inicio_ns + i * 60_000_000_000 for i in range(n)]
+    tipos = ["DEP" if i % 3 else "RET" for i in range(n)]
+    montos = [1.0 + i % 100 for i in range(n)]
+    deltas = [m if t == "DEP" else -m for t, m in zip(tipos, montos)]
+    libro = LibroMayor()
+    libro.extender(tipos, montos, deltas, fechas)
+    cuenta = CuentaAhorro(Cliente("Bench", "Saldo", "10000000"))
+    cuenta._cargar_historial(libro.saldo_acumulado(), libro)
+
+    fin = datetime(2020, 1, 1) + timedelta(minutes=n)
+    consultas = [datetime(2020, 1, 1) + (fin - datetime(2020, 1, 1)) * random.random() for _ in range(args.consultas)]
+
+    muestras = consultas[:max(1, min(5, len(consultas)))]
+    t0 = time.perf_counter()
+    esperados = []
+    for fecha in muestras:
+        limite = fecha_a_ns(fecha)
+        # lo que había que hacer antes: recorrer las transacciones hasta la fecha
+        esperados.append(sum(t.monto if t.tipo == "DEP" else -t.monto
+                             for t in cuenta.obtener_transacciones() if t.fecha_ns <= limite))
+    t_recorrido = (time.perf_counter() - t0) / len(muestras)
+
+    t0 = time.perf_counter()
+    for fecha in consultas:
+        cuenta.saldo_a_fecha(fecha)
+    t_indice = (time.perf_counter() - t0) / len(consultas)
+    for fecha, esperado in zip(muestras, esperados):
+        assert abs(cuenta.saldo_a_fecha(fecha) - esperado) < 1e-6
+
+    print(f"{n} movimientos")
+    print(f"Recorriendo el historial: {t_recorrido * 1e3:10.2f} ms/consulta")
+    print(f"Saldo acumulado + bisect: {t_indice * 1e6:10.2f} µs/consulta ({t_recorrido / t_indice:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
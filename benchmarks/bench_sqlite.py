@@ -0,0 +1,53 @@
+"""Benchmark del motor SQLite: alta masiva y recorrido de clientes con memoria acotada.
+
+Uso: python benchmarks/bench_sqlite.py [--clientes 1000000] [--db /tmp/banco_bench.db]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=50_000)
+    parser.add_argument("--db", default="/tmp/banco_bench.db")
+    args = parser.parse_args()
+
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + sufijo):
+            os.remove(args.db + sufijo)
+
+    banco = Banco(MotorSQLite(args.db))
+    inicio = time.perf_counter()
+    for desde in range(0, args.clientes, args.lote):
+        hasta = min(desde + args.lote, args.clientes)
+        banco.crear_clientes_lote(("Nombre", "Apellido", str(10_000_000 + i)) for i in range(desde, hasta))
+    t = time.perf_counter() - inicio
+    print(f"Alta masiva de {args.clientes} clientes: {t:.2f}s ({args.clientes / t:,.0f}/s)")
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    total = sum(1 for _ in banco.iterar_clientes())
+    t = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Recorrido de {total} clientes: {t:.2f}s, pico de memoria {pico / 1024:.0f} KiB")
+
+    inicio = time.perf_counter()
+    for i in range(0, args.clientes, max(1, args.clientes // 10_000)):
+        banco.buscar_cliente_por_dni(str(10_000_000 + i))
+    t = time.perf_counter() - inicio
+    print(f"buscar_cliente_por_dni: {t / 10_000 * 1e6:.1f} µs/consulta")
+
+
+if __name__ == "__main__":
+    main()
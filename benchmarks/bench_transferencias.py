@@ -0,0 +1,79 @@
+"""Throughput de Banco.transferir con contención.
+
+Para cada cantidad de hilos, todos transfieren montos al azar entre pares al azar
+de un conjunto chico de cuentas (muchas transferencias en sentidos opuestos sobre
+las mismas cuentas). Verifica que el dinero total se conserve y que cada saldo
+coincida con su libro mayor.
+
+Uso: python benchmarks/bench_transferencias.py [--cuentas 16] [--ops 20000] [--hilos 1,2,4,8]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+
+SALDO_INICIAL = 1_000
+
+
+def medir(cuentas: int, ops: int, hilos: int) -> dict:
+    banco = Banco()
+    banco.crear_cliente("Bench", "Transferencias", "10000000")
+    numeros = []
+    for _ in range(cuentas):
+        cuenta = banco.crear_cuenta_corriente("10000000", limite_descubierto=100)
+        cuenta.ingresar(SALDO_INICIAL)
+        numeros.append(cuenta.numero_cuenta)
+    por_hilo = max(1, ops // hilos)
+    rechazos = [0] * hilos
+    barrera = threading.Barrier(hilos + 1)
+
+    def trabajar(indice: int):
+        azar = random.Random(indice)
+        barrera.wait()
+        for _ in range(por_hilo):
+            origen, destino = azar.sample(numeros, 2)
+            try:
+                banco.transferir(origen, destino, azar.randint(1, 200))
+            except ValueError:
+                rechazos[indice] += 1
+
+    trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.join()
+    duracion = time.perf_counter() - inicio
+
+    total = sum(banco.buscar_cuenta_por_num(n).saldo for n in numeros)
+    consistente = total == cuentas * SALDO_INICIAL and all(
+        c.saldo == c.libro.suma_deltas() for c in map(banco.buscar_cuenta_por_num, numeros))
+    return {"ops": por_hilo * hilos, "segundos": duracion, "rechazos": sum(rechazos), "consistente": consistente}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuentas", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=20_000, help="transferencias totales por corrida")
+    parser.add_argument("--hilos", default="1,2,4,8")
+    args = parser.parse_args()
+
+    print(f"{'hilos':>5} {'transf':>8} {'rechazos':>9} {'transf/s':>12}  conserva")
+    errores = 0
+    for hilos in (int(h) for h in args.hilos.split(",")):
+        r = medir(args.cuentas, args.ops, hilos)
+        errores += not r["consistente"]
+        print(f"{hilos:>5} {r['ops']:>8} {r['rechazos']:>9} {r['ops'] / r['segundos']:>12,.0f}  "
+              f"{'sí' if r['consistente'] else 'NO'}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
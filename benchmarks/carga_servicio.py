@@ -0,0 +1,170 @@
+"""Generador de carga para src/servicio.py.
+
+Abre --conexiones conexiones keep-alive y cada una envía pedidos seguidos
+(depósitos, retiros, consultas de cuenta e historial y, con --lote, lotes)
+hasta completar --pedidos. Informa pedidos/s y latencias p50/p99.
+
+Sin --puerto levanta su propio servicio local en otro proceso.
+
+Uso: python benchmarks/carga_servicio.py [--pedidos 20000] [--conexiones 32] [--cuentas 100] [--lote 0]
+     python benchmarks/carga_servicio.py --puerto 8080   # contra un servicio ya levantado
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+class Conexion:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def abrir(cls, host: str, puerto: int):
+        return cls(*await asyncio.open_connection(host, puerto))
+
+    async def pedir(self, metodo: str, ruta: str, datos=None):
+        cuerpo = json.dumps(datos).encode() if datos is not None else b""
+        self.writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: local\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+        await self.writer.drain()
+        estado = int((await self.reader.readline()).split()[1])
+        largo = 0
+        while True:
+            linea = await self.reader.readline()
+            if linea in (b"\r\n", b""):
+                break
+            nombre, _, valor = linea.partition(b":")
+            if nombre.lower() == b"content-length":
+                largo = int(valor)
+        respuesta = await self.reader.readexactly(largo)
+        return estado, json.loads(respuesta) if respuesta else None
+
+    def cerrar(self):
+        self.writer.close()
+
+
+async def preparar(host: str, puerto: int, cuentas: int):
+    conexion = await Conexion.abrir(host, puerto)
+    numeros = []
+    base = random.randint(10_000_000, 80_000_000)
+    for i in range(cuentas):
+        dni = str(base + i)
+        await conexion.pedir("POST", "/clientes", {"nombre": "Carga", "apellido": "Servicio", "dni": dni})
+        _, cuenta = await conexion.pedir("POST", f"/clientes/{dni}/cuentas",
+                                         {"tipo": "corriente", "limite_descubierto": 500})
+        numeros.append(cuenta["numero_cuenta"])
+        await conexion.pedir("POST", f"/cuentas/{cuenta['numero_cuenta']}/depositos", {"monto": 1000})
+    conexion.cerrar()
+    return numeros
+
+
+async def cargar(host: str, puerto: int, pedidos: int, conexiones: int, numeros, lote: int):
+    latencias = []
+    estados = Counter()
+    restantes = [pedidos]
+
+    def siguiente(azar: random.Random):
+        numero = azar.choice(numeros)
+        r = azar.random()
+        if lote and r < 0.1:
+            operaciones = [[azar.choice(numeros), azar.choice(("DEP", "RET")), azar.randint(1, 50)]
+                           for _ in range(lote)]
+            return "POST", "/lotes", {"operaciones": operaciones}
+        if r < 0.4:
+            return "POST", f"/cuentas/{numero}/depositos", {"monto": azar.randint(1, 100)}
+        if r < 0.7:
+            return "POST", f"/cuentas/{numero}/retiros", {"monto": azar.randint(1, 100)}
+        if r < 0.9:
+            return "GET", f"/cuentas/{numero}", None
+        return "GET", f"/cuentas/{numero}/historial?limite=20", None
+
+    async def cliente(indice: int):
+        azar = random.Random(indice)
+        conexion = await Conexion.abrir(host, puerto)
+        try:
+            while restantes[0] > 0:
+                restantes[0] -= 1
+                metodo, ruta, datos = siguiente(azar)
+                inicio = time.perf_counter()
+                estado, _ = await conexion.pedir(metodo, ruta, datos)
+                latencias.append(time.perf_counter() - inicio)
+                estados[estado] += 1
+        finally:
+            conexion.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i) for i in range(conexiones)))
+    return time.perf_counter() - inicio, latencias, estados
+
+
+def _percentil(ordenados, p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _esperar_servicio(host: str, puerto: int, proceso, plazo: float = 10.0):
+    limite = time.monotonic() + plazo
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError("El servicio terminó al arrancar")
+        try:
+            socket.create_connection((host, puerto), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("El servicio no respondió a tiempo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, help="servicio ya levantado (si no, se lanza uno)")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--conexiones", type=int, default=32)
+    parser.add_argument("--cuentas", type=int, default=100)
+    parser.add_argument("--lote", type=int, default=0, help="operaciones por pedido /lotes (0 = sin lotes)")
+    parser.add_argument("--hilos", type=int, default=4, help="hilos del servicio lanzado")
+    args = parser.parse_args()
+
+    proceso = None
+    puerto = args.puerto
+    if puerto is None:
+        puerto = _puerto_libre()
+        proceso = subprocess.Popen([sys.executable, str(SRC / "servicio.py"), "--host", args.host,
+                                    "--puerto", str(puerto), "--hilos", str(args.hilos)],
+                                   stdout=subprocess.DEVNULL)
+        _esperar_servicio(args.host, puerto, proceso)
+    try:
+        numeros = asyncio.run(preparar(args.host, puerto, args.cuentas))
+        duracion, latencias, estados = asyncio.run(
+            cargar(args.host, puerto, args.pedidos, args.conexiones, numeros, args.lote))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+    latencias.sort()
+    print(f"{len(latencias)} pedidos en {duracion:.2f}s con {args.conexiones} conexiones keep-alive")
+    print(f"Throughput: {len(latencias) / duracion:,.0f} pedidos/s")
+    print(f"Latencia p50: {_percentil(latencias, 0.50) * 1e3:.2f} ms  "
+          f"p99: {_percentil(latencias, 0.99) * 1e3:.2f} ms  máx: {latencias[-1] * 1e3:.2f} ms")
+    print("Estados: " + ", ".join(f"{e}: {n}" for e, n in sorted(estados.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,221 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import threading
+import time
+import uuid
 # Importación de modelos desde los nuevos archivos
+from busqueda import IndicePrefijos
 from cliente import Cliente
-from cuenta import Cuenta, CuentaAhorro, CuentaCorriente 
+from cuenta import Cuenta, CuentaAhorro, CuentaCorriente, Movimiento
+from transaccion import Transaccion
 
-# -------------------- ALMACENAMIENTO EN MEMORIA --------------------
+# -------------------- MOTOR EN MEMORIA --------------------
+
+class MotorMemoria:
+    """Almacenamiento en memoria: listas más índices hash (se pierde al reiniciar).
+
+    Las altas y bajas llegan serializadas por el candado del Banco; las lecturas
+    de los dict son atómicas y no necesitan candado.
+    """
+
+    # no necesita enterarse de los movimientos: los objetos en memoria son el estado
+    persistente = False
 
-class Banco:
-    # ... (el resto de la implementación de la clase Banco es el mismo) ...
     def __init__(self):
         self._clientes: List[Cliente] = []
         self._cuentas: List[Cuenta] = []
+        # índices primarios (hash) sincronizados con las listas: búsquedas O(1)
+        self._clientes_por_dni: Dict[str, Cliente] = {}
+        self._cuentas_por_num: Dict[str, Cuenta] = {}
+        # índice secundario: DNI -> cuentas de ese cliente
+        self._cuentas_por_dni: Dict[str, List[Cuenta]] = {}
+
+    # Clientes
+    def agregar_cliente(self, cliente: Cliente):
+        self._clientes.append(cliente)
+        self._clientes_por_dni[cliente.dni] = cliente
+
+    def agregar_clientes(self, clientes: List[Cliente]):
+        self._clientes.extend(clientes)
+        self._clientes_por_dni.update((c.dni, c) for c in clientes)
+
+    def obtener_cliente(self, dni: str) -> Optional[Cliente]:
+        return self._clientes_por_dni.get(dni)
+
+    def iterar_clientes(self) -> Iterator[Cliente]:
+        return iter(self._clientes)
+
+    def contar_clientes(self) -> int:
+        return len(self._clientes)
+
+    def clientes_pagina(self, desde: int, cantidad: int) -> List[Cliente]:
+        return self._clientes[desde:desde + cantidad]
+
+    # Cuentas
+    def existe_cuenta(self, numero: str) -> bool:
+        return numero in self._cuentas_por_num
+
+    def agregar_cuenta(self, cuenta: Cuenta):
+        self._cuentas.append(cuenta)
+        self._cuentas_por_num[cuenta.numero_cuenta] = cuenta
+        self._cuentas_por_dni.setdefault(cuenta.cliente.dni, []).append(cuenta)
+
+    def agregar_cuentas(self, cuentas: List[Cuenta]):
+        for cuenta in cuentas:
+            self.agregar_cuenta(cuenta)
+
+    def obtener_cuenta(self, numero: str) -> Optional[Cuenta]:
+        return self._cuentas_por_num.get(numero)
+
+    def iterar_cuentas(self) -> Iterator[Cuenta]:
+        return iter(self._cuentas)
+
+    def numeros_cuentas(self) -> Iterator[str]:
+        return iter(sorted(self._cuentas_por_num))
+
+    def cuentas_de_cliente(self, dni: str) -> List[Cuenta]:
+        return list(self._cuentas_por_dni.get(dni, ()))
+
+    def eliminar_cuenta(self, cuenta: Cuenta):
+        del self._cuentas_por_num[cuenta.numero_cuenta]
+        cuentas_cliente = self._cuentas_por_dni[cuenta.cliente.dni]
+        cuentas_cliente.remove(cuenta)
+        if not cuentas_cliente:
+            del self._cuentas_por_dni[cuenta.cliente.dni]
+        # el cierre es poco frecuente: quitarla de la lista general es O(n)
+        self._cuentas.remove(cuenta)
+
+    def registrar_movimientos(self, cuenta: Cuenta, movimientos: List[Movimiento]):
+        pass
+
+    def registrar_transferencia(self, origen: Cuenta, debito: Movimiento, destino: Cuenta, credito: Movimiento):
+        pass
+
+    def registrar_bloque(self, pares: List[Tuple[Cuenta, List[Movimiento]]], marca_ns: Optional[int] = None):
+        pass
+
+    def registrar_devengo(self, cuenta: CuentaAhorro, movimientos: List[Movimiento], marca_ns: int):
+        pass
+
+
+# -------------------- BANCO --------------------
+
+class Banco:
+    def __init__(self, motor=None, journal=None):
+        # motor de almacenamiento intercambiable: MotorMemoria (por defecto) o MotorSQLite
+        self._motor = motor if motor is not None else MotorMemoria()
+        self._journal = None
+        self._observadores = []
+        # protege solo el registro (altas, bajas, chequeo de duplicados); los
+        # movimientos usan el candado de cada cuenta y no pasan por aquí
+        self._candado = threading.RLock()
+        # índice de búsqueda por prefijo; se arma con la primera búsqueda
+        self._indice: Optional[IndicePrefijos] = None
+        # sube con cada alta de cliente o cuenta (los movimientos cambian Cuenta.version)
+        self._version = 0
+        if self._motor.persistente:
+            self._observadores.append(self._motor)
+        if journal is not None:
+            self.usar_journal(journal)
+
+    def usar_journal(self, journal):
+        """Engancha un Journal: todo alta y movimiento se escribe ahí antes de aplicarse"""
+        with self._candado:
+            self._journal = journal
+            # primero el journal: si no llega a disco, el movimiento no se aplica
+            self._observadores.insert(0, journal)
+            if not self._motor.persistente:
+                # las cuentas en memoria creadas antes no tenían observador
+                for cuenta in self._motor.iterar_cuentas():
+                    self._vincular(cuenta)
 
     # Cliente CRUD
     def crear_cliente(self, nombre: str, apellido: str, dni: str) -> Cliente:
-        if self.buscar_cliente_por_dni(dni) is not None:
-            raise ValueError("Ya existe un cliente con ese DNI")
+        # se construye primero para validar y normalizar el DNI antes de indexarlo
         cliente = Cliente(nombre, apellido, dni)
-        self._clientes.append(cliente)
+        with self._candado:
+            if self._motor.obtener_cliente(cliente.dni) is not None:
+                raise ValueError("Ya existe un cliente con ese DNI")
+            if self._journal is not None:
+                self._journal.registrar_cliente(cliente)
+            self._motor.agregar_cliente(cliente)
+            if self._indice is not None:
+                self._indice.agregar(cliente)
+            self._version += 1
         return cliente
 
+    def crear_clientes_lote(self, filas: Iterable[Tuple[str, str, str]]) -> List[Cliente]:
+        """Alta masiva de (nombre, apellido, dni); valida todo antes de insertar"""
+        clientes = [Cliente(nombre, apellido, dni) for nombre, apellido, dni in filas]
+        with self._candado:
+            vistos = set()
+            for cliente in clientes:
+                if cliente.dni in vistos or self._motor.obtener_cliente(cliente.dni) is not None:
+                    raise ValueError(f"Ya existe un cliente con ese DNI: {cliente.dni}")
+                vistos.add(cliente.dni)
+            if self._journal is not None:
+                self._journal.registrar_clientes(clientes)
+            self._motor.agregar_clientes(clientes)
+            if self._indice is not None:
+                self._indice.agregar_lote(clientes)
+            self._version += 1
+        return clientes
+
+    def agregar_lote(self, clientes: List[Cliente], cuentas: List[Cuenta]):
+        """Inserta clientes ya validados y sus cuentas en bloque (importación masiva)"""
+        with self._candado:
+            for cliente in clientes:
+                if self._motor.obtener_cliente(cliente.dni) is not None:
+                    raise ValueError(f"Ya existe un cliente con ese DNI: {cliente.dni}")
+            numeros = set()
+            for cuenta in cuentas:
+                while cuenta.numero_cuenta in numeros or self._motor.existe_cuenta(cuenta.numero_cuenta):
+                    cuenta._Cuenta__numero_cuenta = cuenta._generar_numero()
+                numeros.add(cuenta.numero_cuenta)
+            if self._journal is not None:
+                self._journal.registrar_clientes(clientes)
+                self._journal.registrar_cuentas(cuentas)
+            self._motor.agregar_clientes(clientes)
+            self._motor.agregar_cuentas(cuentas)
+            if self._indice is not None:
+                self._indice.agregar_lote(clientes)
+            for cuenta in cuentas:
+                self._vincular(cuenta)
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Contador de altas: sirve de clave para cachear lo que depende del registro"""
+        return self._version
+
     def buscar_cliente_por_dni(self, dni: str) -> Optional[Cliente]:
-        for c in self._clientes:
-            if c.dni == dni:
-                return c
-        return None
+        return self._motor.obtener_cliente(dni)
 
     def listar_clientes(self) -> List[Cliente]:
-        return list(self._clientes)
+        return list(self._motor.iterar_clientes())
+
+    def iterar_clientes(self) -> Iterator[Cliente]:
+        return self._motor.iterar_clientes()
+
+    def contar_clientes(self) -> int:
+        return self._motor.contar_clientes()
+
+    def buscar_clientes(self, texto: str, limite: int = 10) -> List[Cliente]:
+        """Hasta `limite` clientes cuyo nombre, apellido o DNI empieza con cada término de `texto`"""
+        if self._indice is None:
+            with self._candado:
+                if self._indice is None:
+                    indice = IndicePrefijos()
+                    indice.agregar_lote(self._motor.iterar_clientes())
+                    self._indice = indice
+        return [self._motor.obtener_cliente(dni) for dni in self._indice.buscar(texto, limite)]
+
+    def listar_clientes_pagina(self, desde: int = 0, cantidad: int = 25) -> List[Cliente]:
+        """Clientes en orden de alta, de la posición `desde` en adelante (para listados paginados)"""
+        if desde < 0:
+            raise ValueError("La posición inicial no puede ser negativa")
+        if cantidad <= 0:
+            raise ValueError("La cantidad debe ser positiva")
+        return self._motor.clientes_pagina(desde, cantidad)
 
     # Cuentas
     def crear_cuenta_ahorro(self, dni_cliente: str, tasa_interes: float = 0.01) -> CuentaAhorro:
@@ -34,7 +223,7 @@ class Banco:
         if cliente is None:
             raise ValueError("Cliente no encontrado")
         cuenta = CuentaAhorro(cliente, tasa_interes)
-        self._cuentas.append(cuenta)
+        self._registrar_cuenta(cuenta)
         return cuenta
 
     def crear_cuenta_corriente(self, dni_cliente: str, limite_descubierto: float = 0.0) -> CuentaCorriente:
@@ -42,17 +231,166 @@ class Banco:
         if cliente is None:
             raise ValueError("Cliente no encontrado")
         cuenta = CuentaCorriente(cliente, limite_descubierto)
-        self._cuentas.append(cuenta)
+        self._registrar_cuenta(cuenta)
+        return cuenta
+
+    def _registrar_cuenta(self, cuenta: Cuenta):
+        # el número son 8 caracteres de un uuid4: con muchas cuentas puede repetirse,
+        # así que se regenera hasta que sea único dentro del índice
+        with self._candado:
+            while self._motor.existe_cuenta(cuenta.numero_cuenta):
+                cuenta._Cuenta__numero_cuenta = cuenta._generar_numero()
+            if self._journal is not None:
+                self._journal.registrar_cuenta(cuenta)
+            self._motor.agregar_cuenta(cuenta)
+            self._vincular(cuenta)
+            self._version += 1
+
+    def _vincular(self, cuenta: Optional[Cuenta]) -> Optional[Cuenta]:
+        # engancha la cuenta a los observadores del banco (persistencia)
+        if cuenta is not None and self._observadores:
+            cuenta._observador = self._notificar
+        return cuenta
+
+    def _notificar(self, cuenta: Cuenta, movimientos: List[Movimiento], marca_devengo: Optional[int] = None):
+        for observador in self._observadores:
+            if marca_devengo is None:
+                observador.registrar_movimientos(cuenta, movimientos)
+            else:
+                observador.registrar_devengo(cuenta, movimientos, marca_devengo)
+
+    def cerrar_cuenta(self, numero: str) -> Cuenta:
+        with self._candado:
+            cuenta = self.buscar_cuenta_por_num(numero)
+            if cuenta is None:
+                raise ValueError("Cuenta no encontrada")
+            # orden de candados: primero el del banco, después el de la cuenta
+            with cuenta._candado:
+                if cuenta.saldo != 0:
+                    raise ValueError("Solo se puede cerrar una cuenta con saldo cero")
+                # primero el journal: tras una caída la cuenta no vuelve a aparecer
+                if self._journal is not None:
+                    self._journal.registrar_cierre(cuenta)
+                self._motor.eliminar_cuenta(cuenta)
+                cuenta._observador = None
         return cuenta
 
     def buscar_cuenta_por_num(self, numero: str) -> Optional[Cuenta]:
-        for c in self._cuentas:
-            if c.numero_cuenta == numero:
-                return c
-        return None
+        return self._vincular(self._motor.obtener_cuenta(numero))
 
     def listar_cuentas(self) -> List[Cuenta]:
-        return list(self._cuentas)
+        return list(self.iterar_cuentas())
+
+    def iterar_cuentas(self) -> Iterator[Cuenta]:
+        for cuenta in self._motor.iterar_cuentas():
+            yield self._vincular(cuenta)
+
+    def iterar_numeros_cuentas(self) -> Iterator[str]:
+        """Números de cuenta en orden, sin armar las cuentas"""
+        return self._motor.numeros_cuentas()
+
+    @property
+    def archivo(self) -> Optional[str]:
+        """Archivo SQLite del almacenamiento (None en memoria): otros procesos pueden abrirlo para leer"""
+        ruta = getattr(self._motor, "ruta", None)
+        return ruta if ruta and ruta != ":memory:" else None
+
+    # Operaciones masivas
+    def procesar_lote(self, operaciones: Iterable[Tuple[str, str, float]]) -> List[Optional[str]]:
+        """Aplica (numero_cuenta, tipo, monto) agrupando por cuenta.
+
+        Devuelve una lista alineada con la entrada: None si la operación se aplicó o
+        el motivo del rechazo. Dentro de cada cuenta se respeta el orden de entrada.
+        """
+        operaciones = list(operaciones)
+        resultados: List[Optional[str]] = [None] * len(operaciones)
+        por_cuenta: Dict[str, List[int]] = {}
+        for i, (numero, _, _) in enumerate(operaciones):
+            por_cuenta.setdefault(numero, []).append(i)
+        for numero, indices in por_cuenta.items():
+            cuenta = self.buscar_cuenta_por_num(numero)
+            if cuenta is None:
+                for i in indices:
+                    resultados[i] = "Cuenta no encontrada"
+                continue
+            errores = cuenta.aplicar_lote([operaciones[i][1:] for i in indices])
+            for i, error in zip(indices, errores):
+                resultados[i] = error
+        return resultados
+
+    def acreditar_en_bloque(self, asientos: List[Tuple[Cuenta, float]], fecha_ns: Optional[int] = None,
+                            marca_ns: Optional[int] = None):
+        """Asienta monto en cada cuenta con una sola escritura en journal y motor.
+
+        Montos positivos son depósitos y negativos retiros (comisiones). Para procesos
+        masivos (intereses, cierres): quien llama tiene tomados los candados de las
+        cuentas y ya validó los montos. Con `marca_ns` los asientos son intereses: la
+        marca de último devengo de cada CuentaAhorro avanza en la misma escritura.
+        """
+        ahora = fecha_ns if fecha_ns is not None else time.time_ns()
+        if not self._observadores:
+            for cuenta, monto in asientos:
+                cuenta._asentar("DEP" if monto >= 0 else "RET", abs(monto), monto, ahora)
+                if marca_ns is not None and isinstance(cuenta, CuentaAhorro):
+                    cuenta._avanzar_devengo(marca_ns)
+            return
+        pares = [(cuenta, [(Transaccion("DEP" if monto >= 0 else "RET", abs(monto), fecha_ns=ahora), monto)])
+                 for cuenta, monto in asientos]
+        for observador in self._observadores:
+            observador.registrar_bloque(pares, marca_ns)
+        for cuenta, movimientos in pares:
+            cuenta._confirmar(movimientos)
+            if marca_ns is not None and isinstance(cuenta, CuentaAhorro):
+                cuenta._avanzar_devengo(marca_ns)
+
+    def asentar_sin_cargar(self, asientos: List[Tuple[str, float]], fecha_ns: int,
+                           marca_ns: Optional[int] = None) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """Asienta (numero, monto) sin armar las cuentas que el almacenamiento no tiene en memoria.
+
+        Para procesos masivos sobre un banco persistente. Devuelve (pendientes,
+        asentados); los pendientes (cuentas cargadas, o un motor o journal que
+        necesitan la Cuenta) van por acreditar_en_bloque.
+        """
+        asentar = getattr(self._motor, "asentar_sin_cargar", None)
+        if asentar is None or self._journal is not None:
+            return list(asientos), []
+        return asentar(asientos, fecha_ns, marca_ns)
+
+    # Transferencias
+    def transferir(self, origen: str, destino: str, monto: float) -> Tuple[Transaccion, Transaccion]:
+        """Mueve monto de la cuenta origen a la destino de forma atómica.
+
+        Devuelve (retiro, depósito); cada uno guarda en `referencia` el id del otro.
+        """
+        if not isinstance(monto, (int, float)) or not monto > 0:
+            raise ValueError("El monto a transferir debe ser mayor que cero")
+        if origen == destino:
+            raise ValueError("La cuenta de origen y la de destino deben ser distintas")
+        cuenta_origen = self.buscar_cuenta_por_num(origen)
+        cuenta_destino = self.buscar_cuenta_por_num(destino)
+        if cuenta_origen is None or cuenta_destino is None:
+            raise ValueError("Cuenta no encontrada")
+        # candados siempre en el mismo orden (número de cuenta): dos transferencias
+        # en sentidos opuestos nunca se esperan mutuamente
+        primera, segunda = sorted((cuenta_origen, cuenta_destino), key=lambda c: c.numero_cuenta)
+        with primera._candado, segunda._candado:
+            # alguna pudo cerrarse mientras esperábamos los candados
+            if (self._motor.obtener_cuenta(origen) is not cuenta_origen
+                    or self._motor.obtener_cuenta(destino) is not cuenta_destino):
+                raise ValueError("Cuenta no encontrada")
+            if monto > cuenta_origen.saldo + cuenta_origen._descubierto():
+                raise ValueError("Saldo insuficiente")
+            ahora = time.time_ns()
+            id_retiro, id_deposito = str(uuid.uuid4()), str(uuid.uuid4())
+            retiro = Transaccion("RET", monto, id_transaccion=id_retiro, fecha_ns=ahora, referencia=id_deposito)
+            deposito = Transaccion("DEP", monto, id_transaccion=id_deposito, fecha_ns=ahora, referencia=id_retiro)
+            debito, credito = (retiro, -retiro.monto), (deposito, deposito.monto)
+            # las dos patas se registran juntas: quedan ambas o ninguna
+            for observador in self._observadores:
+                observador.registrar_transferencia(cuenta_origen, debito, cuenta_destino, credito)
+            cuenta_origen._confirmar([debito])
+            cuenta_destino._confirmar([credito])
+        return retiro, deposito
 
     def listar_cuentas_por_cliente(self, dni_cliente: str) -> List[Cuenta]:
-        return [c for c in self._cuentas if c.cliente.dni == dni_cliente]
\ No newline at end of file
+        return [self._vincular(c) for c in self._motor.cuentas_de_cliente(dni_cliente)]
@@ -0,0 +1,412 @@
+import sqlite3
+import threading
+import uuid
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+# Importación de modelos
+from cliente import Cliente
+from cuenta import Cuenta, CuentaAhorro, CuentaCorriente, Movimiento
+from libro_mayor import LibroMayor
+from transaccion import Transaccion
+
+# -------------------- MOTOR SQLITE --------------------
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    dni TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    apellido TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cuentas (
+    numero TEXT PRIMARY KEY,
+    dni TEXT NOT NULL REFERENCES clientes(dni),
+    tipo TEXT NOT NULL,
+    saldo REAL NOT NULL DEFAULT 0,
+    tasa_interes REAL,
+    limite_descubierto REAL,
+    ultimo_devengo INTEGER -- fin del último período de interés devengado (ns)
+);
+CREATE INDEX IF NOT EXISTS idx_cuentas_dni ON cuentas(dni);
+CREATE TABLE IF NOT EXISTS transacciones (
+    id TEXT NOT NULL,
+    cuenta TEXT NOT NULL REFERENCES cuentas(numero),
+    tipo TEXT NOT NULL,
+    monto REAL NOT NULL,
+    delta REAL NOT NULL,
+    fecha INTEGER NOT NULL, -- nanosegundos desde epoch
+    referencia TEXT -- id de la transacción vinculada (transferencias)
+);
+CREATE INDEX IF NOT EXISTS idx_transacciones_cuenta_fecha ON transacciones(cuenta, fecha);
+"""
+
+# Sentencias fijas: sqlite3 las prepara una vez y las reutiliza desde su caché
+_INSERTAR_CLIENTE = "INSERT INTO clientes (dni, nombre, apellido) VALUES (?, ?, ?)"
+_OBTENER_CLIENTE = "SELECT dni, nombre, apellido FROM clientes WHERE dni = ?"
+_ITERAR_CLIENTES = "SELECT dni, nombre, apellido FROM clientes ORDER BY rowid"
+_CONTAR_CLIENTES = "SELECT COUNT(*) FROM clientes"
+_PAGINA_CLIENTES = "SELECT dni, nombre, apellido FROM clientes ORDER BY rowid LIMIT ? OFFSET ?"
+_INSERTAR_CUENTA = ("INSERT INTO cuentas (numero, dni, tipo, saldo, tasa_interes, limite_descubierto, ultimo_devengo) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_COLUMNAS_CUENTA = "numero, dni, tipo, saldo, tasa_interes, limite_descubierto, ultimo_devengo"
+_OBTENER_CUENTA = f"SELECT {_COLUMNAS_CUENTA} FROM cuentas WHERE numero = ?"
+_ITERAR_CUENTAS = "SELECT numero FROM cuentas ORDER BY rowid"
+_CUENTAS_DE_CLIENTE = "SELECT numero FROM cuentas WHERE dni = ? ORDER BY rowid"
+_NUMEROS_CUENTAS = "SELECT numero FROM cuentas ORDER BY numero"
+_EXISTE_CUENTA = "SELECT 1 FROM cuentas WHERE numero = ?"
+_ELIMINAR_CUENTA = "DELETE FROM cuentas WHERE numero = ?"
+_ELIMINAR_TRANSACCIONES = "DELETE FROM transacciones WHERE cuenta = ?"
+_INSERTAR_TRANSACCION = ("INSERT INTO transacciones (id, cuenta, tipo, monto, delta, fecha, referencia) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_ACTUALIZAR_SALDO = "UPDATE cuentas SET saldo = saldo + ? WHERE numero = ?"
+_ACTUALIZAR_DEVENGO = "UPDATE cuentas SET ultimo_devengo = ? WHERE numero = ?"
+_AVANZAR_DEVENGO = "UPDATE cuentas SET ultimo_devengo = MAX(COALESCE(ultimo_devengo, ?1), ?1) WHERE numero = ?2"
+_AVANZAR_DEVENGO_AHORRO = _AVANZAR_DEVENGO + " AND tipo = 'CuentaAhorro'"
+# el historial de una cuenta se trae hasta la última fila que había al leer su saldo
+_ARMAR_CUENTA = (f"SELECT {_COLUMNAS_CUENTA}, "
+                 "(SELECT COUNT(*) FROM transacciones WHERE cuenta = ?1), "
+                 "(SELECT COALESCE(MAX(rowid), 0) FROM transacciones WHERE cuenta = ?1) "
+                 "FROM cuentas WHERE numero = ?1")
+_ULTIMAS_TRANSACCIONES = ("SELECT id, tipo, monto, fecha, referencia FROM transacciones "
+                          "WHERE cuenta = ? ORDER BY fecha DESC, rowid DESC LIMIT ?")
+_TRANSACCIONES_DE_CUENTA = ("SELECT id, tipo, monto, delta, fecha, referencia FROM transacciones "
+                            "WHERE cuenta = ? AND rowid <= ? ORDER BY fecha, rowid")
+_MOVIMIENTOS_ENTRE = ("SELECT fecha, tipo, monto, delta FROM transacciones "
+                      "WHERE cuenta = ? AND fecha BETWEEN ? AND ? ORDER BY fecha, rowid")
+_SUMA_DELTAS_DESDE = "SELECT COALESCE(SUM(delta), 0) FROM transacciones WHERE cuenta = ? AND fecha >= ?"
+_SALDOS_DE_CLIENTE = "SELECT numero, tipo, saldo FROM cuentas WHERE dni = ? ORDER BY rowid"
+# mayor fecha representable: "sin límite" en los rangos
+_FECHA_MAXIMA = 2 ** 63 - 1
+
+
+class MotorSQLite:
+    """Almacenamiento persistente en un único archivo SQLite (modo WAL).
+
+    La conexión se comparte entre hilos: cada uso pasa por un candado propio.
+    """
+
+    # el Banco le avisa cada movimiento para que quede guardado
+    persistente = True
+
+    def __init__(self, ruta: str, tam_bloque: int = 1000):
+        self.ruta = ruta
+        # filas que se traen por vez al iterar: nunca se carga toda la tabla
+        self.tam_bloque = tam_bloque
+        self._conn = sqlite3.connect(ruta, cached_statements=64, check_same_thread=False)
+        self._candado = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_ESQUEMA)
+        self._migrar()
+        # mapa de identidad: mientras un objeto esté vivo, cada búsqueda devuelve el mismo
+        self._clientes = weakref.WeakValueDictionary()
+        self._cuentas = weakref.WeakValueDictionary()
+
+    def _migrar(self):
+        # archivos creados con versiones anteriores del esquema
+        faltantes = [
+            ("transacciones", "referencia", "TEXT"),
+            ("cuentas", "ultimo_devengo", "INTEGER"),
+        ]
+        for tabla, columna, tipo in faltantes:
+            columnas = {fila[1] for fila in self._conn.execute(f"PRAGMA table_info({tabla})")}
+            if columna not in columnas:
+                with self._conn:
+                    self._conn.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+
+    def cerrar(self):
+        with self._candado:
+            self._conn.close()
+
+    # Clientes
+    def agregar_cliente(self, cliente: Cliente):
+        try:
+            with self._candado, self._conn:
+                self._conn.execute(_INSERTAR_CLIENTE, (cliente.dni, cliente.nombre, cliente.apellido))
+                self._clientes[cliente.dni] = cliente
+        except sqlite3.IntegrityError as e:
+            raise ValueError("Ya existe un cliente con ese DNI") from e
+
+    def agregar_clientes(self, clientes: List[Cliente]):
+        try:
+            with self._candado, self._conn:
+                self._conn.executemany(_INSERTAR_CLIENTE, ((c.dni, c.nombre, c.apellido) for c in clientes))
+                self._clientes.update((c.dni, c) for c in clientes)
+        except sqlite3.IntegrityError as e:
+            raise ValueError("Ya existe un cliente con ese DNI") from e
+
+    def obtener_cliente(self, dni: str) -> Optional[Cliente]:
+        cliente = self._clientes.get(dni)
+        if cliente is None:
+            with self._candado:
+                fila = self._conn.execute(_OBTENER_CLIENTE, (dni,)).fetchone()
+                if fila is not None:
+                    cliente = self._cliente_desde_fila(fila)
+        return cliente
+
+    def iterar_clientes(self) -> Iterator[Cliente]:
+        for fila in self._iterar(_ITERAR_CLIENTES):
+            yield self._cliente_desde_fila(fila)
+
+    def contar_clientes(self) -> int:
+        with self._candado:
+            return self._conn.execute(_CONTAR_CLIENTES).fetchone()[0]
+
+    def clientes_pagina(self, desde: int, cantidad: int) -> List[Cliente]:
+        with self._candado:
+            filas = self._conn.execute(_PAGINA_CLIENTES, (cantidad, desde)).fetchall()
+        return [self._cliente_desde_fila(fila) for fila in filas]
+
+    def _cliente_desde_fila(self, fila) -> Cliente:
+        # bajo el candado: dos hilos nunca construyen dos objetos para el mismo DNI
+        dni, nombre, apellido = fila
+        with self._candado:
+            cliente = self._clientes.get(dni)
+            if cliente is None:
+                cliente = Cliente(nombre, apellido, dni)
+                self._clientes[dni] = cliente
+        return cliente
+
+    # Cuentas
+    def existe_cuenta(self, numero: str) -> bool:
+        with self._candado:
+            return self._conn.execute(_EXISTE_CUENTA, (numero,)).fetchone() is not None
+
+    def agregar_cuenta(self, cuenta: Cuenta):
+        with self._candado, self._conn:
+            self._conn.execute(_INSERTAR_CUENTA, self._fila_cuenta(cuenta))
+            self._cuentas[cuenta.numero_cuenta] = cuenta
+
+    def agregar_cuentas(self, cuentas: List[Cuenta]):
+        with self._candado, self._conn:
+            self._conn.executemany(_INSERTAR_CUENTA, (self._fila_cuenta(c) for c in cuentas))
+            self._cuentas.update((c.numero_cuenta, c) for c in cuentas)
+
+    def obtener_cuenta(self, numero: str) -> Optional[Cuenta]:
+        cuenta = self._cuentas.get(numero)
+        if cuenta is None:
+            with self._candado:
+                # otro hilo pudo haberla cargado mientras esperábamos: una cuenta, un candado
+                cuenta = self._cuentas.get(numero)
+                if cuenta is None:
+                    cuenta = self._construir_cuenta(numero)
+        return cuenta
+
+    def iterar_cuentas(self) -> Iterator[Cuenta]:
+        # solo los números vienen por bloque: cada cuenta se arma con su propia lectura
+        for (numero,) in self._iterar(_ITERAR_CUENTAS):
+            cuenta = self.obtener_cuenta(numero)
+            if cuenta is not None:  # eliminada mientras se recorría
+                yield cuenta
+
+    def numeros_cuentas(self) -> Iterator[str]:
+        for (numero,) in self._iterar(_NUMEROS_CUENTAS):
+            yield numero
+
+    def cuentas_de_cliente(self, dni: str) -> List[Cuenta]:
+        with self._candado:
+            numeros = self._conn.execute(_CUENTAS_DE_CLIENTE, (dni,)).fetchall()
+            cuentas = (self.obtener_cuenta(numero) for (numero,) in numeros)
+            return [cuenta for cuenta in cuentas if cuenta is not None]
+
+    def eliminar_cuenta(self, cuenta: Cuenta):
+        with self._candado, self._conn:
+            self._conn.execute(_ELIMINAR_TRANSACCIONES, (cuenta.numero_cuenta,))
+            self._conn.execute(_ELIMINAR_CUENTA, (cuenta.numero_cuenta,))
+            self._cuentas.pop(cuenta.numero_cuenta, None)
+
+    def registrar_movimientos(self, cuenta: Cuenta, movimientos: List[Movimiento]):
+        numero = cuenta.numero_cuenta
+        with self._candado, self._conn:
+            self._conn.executemany(_INSERTAR_TRANSACCION, (
+                (tx.id, numero, tx.tipo, tx.monto, delta, tx.fecha_ns, tx.referencia)
+                for tx, delta in movimientos
+            ))
+            total = sum(delta for _, delta in movimientos)
+            if total:
+                self._conn.execute(_ACTUALIZAR_SALDO, (total, numero))
+
+    def registrar_bloque(self, pares: List[Tuple[Cuenta, List[Movimiento]]], marca_ns: Optional[int] = None):
+        # una sola transacción SQL para todas las cuentas del bloque
+        with self._candado, self._conn:
+            self._conn.executemany(_INSERTAR_TRANSACCION, (
+                (tx.id, cuenta.numero_cuenta, tx.tipo, tx.monto, delta, tx.fecha_ns, tx.referencia)
+                for cuenta, movimientos in pares
+                for tx, delta in movimientos
+            ))
+            self._conn.executemany(_ACTUALIZAR_SALDO, (
+                (sum(delta for _, delta in movimientos), cuenta.numero_cuenta)
+                for cuenta, movimientos in pares
+            ))
+            if marca_ns is not None:
+                # MAX: la marca nunca retrocede
+                self._conn.executemany(_AVANZAR_DEVENGO, (
+                    (marca_ns, cuenta.numero_cuenta) for cuenta, _ in pares if isinstance(cuenta, CuentaAhorro)
+                ))
+
+    def asentar_sin_cargar(self, asientos: List[Tuple[str, float]], fecha_ns: int,
+                           marca_ns: Optional[int] = None) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """Asienta (numero, monto) directo en el archivo para las cuentas que no están en memoria.
+
+        Devuelve (pendientes, asentados): los pendientes son de cuentas cargadas, que
+        tienen que enterarse por el camino normal; las que no existen se descartan.
+        """
+        # bajo el candado nadie arma una cuenta: la que no está en el mapa de
+        # identidad ahora, si se arma después, ya lee estos asientos
+        with self._candado:
+            pendientes, asentados = [], []
+            for numero, monto in asientos:
+                if self._cuentas.get(numero) is not None:
+                    pendientes.append((numero, monto))
+                elif self._conn.execute(_EXISTE_CUENTA, (numero,)).fetchone() is not None:
+                    asentados.append((numero, monto))
+            with self._conn:
+                self._conn.executemany(_INSERTAR_TRANSACCION, (
+                    (str(uuid.uuid4()), numero, "DEP" if monto >= 0 else "RET", abs(monto), monto, fecha_ns, None)
+                    for numero, monto in asentados
+                ))
+                self._conn.executemany(_ACTUALIZAR_SALDO, ((monto, numero) for numero, monto in asentados))
+                if marca_ns is not None:
+                    self._conn.executemany(_AVANZAR_DEVENGO_AHORRO, ((marca_ns, numero) for numero, _ in asentados))
+        return pendientes, asentados
+
+    def registrar_devengo(self, cuenta: CuentaAhorro, movimientos: List[Movimiento], marca_ns: int):
+        numero = cuenta.numero_cuenta
+        # interés, saldo y marca en la misma transacción SQL
+        with self._candado, self._conn:
+            self._conn.executemany(_INSERTAR_TRANSACCION, (
+                (tx.id, numero, tx.tipo, tx.monto, delta, tx.fecha_ns, tx.referencia)
+                for tx, delta in movimientos
+            ))
+            total = sum(delta for _, delta in movimientos)
+            if total:
+                self._conn.execute(_ACTUALIZAR_SALDO, (total, numero))
+            self._conn.execute(_ACTUALIZAR_DEVENGO, (marca_ns, numero))
+
+    def registrar_transferencia(self, origen: Cuenta, debito: Movimiento, destino: Cuenta, credito: Movimiento):
+        # una sola transacción SQL para las dos patas
+        with self._candado, self._conn:
+            for cuenta, (tx, delta) in ((origen, debito), (destino, credito)):
+                self._conn.execute(_INSERTAR_TRANSACCION, (
+                    tx.id, cuenta.numero_cuenta, tx.tipo, tx.monto, delta, tx.fecha_ns, tx.referencia))
+                self._conn.execute(_ACTUALIZAR_SALDO, (delta, cuenta.numero_cuenta))
+
+    @staticmethod
+    def _fila_cuenta(cuenta: Cuenta) -> tuple:
+        return (
+            cuenta.numero_cuenta,
+            cuenta.cliente.dni,
+            cuenta.__class__.__name__,
+            cuenta.saldo,
+            getattr(cuenta, "tasa_interes", None),
+            getattr(cuenta, "limite_descubierto", None),
+            getattr(cuenta, "ultimo_devengo_ns", None),
+        )
+
+    def _construir_cuenta(self, numero: str) -> Optional[Cuenta]:
+        # con el candado tomado. Saldo, cantidad de movimientos y los últimos salen
+        # de la misma lectura; el resto del historial se trae recién si se lo pide
+        with self._lectura():
+            fila = self._conn.execute(_ARMAR_CUENTA, (numero,)).fetchone()
+            if fila is None:
+                return None
+            numero, dni, tipo, saldo, tasa_interes, limite_descubierto, ultimo_devengo, cantidad, ultima_fila = fila
+            clase = {"CuentaAhorro": CuentaAhorro, "CuentaCorriente": CuentaCorriente}.get(tipo, Cuenta)
+            recientes = self._conn.execute(_ULTIMAS_TRANSACCIONES, (numero, clase.tam_recientes)).fetchall()
+        cliente = self.obtener_cliente(dni)
+        if clase is CuentaAhorro:
+            cuenta = CuentaAhorro(cliente, tasa_interes, numero_cuenta=numero, ultimo_devengo_ns=ultimo_devengo)
+        elif clase is CuentaCorriente:
+            cuenta = CuentaCorriente(cliente, limite_descubierto, numero_cuenta=numero)
+        else:
+            cuenta = Cuenta(cliente, numero_cuenta=numero)
+        recientes = [Transaccion(tipo_tx, monto, id_transaccion=id_tx, fecha_ns=fecha, referencia=referencia)
+                     for id_tx, tipo_tx, monto, fecha, referencia in reversed(recientes)]
+        cuenta._diferir_historial(saldo, cantidad, recientes, lambda: self._cargar_libro(numero, ultima_fila))
+        self._cuentas[numero] = cuenta
+        return cuenta
+
+    def _cargar_libro(self, numero: str, ultima_fila: int) -> LibroMayor:
+        # las filas ya guardadas no cambian: basta con cortar en la última que se vio
+        libro = LibroMayor()
+        for id_tx, tipo_tx, monto, delta, fecha, referencia in self._iterar(_TRANSACCIONES_DE_CUENTA,
+                                                                            (numero, ultima_fila)):
+            libro.agregar(tipo_tx, monto, delta, fecha, id_tx, referencia)
+        return libro
+
+    @contextmanager
+    def _lectura(self):
+        # varias consultas sobre la misma foto del archivo
+        with self._candado:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            finally:
+                self._conn.commit()
+
+    def _iterar(self, sql: str, parametros: tuple = ()):
+        # cursor propio por recorrido, leyendo de a bloques; el candado se toma
+        # por bloque y nunca queda tomado mientras el consumidor procesa las filas
+        with self._candado:
+            cursor = self._conn.execute(sql, parametros)
+        try:
+            while True:
+                with self._candado:
+                    filas = cursor.fetchmany(self.tam_bloque)
+                if not filas:
+                    break
+                yield from filas
+        finally:
+            with self._candado:
+                cursor.close()
+
+
+class LectorSQLite:
+    """Conexión de solo lectura al archivo de un MotorSQLite.
+
+    La usan los procesos del pool (cierre diario, reportes): cada uno abre la suya
+    y lee filas planas sin armar objetos Cuenta. Las consultas hechas dentro de
+    `foto()` ven el archivo en un mismo estado aunque el proceso principal escriba.
+    """
+
+    def __init__(self, ruta: str):
+        self._conn = sqlite3.connect(Path(ruta).resolve().as_uri() + "?mode=ro", uri=True,
+                                     cached_statements=64)
+
+    def cerrar(self):
+        self._conn.close()
+
+    @contextmanager
+    def foto(self):
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self._conn.commit()
+
+    def cuenta(self, numero: str) -> Optional[tuple]:
+        """(numero, dni, tipo, saldo, tasa_interes, limite_descubierto, ultimo_devengo)"""
+        return self._conn.execute(_OBTENER_CUENTA, (numero,)).fetchone()
+
+    def cliente(self, dni: str) -> Optional[tuple]:
+        """(dni, nombre, apellido)"""
+        return self._conn.execute(_OBTENER_CLIENTE, (dni,)).fetchone()
+
+    def cuentas_de_cliente(self, dni: str) -> List[tuple]:
+        """(numero, tipo, saldo) de cada cuenta del cliente, en orden de alta"""
+        return self._conn.execute(_SALDOS_DE_CLIENTE, (dni,)).fetchall()
+
+    def movimientos(self, numero: str, desde_ns: int,
+                    hasta_ns: Optional[int] = None) -> Iterator[Tuple[int, str, float, float]]:
+        """(fecha_ns, tipo, monto, delta) con desde_ns <= fecha <= hasta_ns, en el orden del libro"""
+        hasta_ns = _FECHA_MAXIMA if hasta_ns is None else hasta_ns
+        return iter(self._conn.execute(_MOVIMIENTOS_ENTRE, (numero, desde_ns, hasta_ns)))
+
+    def suma_deltas(self, numero: str, desde_ns: int) -> float:
+        """Cuánto cambió el saldo con los movimientos de fecha >= desde_ns"""
+        return self._conn.execute(_SUMA_DELTAS_DESDE, (numero, desde_ns)).fetchone()[0]
@@ -0,0 +1,115 @@
+"""Búsqueda de clientes por prefijo de nombre, apellido o DNI.
+
+El índice guarda las entradas "clave normalizada + DNI" en un arreglo ordenado;
+las altas van a un buffer ordenado chico que se fusiona con el arreglo cuando
+se llena. Una búsqueda son dos búsquedas binarias y el
+recorrido de las claves que empiezan con el prefijo (se corta al llegar a
+`limite`): nunca se recorre la lista de clientes.
+"""
+import threading
+import unicodedata
+from functools import lru_cache
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, List, Tuple
+# Importación de modelos
+from cliente import Cliente
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin acentos: 'Gómez' y 'gomez' son la misma clave"""
+    texto = texto.strip().lower()
+    if texto.isascii():
+        return texto
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+# los nombres y apellidos se repiten mucho: cada palabra se normaliza una sola vez
+_normalizar_palabra = lru_cache(maxsize=65536)(normalizar)
+
+_SEPARADOR = "\x00"  # entre clave y DNI: ordena como el par (clave, dni)
+
+
+class IndicePrefijos:
+    """Índice de prefijos de clientes con altas incrementales"""
+
+    def __init__(self, tam_buffer: int = 16384):
+        self.tam_buffer = tam_buffer
+        # entradas "clave\x00dni" ordenadas y buffer ordenado de altas recientes; nunca
+        # se modifican en el lugar (cada alta publica un par nuevo), así las búsquedas
+        # leen sin candado un estado consistente
+        self._estado: Tuple[List[str], List[str]] = ([], [])
+        # DNI -> palabras del cliente, para filtrar por el resto de los términos
+        self._palabras: Dict[str, Tuple[str, ...]] = {}
+        self._candado = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._palabras)
+
+    def agregar(self, cliente: Cliente):
+        self.agregar_lote([cliente])
+
+    def agregar_lote(self, clientes: Iterable[Cliente]):
+        nuevos = []
+        for cliente in clientes:
+            dni = cliente.dni
+            # cada palabra de nombre y apellido es una clave ("Juan Carlos" se encuentra por "carlos")
+            palabras = tuple(map(_normalizar_palabra, f"{cliente.nombre} {cliente.apellido}".split()))
+            self._palabras[dni] = palabras + (dni,)
+            nuevos.append(dni + _SEPARADOR + dni)
+            nuevos += [p + _SEPARADOR + dni for p in set(palabras)]
+        with self._candado:
+            entradas, buffer = self._estado
+            if len(nuevos) == 1:
+                i = bisect_left(buffer, nuevos[0])
+                buffer = buffer[:i] + nuevos + buffer[i:]
+            else:
+                buffer = sorted(buffer + nuevos)
+            if len(buffer) > self.tam_buffer:
+                # merge lineal de dos listas ordenadas
+                entradas = list(merge(entradas, buffer)) if entradas else buffer
+                buffer = []
+            self._estado = (entradas, buffer)
+
+    def buscar(self, texto: str, limite: int = 10) -> List[str]:
+        """DNIs de los clientes con una palabra que empiece con cada término de `texto`.
+
+        Los resultados salen en orden alfabético de la clave que coincidió.
+        """
+        terminos = normalizar(texto).split()
+        if not terminos or limite <= 0:
+            return []
+        entradas, buffer = self._estado
+
+        def coincidencias(termino: str) -> int:
+            return bisect_left(entradas, termino + "\uffff") - bisect_left(entradas, termino)
+
+        # se recorre el término con menos entradas y los demás se usan como filtro
+        principal = min(terminos, key=coincidencias) if len(terminos) > 1 else terminos[0]
+        resto = list(terminos)
+        resto.remove(principal)
+        palabras = self._palabras
+
+        encontrados = []
+        vistos = set()
+        # se recorren a la vez las entradas y el buffer, los dos ordenados
+        i = bisect_left(entradas, principal)
+        j = bisect_left(buffer, principal)
+        while len(encontrados) < limite:
+            en_entradas = i < len(entradas) and entradas[i].startswith(principal)
+            en_buffer = j < len(buffer) and buffer[j].startswith(principal)
+            if en_buffer and (not en_entradas or buffer[j] < entradas[i]):
+                entrada = buffer[j]
+                j += 1
+            elif en_entradas:
+                entrada = entradas[i]
+                i += 1
+            else:
+                break
+            dni = entrada[entrada.index(_SEPARADOR) + 1:]
+            if dni not in vistos:
+                vistos.add(dni)
+                if all(any(p.startswith(t) for p in palabras[dni]) for t in resto):
+                    encontrados.append(dni)
+        return encontrados
@@ -0,0 +1,345 @@
+"""Cierre diario: intereses, comisiones por descubierto y estados de cuenta.
+
+Los números de cuenta llegan en orden desde el almacenamiento y se parten en
+shards sin armar las cuentas. Con un banco en SQLite cada shard viaja a un
+proceso del pool como lista de números: el proceso abre el archivo en solo
+lectura, arma los datos planos de sus cuentas (CuentaPlana), calcula intereses y
+comisiones y escribe los estados de cuenta del día en un archivo por shard. Con
+el banco en memoria los datos planos se arman en el proceso principal (las
+cuentas tienen candados y no se pueden mandar a otro proceso). De vuelta en el proceso
+principal, los asientos de cada shard se aplican al Banco con una sola escritura
+(Banco.acreditar_en_bloque) y el shard se anota en el checkpoint: si la corrida
+se corta, la siguiente con el mismo checkpoint y la misma fecha saltea los
+shards ya terminados. Los asientos del cierre llevan la fecha del último instante
+del día: una cuenta que ya los tiene no se vuelve a asentar, así que correr dos
+veces el mismo día (o retomar un shard asentado antes de anotarlo) no duplica nada.
+
+Uso: python src/cierre_diario.py --db banco.db [--fecha 2024-05-31] [--procesos 4]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from bisect import bisect_right, insort
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+# Importación de modelos
+from almacenamiento import Banco
+from almacenamiento_sqlite import LectorSQLite, MotorSQLite
+from cuenta import Cuenta
+from intereses import calcular_intereses
+from transaccion import fecha_a_ns
+
+TASA_DESCUBIERTO = 0.0005  # diaria, sobre el saldo negativo de las cuentas corrientes
+
+# Cuenta como datos planos: número, clase, DNI, saldo al cierre del día (antes de
+# los asientos del cierre), tasa de interés, saldo al abrir el día, movimientos
+# del día como (fecha_ns, tipo, monto) y lo ya asentado por un cierre anterior
+# de la misma fecha (None si todavía no se cerró)
+CuentaPlana = Tuple[str, str, str, float, float, float, List[Tuple[int, str, float]], Optional[float]]
+
+
+def _plano(cuenta: Cuenta, desde_ns: int, fecha_ns: int, marca_ns: int) -> CuentaPlana:
+    with cuenta._candado:
+        libro = cuenta.libro
+        # saldo inicial cargado fuera del libro (se respeta en todos los saldos)
+        diferencia = cuenta.saldo - libro.saldo_acumulado()
+        saldo_inicial = libro.saldo_hasta(desde_ns - 1) + diferencia
+        # saldo del día, no el actual: la fecha puede ser pasada o tener movimientos después
+        saldo = libro.saldo_hasta(fecha_ns - 1) + diferencia
+        # los asientos del cierre van en fecha_ns: si ya están, la cuenta se cerró antes
+        asentados = libro.movimientos(fecha_ns, fecha_ns)
+        asentado = sum(m if t == "DEP" else -m for _, t, m in asentados) if asentados else None
+        tasa = getattr(cuenta, "tasa_interes", 0.0)
+        if (getattr(cuenta, "ultimo_devengo_ns", None) or 0) >= marca_ns:
+            tasa = 0.0  # devengar_interes ya pagó este día
+        return (cuenta.numero_cuenta, cuenta.__class__.__name__, cuenta.cliente.dni, saldo, tasa, saldo_inicial,
+                libro.movimientos(desde_ns, fecha_ns - 1), asentado)
+
+
+def _plano_guardado(lector: LectorSQLite, numero: str, desde_ns: int, fecha_ns: int,
+                    marca_ns: int) -> Optional[CuentaPlana]:
+    # lo mismo que _plano, leyendo el archivo: saldo y movimientos en una misma foto
+    with lector.foto():
+        fila = lector.cuenta(numero)
+        if fila is None:
+            return None  # cerrada después de partir los shards
+        _, dni, clase, saldo, tasa, _, ultimo_devengo = fila
+        movimientos, asentado = [], None
+        # el saldo guardado es el actual: se le restan los movimientos desde el inicio del día
+        posteriores = del_dia = 0.0
+        for fecha, tipo, monto, delta in lector.movimientos(numero, desde_ns):
+            if fecha < fecha_ns:
+                del_dia += delta
+                movimientos.append((fecha, tipo, monto))
+            else:
+                posteriores += delta
+                if fecha == fecha_ns:
+                    asentado = (asentado or 0.0) + delta
+    if (ultimo_devengo or 0) >= marca_ns:
+        tasa = 0.0
+    saldo -= posteriores
+    return numero, clase, dni, saldo, tasa or 0.0, saldo - del_dia, movimientos, asentado
+
+
+def _estado(cuenta: CuentaPlana, fecha: date, ajuste: float) -> str:
+    numero, clase, dni, saldo, _, saldo_inicial, movimientos, _ = cuenta
+    lineas = [f"Cuenta {numero} ({clase}) - DNI {dni} - {fecha.isoformat()}",
+              f"  Saldo inicial: {saldo_inicial:>14,.2f}"]
+    for ns, tipo, monto in movimientos:
+        hora = datetime.fromtimestamp(ns / 1e9).strftime("%H:%M:%S")
+        lineas.append(f"  {hora} {tipo} {monto:>14,.2f}")
+    if ajuste > 0:
+        lineas.append(f"  Interés:       {ajuste:>14,.2f}")
+    elif ajuste < 0:
+        lineas.append(f"  Comisión:      {-ajuste:>14,.2f}")
+    lineas.append(f"  Saldo final:   {saldo + ajuste:>14,.2f}")
+    return "\n".join(lineas) + "\n\n"
+
+
+def procesar_shard(indice: int, cuentas: List[CuentaPlana], fecha: date, directorio: str,
+                   tasa_descubierto: float = TASA_DESCUBIERTO) -> dict:
+    """Trabajo de un proceso del pool: no toca el Banco, devuelve los asientos a aplicar"""
+    tiempos = {}
+    t0 = time.perf_counter()
+    # las cuentas ya cerradas en esta fecha no se vuelven a asentar
+    abiertas = [c for c in cuentas if c[7] is None]
+    ahorros = [c for c in abiertas if c[1] == "CuentaAhorro"]
+    intereses = calcular_intereses([c[3] for c in ahorros], [c[4] for c in ahorros], usar_numpy=False)
+    ajustes: Dict[str, float] = {c[0]: i for c, i in zip(ahorros, intereses) if i > 0}
+    t1 = time.perf_counter()
+    tiempos["intereses"] = t1 - t0
+    for c in abiertas:
+        if c[1] == "CuentaCorriente" and c[3] < 0:
+            comision = round(-c[3] * tasa_descubierto, 2)
+            if comision > 0:
+                ajustes[c[0]] = -comision
+    t2 = time.perf_counter()
+    tiempos["comisiones"] = t2 - t1
+    if not cuentas:
+        return {"indice": indice, "rango": None, "asientos": [], "estados": 0, "tiempos": tiempos}
+    # nombre por primera cuenta: al retomar, los índices cambian pero los rangos no
+    ruta = os.path.join(directorio, f"estados-{cuentas[0][0]}.txt")
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        archivo.writelines(_estado(c, fecha, c[7] if c[7] is not None else ajustes.get(c[0], 0.0))
+                           for c in cuentas)
+    os.replace(temporal, ruta)
+    tiempos["estados"] = time.perf_counter() - t2
+    return {
+        "indice": indice,
+        "rango": (cuentas[0][0], cuentas[-1][0]),
+        "asientos": list(ajustes.items()),
+        "estados": len(cuentas),
+        "tiempos": tiempos,
+    }
+
+
+def procesar_numeros(indice: int, ruta: str, numeros: List[str], desde_ns: int, fecha_ns: int, marca_ns: int,
+                     fecha: date, directorio: str, tasa_descubierto: float = TASA_DESCUBIERTO) -> dict:
+    """Como procesar_shard, pero el proceso lee del archivo SQLite las cuentas de `numeros`"""
+    t = time.perf_counter()
+    lector = LectorSQLite(ruta)
+    try:
+        cuentas = [_plano_guardado(lector, n, desde_ns, fecha_ns, marca_ns) for n in numeros]
+    finally:
+        lector.cerrar()
+    preparar = time.perf_counter() - t
+    resultado = procesar_shard(indice, [c for c in cuentas if c is not None], fecha, directorio, tasa_descubierto)
+    # el rango es el del shard aunque se haya cerrado alguna cuenta de las puntas
+    resultado["rango"] = (numeros[0], numeros[-1])
+    resultado["tiempos"]["preparar"] = preparar
+    return resultado
+
+
+def _shards(numeros: Iterator[str], control: "Checkpoint", tam_shard: int, resumen: dict) -> Iterator[List[str]]:
+    # un shard se corta también al llegar a una cuenta ya terminada: así su rango
+    # nunca se pisa con uno del checkpoint
+    shard: List[str] = []
+    for numero in numeros:
+        resumen["cuentas"] += 1
+        if control.terminada(numero):
+            resumen["omitidas"] += 1
+            if shard:
+                yield shard
+                shard = []
+            continue
+        shard.append(numero)
+        if len(shard) == tam_shard:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+class Checkpoint:
+    """Shards terminados de una fecha, en JSON (se reescribe atómicamente)"""
+
+    def __init__(self, ruta: Optional[str], fecha: date):
+        self.ruta = ruta
+        self.fecha = fecha.isoformat()
+        self.rangos: List[Tuple[str, str]] = []
+        if ruta and os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            # un checkpoint de otro día no sirve: se arranca de cero
+            if datos.get("fecha") == self.fecha:
+                self.rangos = sorted(tuple(r) for r in datos["rangos"])
+
+    def terminada(self, numero: str) -> bool:
+        # los rangos no se pisan: alcanza con mirar el último que empieza antes
+        i = bisect_right(self.rangos, (numero, "\uffff")) - 1
+        return i >= 0 and numero <= self.rangos[i][1]
+
+    def marcar(self, rango: Tuple[str, str]):
+        insort(self.rangos, tuple(rango))
+        if not self.ruta:
+            return
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump({"fecha": self.fecha, "rangos": self.rangos}, archivo)
+        os.replace(temporal, self.ruta)
+
+
+def _asentar(banco: Banco, resultado: dict, fecha_ns: int, marca_ns: int) -> Tuple[float, float]:
+    # las cuentas guardadas que nadie tiene en memoria se asientan sin armarlas
+    asientos, asentados = banco.asentar_sin_cargar(resultado["asientos"], fecha_ns, marca_ns)
+    # mismo orden de candados que Banco.transferir (número de cuenta)
+    asientos = sorted(asientos)
+    cuentas = [banco.buscar_cuenta_por_num(numero) for numero, _ in asientos]
+    pares = [(c, monto) for c, (_, monto) in zip(cuentas, asientos) if c is not None]
+    tomados = []
+    try:
+        for cuenta, _ in pares:
+            cuenta._candado.acquire()
+            tomados.append(cuenta._candado)
+        if pares:
+            # el interés avanza la marca de devengo en la misma escritura (no se devenga dos veces)
+            banco.acreditar_en_bloque(pares, fecha_ns, marca_ns=marca_ns)
+    finally:
+        for candado in tomados:
+            candado.release()
+    montos = [m for _, m in asentados] + [m for _, m in pares]
+    return sum(m for m in montos if m > 0), -sum(m for m in montos if m < 0)
+
+
+def cierre_diario(banco: Banco, fecha: Optional[date] = None, directorio: str = "estados",
+                  procesos: Optional[int] = None, tam_shard: int = 10_000, checkpoint: Optional[str] = None,
+                  tasa_descubierto: float = TASA_DESCUBIERTO, max_shards: Optional[int] = None) -> dict:
+    """Corre el cierre del día `fecha` (por defecto, hoy) y devuelve un resumen con tiempos por etapa.
+
+    Las etapas que corren en el pool (intereses, comisiones, estados) suman el
+    tiempo de todos los procesos; `segundos` es el tiempo real de la corrida.
+    procesos=0 procesa los shards en este mismo proceso (sin pool). `max_shards`
+    corta la corrida después de esa cantidad de shards, como si hubiera fallado.
+    """
+    if tam_shard <= 0:
+        raise ValueError("El tamaño de shard debe ser positivo")
+    inicio_total = time.perf_counter()
+    fecha = fecha or date.today()
+    inicio = datetime(fecha.year, fecha.month, fecha.day)
+    fin = inicio + timedelta(days=1)
+    desde_ns = fecha_a_ns(inicio)
+    # los asientos del cierre quedan en el último instante del día; el interés
+    # cubre el día completo, así que la marca de devengo queda al empezar el siguiente
+    marca_ns = fecha_a_ns(fin)
+    fecha_ns = marca_ns - 1
+    directorio = os.path.join(directorio, fecha.isoformat())
+    os.makedirs(directorio, exist_ok=True)
+    control = Checkpoint(checkpoint, fecha)
+    etapas = {"preparar": 0.0, "intereses": 0.0, "comisiones": 0.0, "estados": 0.0, "asentar": 0.0}
+
+    resumen = {"cuentas": 0, "omitidas": 0, "shards": 0, "intereses": 0.0, "comisiones": 0.0, "estados": 0}
+    shards = _shards(banco.iterar_numeros_cuentas(), control, tam_shard, resumen)
+    if max_shards is not None:
+        shards = islice(shards, max_shards)
+    ruta = banco.archivo
+
+    def integrar(resultado: dict):
+        t = time.perf_counter()
+        interes, comision = _asentar(banco, resultado, fecha_ns, marca_ns)
+        if resultado["rango"] is not None:
+            control.marcar(resultado["rango"])
+        etapas["asentar"] += time.perf_counter() - t
+        for etapa, segundos in resultado["tiempos"].items():
+            etapas[etapa] += segundos
+        resumen["intereses"] += interes
+        resumen["comisiones"] += comision
+        resumen["estados"] += resultado["estados"]
+
+    def tarea(numeros: List[str]) -> tuple:
+        # (función, argumentos) para el shard; sin archivo, los datos planos se arman acá
+        indice = resumen["shards"]
+        resumen["shards"] += 1
+        if ruta is not None:
+            return procesar_numeros, (indice, ruta, numeros, desde_ns, fecha_ns, marca_ns, fecha, directorio,
+                                      tasa_descubierto)
+        t = time.perf_counter()
+        cuentas = [banco.buscar_cuenta_por_num(n) for n in numeros]
+        datos = [_plano(c, desde_ns, fecha_ns, marca_ns) for c in cuentas if c is not None]
+        etapas["preparar"] += time.perf_counter() - t
+        return procesar_shard, (indice, datos, fecha, directorio, tasa_descubierto)
+
+    if procesos == 0:
+        for numeros in shards:
+            funcion, argumentos = tarea(numeros)
+            integrar(funcion(*argumentos))
+    else:
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            # como mucho dos shards por proceso en vuelo: la memoria no crece con el banco
+            en_vuelo = set()
+            agotado = False
+            while not agotado or en_vuelo:
+                while not agotado and len(en_vuelo) < 2 * procesos:
+                    numeros = next(shards, None)
+                    if numeros is None:
+                        agotado = True
+                    else:
+                        funcion, argumentos = tarea(numeros)
+                        en_vuelo.add(pool.submit(funcion, *argumentos))
+                if en_vuelo:
+                    listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        integrar(futuro.result())
+    segundos = time.perf_counter() - inicio_total
+    resumen.update({
+        "procesos": procesos,
+        "etapas": etapas,
+        "segundos": segundos,
+        "cuentas_por_segundo": (resumen["cuentas"] - resumen["omitidas"]) / segundos if segundos else 0.0,
+    })
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="archivo SQLite del banco")
+    parser.add_argument("--fecha", type=date.fromisoformat, help="día a cerrar (AAAA-MM-DD), por defecto hoy")
+    parser.add_argument("--procesos", type=int, help="procesos del pool (0: sin pool); por defecto, uno por núcleo")
+    parser.add_argument("--shard", type=int, default=10_000, help="cuentas por shard")
+    parser.add_argument("--salida", default="estados", help="directorio de los estados de cuenta")
+    parser.add_argument("--checkpoint", help="archivo JSON para retomar una corrida interrumpida")
+    args = parser.parse_args()
+
+    motor = MotorSQLite(args.db)
+    try:
+        resumen = cierre_diario(Banco(motor), args.fecha, args.salida, args.procesos, args.shard,
+                                args.checkpoint or args.db + ".cierre.json")
+    finally:
+        motor.cerrar()
+    print(f"Cuentas: {resumen['cuentas']} (ya cerradas: {resumen['omitidas']})  Shards: {resumen['shards']}  "
+          f"Procesos: {resumen['procesos']}")
+    print(f"Intereses: {resumen['intereses']:.2f}  Comisiones: {resumen['comisiones']:.2f}  "
+          f"Estados: {resumen['estados']}")
+    for etapa, segundos in resumen["etapas"].items():
+        print(f"  {etapa:<11} {segundos:8.2f}s")
+    print(f"Total: {resumen['segundos']:.2f}s ({resumen['cuentas_por_segundo']:,.0f} cuentas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 class Cliente:
+    __slots__ = ("__nombre", "__apellido", "__dni", "__weakref__")
+
     def __init__(self, nombre: str, apellido: str, dni: str):
         self.__nombre = None
         self.__apellido = None
@@ -9,6 +11,15 @@ class Cliente:
         self.apellido = apellido
         self.dni = dni
 
+    @classmethod
+    def _sin_validar(cls, nombre: str, apellido: str, dni: str) -> Cliente:
+        # para datos ya validados (p.ej. importación masiva): no vuelve a pasar por los setters
+        cliente = cls.__new__(cls)
+        cliente.__nombre = nombre
+        cliente.__apellido = apellido
+        cliente.__dni = dni
+        return cliente
+
     # Getters / setters con validación mínima
     @property
     def nombre(self) -> str:
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class CacheVistas:
+    """Vistas ya construidas de una sesión, por ruta, con desalojo LRU.
+
+    Cada vista se guarda con la firma del estado del Banco que muestra (por ejemplo
+    Banco.version o las Cuenta.version del cliente). Al volver a una ruta se
+    reutiliza la vista si la firma no cambió mientras no se mostraba; si cambió,
+    se construye de nuevo. `al_descartar(vista)` se llama con cada vista que la
+    cache suelta (desalojada, rearmada o invalidada) para liberar lo que la vista
+    haya agregado a la página; sin cache (max_vistas=0), al pedir la siguiente.
+    """
+
+    def __init__(self, max_vistas: int = 8, al_descartar: Optional[Callable[[object], None]] = None):
+        if max_vistas < 0:
+            raise ValueError("La cantidad máxima de vistas no puede ser negativa")
+        self.max_vistas = max_vistas
+        self.al_descartar = al_descartar
+        self._vistas: "OrderedDict[Hashable, list]" = OrderedDict()  # ruta -> [firma, vista]
+        self._suelta = None  # sin cache: la última vista armada, hasta que se pida otra
+        self._candado = threading.Lock()
+        self.aciertos = self.fallos = self.desalojos = 0
+
+    def obtener(self, ruta: Hashable, firma: Hashable, construir: Callable[[], object]):
+        with self._candado:
+            suelta, self._suelta = self._suelta, None
+            entrada = self._vistas.get(ruta)
+            if entrada is not None and entrada[0] == firma:
+                self._vistas.move_to_end(ruta)
+                self.aciertos += 1
+                vista = entrada[1]
+            else:
+                vista = None
+                self.fallos += 1
+        self._descartar([suelta] if suelta is not None else [])
+        if vista is not None:
+            return vista
+        # si construir falla (p. ej. cliente inexistente) no se guarda nada
+        vista = construir()
+        descartadas = []
+        with self._candado:
+            if not self.max_vistas:
+                self._suelta = vista
+                return vista
+            anterior = self._vistas.pop(ruta, None)
+            if anterior is not None:
+                descartadas.append(anterior[1])
+            self._vistas[ruta] = [firma, vista]
+            while len(self._vistas) > self.max_vistas:
+                descartadas.append(self._vistas.popitem(last=False)[1][1])
+                self.desalojos += 1
+        self._descartar(descartadas)
+        return vista
+
+    def _descartar(self, vistas: list):
+        # fuera del candado: al_descartar puede tocar la página
+        if self.al_descartar is not None:
+            for vista in vistas:
+                self.al_descartar(vista)
+
+    def sellar(self, ruta: Hashable, firma: Hashable):
+        """Registra la firma con la que se deja de mostrar la vista.
+
+        Las vistas se actualizan solas con lo que hace el usuario en ellas; solo
+        los cambios hechos mientras no se muestran deben invalidarlas.
+        """
+        with self._candado:
+            entrada = self._vistas.get(ruta)
+            if entrada is not None:
+                entrada[0] = firma
+
+    def invalidar(self, ruta: Optional[Hashable] = None):
+        """Descarta la vista de `ruta`, o todas si no se indica"""
+        with self._candado:
+            if ruta is None:
+                descartadas = [vista for _, vista in self._vistas.values()]
+                self._vistas.clear()
+            else:
+                entrada = self._vistas.pop(ruta, None)
+                descartadas = [entrada[1]] if entrada is not None else []
+        self._descartar(descartadas)
+
+    def __len__(self) -> int:
+        return len(self._vistas)
+
+    def estadisticas(self) -> dict:
+        with self._candado:
+            pedidos = self.aciertos + self.fallos
+            return {
+                "vistas": len(self._vistas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / pedidos if pedidos else 0.0,
+            }
@@ -0,0 +1,37 @@
+from typing import Callable, Dict, Hashable, Iterable, List
+
+
+class FilasPorClave:
+    """Filas de una tabla que se reutilizan entre actualizaciones.
+
+    Cada elemento se identifica con una clave estable (DNI, id de transacción);
+    al sincronizar solo se construyen las filas de claves nuevas y se reutilizan
+    los mismos objetos para las demás, así Flet manda al navegador solo las filas
+    agregadas o quitadas en lugar de la tabla entera.
+    """
+
+    def __init__(self, clave: Callable[[object], Hashable], construir: Callable[[object], object]):
+        self.clave = clave
+        self.construir = construir
+        self._filas: Dict[Hashable, object] = {}
+        self.construidas = 0
+
+    def sincronizar(self, filas: List[object], elementos: Iterable[object]) -> bool:
+        """Deja en `filas` (la misma lista) una fila por elemento; devuelve si cambió algo"""
+        anteriores = self._filas
+        vigentes: Dict[Hashable, object] = {}
+        nuevas = []
+        for elemento in elementos:
+            clave = self.clave(elemento)
+            fila = anteriores.get(clave)
+            if fila is None:
+                fila = self.construir(elemento)
+                self.construidas += 1
+            vigentes[clave] = fila
+            nuevas.append(fila)
+        # solo se guardan las filas visibles: la memoria no crece con la tabla
+        self._filas = vigentes
+        if len(nuevas) == len(filas) and all(a is b for a, b in zip(nuevas, filas)):
+            return False
+        filas[:] = nuevas
+        return True
@@ -5,6 +5,9 @@ class BaseLayout:
     
     def __init__(self, page: ft.Page):
         self.page = page
+        # header, footer y contenedor se arman una sola vez; al navegar solo cambia el contenido
+        self.contenedor = None
+        self.shell = None
         
     def create_header(self):
         """Header con título de la aplicación"""
@@ -55,13 +58,18 @@ class BaseLayout:
         )
     
     def render(self, content):
-        """Renderiza el layout completo"""
-        return ft.Column(
-            controls=[
-                self.create_header(),
-                self.create_container(content),
-                self.create_footer(),
-            ],
-            spacing=0,
-            expand=True,
-        )
\ No newline at end of file
+        """Renderiza el layout completo (la primera vez) y pone `content` en el centro"""
+        if self.shell is None:
+            self.contenedor = self.create_container(content)
+            self.shell = ft.Column(
+                controls=[
+                    self.create_header(),
+                    self.contenedor,
+                    self.create_footer(),
+                ],
+                spacing=0,
+                expand=True,
+            )
+        else:
+            self.contenedor.content = content
+        return self.shell
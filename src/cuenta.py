@@ -1,17 +1,46 @@
 from __future__ import annotations
-from typing import List
-import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import math
+import numbers
+import os
+import threading
+import time
+from collections import deque
+from itertools import islice
 # Importamos los modelos necesarios
 from cliente import Cliente
-from transaccion import Transaccion
+from transaccion import Transaccion, fecha_a_ns
+from libro_mayor import LibroMayor
+
+# movimiento = (transacción, variación del saldo que produce)
+Movimiento = Tuple[Transaccion, float]
+
 
 class Cuenta:
-    def __init__(self, cliente: Cliente):
+    # __weakref__: el motor SQLite mantiene un mapa de identidad con referencias débiles
+    __slots__ = ("__numero_cuenta", "__saldo", "__cliente", "__libro", "_observador", "_candado", "_recientes",
+                 "_diferido", "__weakref__")
+
+    # cuántos movimientos recientes se guardan aparte (configurable por clase)
+    tam_recientes = 10
+
+    def __init__(self, cliente: Cliente, numero_cuenta: Optional[str] = None):
         # atributos privados
-        self.__numero_cuenta = self._generar_numero()
+        self.__numero_cuenta = numero_cuenta or self._generar_numero()
         self.__saldo = 0.0
         self.__cliente = cliente
-        self.__transacciones: List[Transaccion] = []
+        # historial columnar: las Transaccion se materializan al pedirlas
+        self.__libro = LibroMayor()
+        # lo asigna el Banco cuando el almacenamiento necesita enterarse de los movimientos
+        self._observador: Optional[Callable[..., None]] = None
+        # un candado por cuenta: la validación del saldo y el movimiento son atómicos
+        # y las operaciones sobre cuentas distintas no se bloquean entre sí
+        self._candado = threading.RLock()
+        # últimos movimientos en un buffer circular; se crea con el primer movimiento
+        self._recientes: Optional[deque] = None
+        # historial guardado que todavía no se trajo: [cargar, cantidad, movimientos posteriores]
+        self._diferido: Optional[list] = None
 
     # Encapsulamiento
     @property
@@ -22,40 +51,259 @@ class Cuenta:
     def saldo(self) -> float:
         return self.__saldo
 
+    @property
+    def version(self) -> int:
+        """Crece con cada cambio de saldo (para invalidar cachés).
+
+        Es la cantidad de asientos del libro: como el libro se persiste, una cuenta
+        recargada del almacenamiento tiene la misma versión que tenía al guardarse.
+        """
+        diferido = self._diferido
+        if diferido is not None:
+            return diferido[1] + len(diferido[2])
+        return len(self.__libro)
+
     @property
     def cliente(self) -> Cliente:
         return self.__cliente
 
+    @property
+    def libro(self) -> LibroMayor:
+        diferido = self._diferido
+        if diferido is not None:
+            with self._candado:
+                if self._diferido is not None:
+                    self._traer_historial()
+        return self.__libro
+
     def _generar_numero(self) -> str:
-        return str(uuid.uuid4())[:8]
+        # mismo formato que los 8 primeros caracteres de un uuid4, sin construir el UUID
+        return os.urandom(4).hex()
 
     # Métodos - polimorfismo posible reimplementando en subclases
     def ingresar(self, monto: float) -> Transaccion:
+        if not math.isfinite(monto):
+            raise ValueError("El monto debe ser un número finito")
         if monto <= 0:
             raise ValueError("El monto a ingresar debe ser mayor que cero")
-        # Acceder al atributo privado mediante name mangling para modificarlo
-        self._Cuenta__saldo += monto
         tx = Transaccion("DEP", monto)
-        self._Cuenta__transacciones.append(tx)
+        with self._candado:
+            self._aplicar([(tx, tx.monto)])
         return tx
 
     def retirar(self, monto: float) -> Transaccion:
+        if not math.isfinite(monto):
+            raise ValueError("El monto debe ser un número finito")
         if monto <= 0:
             raise ValueError("El monto a retirar debe ser mayor que cero")
-        if monto > self.__saldo:
-            raise ValueError("Saldo insuficiente")
-        # Acceder al atributo privado mediante name mangling para modificarlo
-        self._Cuenta__saldo -= monto
-        tx = Transaccion("RET", monto)
-        self._Cuenta__transacciones.append(tx)
+        with self._candado:
+            if monto > self.__saldo:
+                raise ValueError("Saldo insuficiente")
+            tx = Transaccion("RET", monto)
+            self._aplicar([(tx, -tx.monto)])
         return tx
 
     def registrar_transaccion(self, tx: Transaccion):
         # permite registrar transacciones externas (p.ej. transferencia interna)
-        self._Cuenta__transacciones.append(tx)
+        with self._candado:
+            self._aplicar([(tx, 0.0)])
+
+    def _descubierto(self) -> float:
+        # cuánto puede quedar el saldo por debajo de cero (las subclases lo redefinen)
+        return 0.0
+
+    def aplicar_lote(self, operaciones: Iterable[Tuple[str, float]]) -> List[Optional[str]]:
+        """Aplica (tipo, monto) en orden y en una sola pasada.
+
+        Devuelve, por cada operación, None si se aplicó o el motivo del rechazo;
+        una operación rechazada no frena a las siguientes.
+        """
+        with self._candado:
+            return self._aplicar_lote(operaciones)
+
+    def _aplicar_lote(self, operaciones: Iterable[Tuple[str, float]]) -> List[Optional[str]]:
+        saldo = self.__saldo
+        descubierto = self._descubierto()
+        tipos, montos, deltas, resultados = [], [], [], []
+        for tipo, monto in operaciones:
+            # numbers.Real: también escalares de numpy, Fraction, etc.
+            if not isinstance(monto, numbers.Real) or not 0 < monto < math.inf:
+                resultados.append("El monto debe ser mayor que cero")
+                continue
+            monto = float(monto)
+            if tipo == "DEP":
+                delta = monto
+            elif tipo == "RET":
+                if monto > saldo + descubierto:
+                    resultados.append("Saldo insuficiente")
+                    continue
+                delta = -monto
+            else:
+                resultados.append("Tipo de transacción debe ser 'DEP' o 'RET'")
+                continue
+            saldo += delta
+            tipos.append(tipo)
+            montos.append(monto)
+            deltas.append(delta)
+            resultados.append(None)
+        if not montos:
+            return resultados
+        ahora = time.time_ns()
+        if self._observador is not None:
+            # el almacenamiento necesita las Transaccion para registrarlas
+            self._aplicar([(Transaccion(t, m, fecha_ns=ahora), d) for t, m, d in zip(tipos, montos, deltas)])
+        else:
+            self.libro.extender(tipos, montos, deltas, [ahora] * len(montos))
+            self.__saldo = saldo
+            n = len(self.__libro)
+            self._agregar_recientes(self.__libro.transacciones(max(0, n - self.tam_recientes, n - len(montos))))
+        return resultados
+
+    def _aplicar(self, movimientos: List[Movimiento]):
+        # se llama con el candado tomado; el observador (almacenamiento persistente)
+        # se entera antes de que cambie el saldo; si falla, la cuenta queda como estaba
+        if self._observador is not None:
+            self._observador(self, movimientos)
+        self._confirmar(movimientos)
+
+    def _confirmar(self, movimientos: List[Movimiento]):
+        # aplica sin avisar al observador: lo usa quien ya registró los movimientos (transferencias)
+        if not movimientos:
+            return
+        if self._diferido is not None:
+            # el historial guardado no se trajo: estos movimientos van detrás cuando se traiga
+            self._diferido[2].extend(movimientos)
+            for _, delta in movimientos:
+                self.__saldo += delta
+        else:
+            for tx, delta in movimientos:
+                self.__saldo += delta
+                self.__libro.agregar_transaccion(tx, delta)
+        self._agregar_recientes(tx for tx, _ in movimientos)
+
+    def _asentar(self, tipo: str, monto: float, delta: float, fecha_ns: int):
+        # alta directa en el libro, sin construir Transaccion ni avisar al observador
+        # (procesos masivos sin persistencia); se llama con el candado tomado
+        libro = self.libro
+        i = libro.agregar(tipo, monto, delta, fecha_ns)
+        self.__saldo += delta
+        if self._recientes is None:
+            self._recientes = deque(maxlen=self.tam_recientes)
+        self._recientes.append(Transaccion._vista(libro, i, tipo, monto, fecha_ns))
+
+    def _agregar_recientes(self, transacciones: Iterable[Transaccion]):
+        if self._recientes is None:
+            self._recientes = deque(maxlen=self.tam_recientes)
+        self._recientes.extend(transacciones)
+
+    def _cargar_historial(self, saldo: float, libro: LibroMayor):
+        # usado por los almacenamientos al reconstruir una cuenta guardada
+        self.__saldo = float(saldo)
+        self.__libro = libro
+        self._diferido = None
+        n = len(libro)
+        self._recientes = None
+        if n:
+            self._agregar_recientes(libro.transacciones(max(0, n - self.tam_recientes)))
+
+    def _diferir_historial(self, saldo: float, cantidad: int, recientes: List[Transaccion],
+                           cargar: Callable[[], LibroMayor]):
+        # como _cargar_historial, pero el libro (cantidad movimientos) se trae con
+        # cargar() la primera vez que se lo necesita; recientes son los últimos
+        self.__saldo = float(saldo)
+        self.__libro = LibroMayor()
+        self._recientes = None
+        if recientes:
+            self._agregar_recientes(recientes)
+        self._diferido = [cargar, cantidad, []]
+
+    def _traer_historial(self):
+        # con el candado tomado; si cargar() falla, la cuenta sigue sin historial y se reintenta
+        cargar, _, posteriores = self._diferido
+        libro = cargar()
+        for tx, delta in posteriores:
+            libro.agregar_transaccion(tx, delta)
+        self.__libro = libro
+        self._diferido = None
+
+    # Saldos en el tiempo (búsqueda binaria sobre el saldo acumulado del libro)
+    def saldo_a_fecha(self, fecha: datetime) -> float:
+        """Saldo que tenía la cuenta al final de `fecha` (incluye movimientos en esa fecha exacta)"""
+        with self._candado:
+            libro = self.libro
+            saldo = libro.saldo_hasta(fecha_a_ns(fecha))
+            # normalmente el saldo es la suma del libro; si se cargó otro saldo inicial, se respeta
+            diferencia = self.__saldo - libro.saldo_acumulado()
+            return saldo + diferencia if diferencia else saldo
+
+    def flujo_neto(self, desde: datetime, hasta: datetime) -> float:
+        """Depósitos menos retiros con desde < fecha <= hasta"""
+        with self._candado:
+            return self.libro.flujo(fecha_a_ns(desde), fecha_a_ns(hasta))
+
+    # Consultas del historial (sin copiarlo entero)
+    def consultar_transacciones(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                                tipo: Optional[str] = None, monto_min: Optional[float] = None,
+                                monto_max: Optional[float] = None, tam_pagina: int = 50,
+                                cursor: Optional[str] = None,
+                                recientes_primero: bool = False) -> Tuple[List[Transaccion], Optional[str]]:
+        """Una página de transacciones con desde <= fecha <= hasta y los filtros dados.
+
+        Devuelve (transacciones, cursor_siguiente); el cursor se pasa tal cual para
+        pedir la página siguiente con los mismos filtros y es None en la última.
+        """
+        if tam_pagina <= 0:
+            raise ValueError("El tamaño de página debe ser mayor que cero")
+        if tipo is not None and tipo not in ("DEP", "RET"):
+            raise ValueError("Tipo de transacción debe ser 'DEP' o 'RET'")
+        try:
+            inicio = int(cursor) if cursor is not None else None
+        except ValueError:
+            raise ValueError("Cursor inválido")
+        with self._candado:
+            libro = self.libro
+            posiciones = libro.buscar(
+                fecha_a_ns(desde) if desde else None, fecha_a_ns(hasta) if hasta else None,
+                tipo, monto_min, monto_max, inicio, recientes_primero)
+            pagina = [libro.transaccion(i) for i in islice(posiciones, tam_pagina)]
+            # el cursor es la posición del próximo resultado (el libro solo crece)
+            siguiente = next(posiciones, None)
+        return pagina, None if siguiente is None else str(siguiente)
+
+    def iterar_transacciones(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                             tipo: Optional[str] = None, monto_min: Optional[float] = None,
+                             monto_max: Optional[float] = None, tam_pagina: int = 500,
+                             recientes_primero: bool = False) -> Iterator[Transaccion]:
+        """Generador sobre todas las coincidencias, trayendo de a tam_pagina"""
+        cursor = None
+        while True:
+            pagina, cursor = self.consultar_transacciones(desde, hasta, tipo, monto_min, monto_max,
+                                                          tam_pagina, cursor, recientes_primero)
+            yield from pagina
+            if cursor is None:
+                return
+
+    def movimientos_recientes(self) -> List[Transaccion]:
+        """Los últimos `tam_recientes` movimientos (en orden), O(tam_recientes)"""
+        with self._candado:
+            return list(self._recientes) if self._recientes is not None else []
+
+    def ultimas_transacciones(self, cantidad: int = 10) -> List[Transaccion]:
+        """Las últimas `cantidad` transacciones, en orden cronológico"""
+        if cantidad <= 0:
+            return []
+        with self._candado:
+            if self._recientes is None:
+                return []
+            if cantidad <= self._recientes.maxlen:
+                return list(self._recientes)[-cantidad:]
+        pagina, _ = self.consultar_transacciones(tam_pagina=cantidad, recientes_primero=True)
+        pagina.reverse()
+        return pagina
 
     def obtener_transacciones(self) -> List[Transaccion]:
-        return list(self._Cuenta__transacciones)
+        with self._candado:
+            return list(self.libro)
 
     def mostrar_datos(self) -> dict:
         return {"numero_cuenta": self.numero_cuenta, "saldo": self.saldo, "cliente": self.cliente.mostrar_datos()}
@@ -66,45 +314,143 @@ class Cuenta:
 
 # Subclases para herencia y polimorfismo
 class CuentaAhorro(Cuenta):
-    def __init__(self, cliente: Cliente, tasa_interes: float = 0.01):
-        super().__init__(cliente)
+    __slots__ = ("__tasa_interes", "__ultimo_devengo")
+
+    def __init__(self, cliente: Cliente, tasa_interes: float = 0.01, numero_cuenta: Optional[str] = None,
+                 ultimo_devengo_ns: Optional[int] = None):
+        super().__init__(cliente, numero_cuenta)
         self.__tasa_interes = tasa_interes
+        # fin del último período devengado (ns); None si nunca se devengó
+        self.__ultimo_devengo = ultimo_devengo_ns
+
+    @property
+    def tasa_interes(self) -> float:
+        return self.__tasa_interes
+
+    @property
+    def ultimo_devengo_ns(self) -> Optional[int]:
+        return self.__ultimo_devengo
+
+    def devengar_interes(self, hasta: Optional[datetime] = None,
+                         periodo: timedelta = timedelta(days=1)) -> Optional[Transaccion]:
+        """Acredita en un solo movimiento el interés de todos los períodos completos
+        transcurridos desde el último devengo hasta `hasta` (por defecto, ahora).
+
+        La tasa es por período y capitaliza como llamar aplicar_interes al final de
+        cada período: sin movimientos en el medio, interés = saldo * ((1 + tasa)^k - 1).
+        Los movimientos intermedios se toman del libro (O(movimientos), no O(períodos)).
+        """
+        periodo_ns = periodo // timedelta(microseconds=1) * 1000
+        if periodo_ns <= 0:
+            raise ValueError("El período debe ser positivo")
+        hasta_ns = fecha_a_ns(hasta) if hasta else time.time_ns()
+        with self._candado:
+            libro = self.libro
+            desde_ns = self.__ultimo_devengo
+            if desde_ns is None:
+                # antes del primer movimiento el saldo era cero: se cuenta desde ahí
+                if not len(libro):
+                    return None
+                desde_ns = libro.fecha_ns_en(0)
+            periodos = (hasta_ns - desde_ns) // periodo_ns
+            if periodos <= 0:
+                return None
+            marca = desde_ns + periodos * periodo_ns
+            interes = self._interes_compuesto(desde_ns, periodos, periodo_ns)
+            movimientos = []
+            if interes > 0:
+                # fechado al cierre del último período (o después del último movimiento,
+                # para no desordenar el libro): así el próximo devengo lo capitaliza
+                tx = Transaccion("DEP", interes, fecha_ns=max(marca, libro.fecha_ns_en(len(libro) - 1)))
+                movimientos.append((tx, tx.monto))
+            self._aplicar_devengo(movimientos, marca)
+            return movimientos[0][0] if movimientos else None
+
+    def _interes_compuesto(self, desde_ns: int, periodos: int, periodo_ns: int) -> float:
+        libro = self.libro
+        factor = 1.0 + self.__tasa_interes
+        saldo = libro.saldo_hasta(desde_ns) + (self.saldo - libro.saldo_acumulado())
+        interes = 0.0
+        aplicados = 0
+        for i in libro.buscar(desde_ns + 1, desde_ns + periodos * periodo_ns):
+            # período (1..k) en cuyo cierre ya cuenta este movimiento
+            cierre = -(-(libro.fecha_ns_en(i) - desde_ns) // periodo_ns)
+            if cierre - 1 > aplicados:
+                if saldo > 0:
+                    ganado = saldo * (factor ** (cierre - 1 - aplicados) - 1)
+                    saldo += ganado
+                    interes += ganado
+                aplicados = cierre - 1
+            saldo += libro.delta_en(i)
+        if saldo > 0 and periodos > aplicados:
+            interes += saldo * (factor ** (periodos - aplicados) - 1)
+        return interes
+
+    def _aplicar_devengo(self, movimientos: List[Movimiento], marca_ns: int):
+        # movimiento y marca se registran juntos: tras una caída no se devenga dos veces
+        if self._observador is not None:
+            self._observador(self, movimientos, marca_ns)
+        self._confirmar(movimientos)
+        self.__ultimo_devengo = marca_ns
+
+    def _avanzar_devengo(self, marca_ns: int):
+        # la marca nunca retrocede: lo ya devengado no se vuelve a pagar
+        if self.__ultimo_devengo is None or marca_ns > self.__ultimo_devengo:
+            self.__ultimo_devengo = marca_ns
 
     def aplicar_interes(self):
-        # ejemplo simple: aplicar interes sobre saldo
-        interes = self.saldo * self.__tasa_interes
-        if interes > 0:
-            self.ingresar(interes)
+        # ejemplo simple: aplicar interes sobre saldo (un período, que termina ahora)
+        with self._candado:
+            interes = self.saldo * self.__tasa_interes
+            ahora = time.time_ns()
+            movimientos = []
+            if interes > 0:
+                libro = self.libro
+                # después del último movimiento, para no desordenar el libro
+                fecha_ns = max(ahora, libro.fecha_ns_en(len(libro) - 1)) if len(libro) else ahora
+                tx = Transaccion("DEP", interes, fecha_ns=fecha_ns)
+                movimientos.append((tx, tx.monto))
+            # mueve también la marca de devengo_interes: el período no se paga dos veces
+            self._aplicar_devengo(movimientos, max(ahora, self.__ultimo_devengo or ahora))
 
     def __repr__(self):
         return f"CuentaAhorro({self.numero_cuenta}, Saldo={self.saldo}, Tasa={self.__tasa_interes})"
 
 
 class CuentaCorriente(Cuenta):
-    def __init__(self, cliente: Cliente, limite_descubierto: float = 0.0):
-        super().__init__(cliente)
+    __slots__ = ("__limite_descubierto",)
+
+    def __init__(self, cliente: Cliente, limite_descubierto: float = 0.0, numero_cuenta: Optional[str] = None):
+        super().__init__(cliente, numero_cuenta)
         self.__limite_descubierto = float(limite_descubierto)
 
+    @property
+    def limite_descubierto(self) -> float:
+        return self.__limite_descubierto
+
+    def _descubierto(self) -> float:
+        return self.__limite_descubierto
+
     def retirar(self, monto: float) -> Transaccion:
+        if not math.isfinite(monto):
+            raise ValueError("El monto debe ser un número finito")
         if monto <= 0:
             raise ValueError("El monto a retirar debe ser mayor que cero")
-        disponible = self.saldo + self.__limite_descubierto
-        if monto > disponible:
-            raise ValueError("Saldo + límite insuficiente")
-        
-        # Uso del name mangling para acceder y modificar el saldo y transacciones
-        try:
-            self._Cuenta__saldo -= monto
-            
-            # Creamos y registramos la transacción
+        with self._candado:
+            disponible = self.saldo + self.__limite_descubierto
+            if monto > disponible:
+                raise ValueError("Saldo + límite insuficiente")
+
+            # Creamos la transacción y la aplicamos sin la comprobación estricta de Cuenta.retirar
             tx = Transaccion("RET", monto)
-            self._Cuenta__transacciones.append(tx)
-            return tx
-            
-        except Exception as e:
-            # En un sistema real, el name mangling podría ser más robusto, 
-            # pero aquí manejamos el error en caso de fallo interno.
-            raise RuntimeError("Error interno al procesar retiro con descubierto") from e
+            try:
+                self._aplicar([(tx, -tx.monto)])
+                return tx
+
+            except Exception as e:
+                # En un sistema real, el name mangling podría ser más robusto,
+                # pero aquí manejamos el error en caso de fallo interno.
+                raise RuntimeError("Error interno al procesar retiro con descubierto") from e
 
     def __repr__(self):
         return f"CuentaCorriente({self.numero_cuenta}, Saldo={self.saldo}, Descubierto={self.__limite_descubierto})"
\ No newline at end of file
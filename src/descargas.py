@@ -0,0 +1,78 @@
+"""Entrega de archivos generados (PDF) al usuario de la interfaz Flet.
+
+En modo web el archivo se publica en assets/descargas/<token>/<nombre> y el
+navegador lo baja desde esa ruta (el servidor de Flet sirve assets/ como
+archivos estáticos); el token aleatorio evita que se adivinen reportes ajenos.
+Solo se conservan las últimas `max_archivos` publicaciones y al iniciar la
+aplicación se borra lo que dejaron las ejecuciones anteriores (limpiar). En
+escritorio el usuario elige dónde guardarlo (FilePicker.save_file) y se escribe ahí.
+"""
+import os
+import re
+import secrets
+import shutil
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+ASSETS = Path(__file__).parent / "assets"
+
+
+class Descargas:
+    """Archivos publicados para descargar, con las últimas `max_archivos` en disco"""
+
+    def __init__(self, assets: Path = ASSETS, carpeta: str = "descargas", max_archivos: int = 32):
+        if max_archivos <= 0:
+            raise ValueError("La cantidad máxima de archivos debe ser positiva")
+        self.assets = Path(assets)
+        self.carpeta = carpeta
+        self.max_archivos = max_archivos
+        self._publicados: deque = deque()
+        self._candado = threading.Lock()
+
+    def publicar(self, contenido: bytes, nombre: str) -> str:
+        """Escribe el archivo bajo assets/ y devuelve la URL relativa para launch_url"""
+        nombre = self._nombre_seguro(nombre)
+        token = secrets.token_urlsafe(16)
+        directorio = self.assets / self.carpeta / token
+        directorio.mkdir(parents=True, exist_ok=True)
+        temporal = directorio / (nombre + ".tmp")
+        temporal.write_bytes(contenido)
+        os.replace(temporal, directorio / nombre)
+        with self._candado:
+            self._publicados.append(directorio)
+            viejos = []
+            while len(self._publicados) > self.max_archivos:
+                viejos.append(self._publicados.popleft())
+        for viejo in viejos:
+            shutil.rmtree(viejo, ignore_errors=True)
+        return f"/{self.carpeta}/{token}/{nombre}"
+
+    def limpiar(self):
+        """Borra todo lo publicado, también por ejecuciones anteriores (se llama al iniciar)"""
+        with self._candado:
+            self._publicados.clear()
+            shutil.rmtree(self.assets / self.carpeta, ignore_errors=True)
+
+    @staticmethod
+    def guardar(contenido: bytes, ruta: Optional[str]) -> Optional[str]:
+        """Escribe en la ruta elegida con FilePicker.save_file; None si el usuario canceló"""
+        if not ruta:
+            return None
+        if not ruta.lower().endswith(".pdf"):
+            ruta += ".pdf"
+        Path(ruta).write_bytes(contenido)
+        return ruta
+
+    @staticmethod
+    def _nombre_seguro(nombre: str) -> str:
+        # solo el nombre, sin directorios ni caracteres que rompan la URL
+        nombre = re.sub(r"[^\w.-]", "_", os.path.basename(nombre))
+        if not nombre.strip("._"):
+            raise ValueError("Nombre de archivo inválido")
+        return nombre
+
+
+# compartida por las vistas de la aplicación
+descargas = Descargas()
@@ -0,0 +1,177 @@
+"""Importación masiva de clientes y cuentas desde CSV.
+
+Formato (con encabezado; las dos últimas columnas son opcionales y vacías = sin cuenta):
+    dni,nombre,apellido,tasa_ahorro,limite_corriente
+
+Uso: python src/importador.py clientes.csv [--rechazados rechazados.csv] [--procesos 4] [--db banco.db]
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+# Importación de modelos
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cliente import Cliente
+from cuenta import CuentaAhorro, CuentaCorriente
+
+COLUMNAS = ("dni", "nombre", "apellido", "tasa_ahorro", "limite_corriente")
+
+# fila válida: (número de línea, dni, nombre, apellido, tasa_ahorro, limite_corriente)
+FilaValida = Tuple[int, str, str, str, Optional[float], Optional[float]]
+# fila rechazada: (número de línea, campos originales, motivo)
+FilaRechazada = Tuple[int, List[str], str]
+
+
+def _numero_opcional(valor: str, nombre: str) -> Optional[float]:
+    valor = valor.strip()
+    if not valor:
+        return None
+    try:
+        numero = float(valor)
+    except ValueError:
+        raise ValueError(f"{nombre} no es numérico")
+    # float() acepta "nan", "inf" y desborda "1e999" a inf
+    if not math.isfinite(numero):
+        raise ValueError(f"{nombre} debe ser finito")
+    if numero < 0:
+        raise ValueError(f"{nombre} no puede ser negativo")
+    return numero
+
+
+def validar_bloque(bloque: List[Tuple[int, List[str]]], posiciones: Tuple[int, ...]):
+    """Valida un bloque de filas (se ejecuta en los procesos trabajadores).
+
+    Usa las mismas reglas que los setters de Cliente y devuelve (validas, rechazadas).
+    """
+    validas: List[FilaValida] = []
+    rechazadas: List[FilaRechazada] = []
+    for linea, campos in bloque:
+        try:
+            valores = [campos[p].strip() if p is not None and p < len(campos) else "" for p in posiciones]
+            cliente = Cliente(valores[1], valores[2], valores[0])
+            tasa = _numero_opcional(valores[3], "tasa_ahorro")
+            limite = _numero_opcional(valores[4], "limite_corriente")
+        except ValueError as e:
+            rechazadas.append((linea, campos, str(e)))
+            continue
+        validas.append((linea, cliente.dni, cliente.nombre, cliente.apellido, tasa, limite))
+    return validas, rechazadas
+
+
+def _bloques(lector, tam_bloque: int) -> Iterator[List[Tuple[int, List[str]]]]:
+    numerado = ((lector.line_num, campos) for campos in lector if campos)
+    while True:
+        bloque = list(islice(numerado, tam_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _validados(bloques, posiciones, procesos: int, en_vuelo: int):
+    # en orden de archivo y con un máximo de bloques pendientes: el CSV nunca se lee entero.
+    # Junto al resultado va el bloque original, para rechazar filas con sus campos tal cual
+    if procesos <= 0:
+        for bloque in bloques:
+            yield (bloque,) + validar_bloque(bloque, posiciones)
+        return
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append((bloque, pool.submit(validar_bloque, bloque, posiciones)))
+            if len(pendientes) >= en_vuelo:
+                bloque, futuro = pendientes.popleft()
+                yield (bloque,) + futuro.result()
+        while pendientes:
+            bloque, futuro = pendientes.popleft()
+            yield (bloque,) + futuro.result()
+
+
+def importar_csv(banco, ruta: str, ruta_rechazados: Optional[str] = None, procesos: Optional[int] = None,
+                 tam_bloque: int = 20_000) -> dict:
+    """Importa clientes (y sus cuentas) desde un CSV en bloques; devuelve un resumen"""
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    inicio = time.perf_counter()
+    leidas = importados = cuentas_creadas = rechazados = 0
+    vistos = set()
+    with open(ruta, newline="", encoding="utf-8") as f, \
+            (open(ruta_rechazados, "w", newline="", encoding="utf-8") if ruta_rechazados else nullcontext()) as salida:
+        lector = csv.reader(f)
+        encabezado = [c.strip().lower() for c in next(lector, [])]
+        if not {"dni", "nombre", "apellido"} <= set(encabezado):
+            raise ValueError("El CSV debe tener encabezado con dni, nombre y apellido")
+        posiciones = tuple(encabezado.index(c) if c in encabezado else None for c in COLUMNAS)
+        escritor = csv.writer(salida) if ruta_rechazados else None
+        if escritor:
+            escritor.writerow(["linea", "motivo"] + encabezado)
+
+        for bloque, validas, rechazadas in _validados(_bloques(lector, tam_bloque), posiciones, procesos,
+                                                      2 * max(procesos, 1)):
+            leidas += len(validas) + len(rechazadas)
+            clientes, cuentas = [], []
+            originales = None
+            for linea, dni, nombre, apellido, tasa, limite in validas:
+                # duplicados dentro del archivo y contra el banco: ambos O(1)
+                if dni in vistos or banco.buscar_cliente_por_dni(dni) is not None:
+                    if originales is None:
+                        originales = dict(bloque)
+                    rechazadas.append((linea, originales[linea], "DNI duplicado"))
+                    continue
+                vistos.add(dni)
+                cliente = Cliente._sin_validar(nombre, apellido, dni)
+                clientes.append(cliente)
+                if tasa is not None:
+                    cuentas.append(CuentaAhorro(cliente, tasa))
+                if limite is not None:
+                    cuentas.append(CuentaCorriente(cliente, limite))
+            if clientes:
+                banco.agregar_lote(clientes, cuentas)
+            importados += len(clientes)
+            cuentas_creadas += len(cuentas)
+            rechazados += len(rechazadas)
+            if escritor:
+                escritor.writerows([linea, motivo] + campos for linea, campos, motivo in rechazadas)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "leidas": leidas,
+        "importados": importados,
+        "cuentas": cuentas_creadas,
+        "rechazados": rechazados,
+        "segundos": segundos,
+        "filas_por_segundo": leidas / segundos if segundos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archivo")
+    parser.add_argument("--rechazados", default="rechazados.csv")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--bloque", type=int, default=20_000)
+    parser.add_argument("--db", help="archivo SQLite destino (por defecto, banco en memoria)")
+    args = parser.parse_args()
+
+    if args.db:
+        banco = Banco(MotorSQLite(args.db))
+    else:
+        banco = Banco()
+    resumen = importar_csv(banco, args.archivo, args.rechazados, args.procesos, args.bloque)
+    print(f"Leídas: {resumen['leidas']}  Importados: {resumen['importados']}  "
+          f"Cuentas: {resumen['cuentas']}  Rechazados: {resumen['rechazados']}")
+    print(f"Tiempo: {resumen['segundos']:.2f}s ({resumen['filas_por_segundo']:,.0f} filas/s)")
+    if resumen["rechazados"]:
+        print(f"Filas rechazadas en {args.rechazados}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -153,7 +153,7 @@ def run_flet_app(banco: Banco):
                 cliente = banco.buscar_cliente_por_dni(dni_v)
                 if cliente is None:
                     raise ValueError("Cliente no encontrado")
-                cuentas = [c for c in banco.listar_cuentas() if c.cliente.dni == dni_v]
+                cuentas = banco.listar_cuentas_por_cliente(dni_v)
                 pdf_gen = PDFGenerator(nombre_pdf.value)
                 file_path = pdf_gen.generar_pdf_cliente(cliente, cuentas)
                 mensajes.value = f"✅ PDF generado: {file_path}"
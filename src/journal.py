@@ -0,0 +1,457 @@
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional, Tuple
+# Importación de modelos
+from cliente import Cliente
+from cuenta import Cuenta, CuentaAhorro, CuentaCorriente, Movimiento
+from transaccion import Transaccion
+
+# -------------------- JOURNAL (WRITE-AHEAD LOG) --------------------
+#
+# Archivo binario de solo agregado. Cada registro es:
+#   cabecera <BII (tipo, largo del cuerpo, crc32 del cuerpo) + cuerpo
+# Los textos van con prefijo de largo <H y los números en binario.
+# Un registro incompleto o con crc inválido al final (caída a mitad de escritura)
+# se descarta al recuperar y se trunca al reabrir.
+#
+# El archivo empieza con un registro REG_BASE: la posición absoluta de su primer
+# byte en la historia completa del journal. Así las posiciones siguen valiendo
+# después de un checkpoint, que vuelca el estado del banco a "<ruta>.snapshot" y
+# descarta del journal todo lo que el snapshot ya cubre.
+
+REG_CLIENTE = 1
+REG_CUENTA = 2
+REG_MOVIMIENTO = 3
+REG_TRANSFERENCIA = 4  # débito y crédito en un solo registro: se recuperan los dos o ninguno
+REG_DEVENGO = 5  # marca de último devengo y, si hubo, el movimiento de interés
+REG_CIERRE = 6  # cuenta cerrada (con saldo cero): al recuperar se vuelve a quitar
+REG_BASE = 7  # posición absoluta del comienzo del archivo
+# solo en el snapshot
+REG_HISTORIAL = 8  # tramo del historial de una cuenta, con ids y referencias
+REG_ESTADO = 9  # posición del journal hasta la que llega la cuenta y su marca de devengo
+
+_CABECERA = struct.Struct("<BII")
+_LARGO = struct.Struct("<H")
+_PARAMETRO = struct.Struct("<d")
+_MOVIMIENTO = struct.Struct("<ddq")  # monto, delta, fecha en nanosegundos
+_MARCA = struct.Struct("<qB")  # fin del período devengado (ns), cantidad de movimientos
+_POSICION = struct.Struct("<q")
+_ESTADO = struct.Struct("<qq")  # posición en el journal, marca de devengo (-1 si no hay)
+_CANTIDAD = struct.Struct("<I")
+_LARGO_BASE = _CABECERA.size + _POSICION.size
+# movimientos por registro REG_HISTORIAL
+TAM_TRAMO = 1024
+
+
+def _texto(valor: str) -> bytes:
+    datos = valor.encode("utf-8")
+    return _LARGO.pack(len(datos)) + datos
+
+
+def _leer_textos(cuerpo: bytes, cantidad: int, pos: int = 0) -> Tuple[List[str], int]:
+    textos = []
+    for _ in range(cantidad):
+        (largo,) = _LARGO.unpack_from(cuerpo, pos)
+        pos += _LARGO.size
+        textos.append(cuerpo[pos:pos + largo].decode("utf-8"))
+        pos += largo
+    return textos, pos
+
+
+def _cuerpo_movimiento(tx: Transaccion, delta: float) -> bytes:
+    return _texto(tx.id) + _texto(tx.tipo) + _MOVIMIENTO.pack(tx.monto, delta, tx.fecha_ns)
+
+
+def _leer_movimiento(cuerpo: bytes, pos: int = 0):
+    """Devuelve (numero_cuenta, id, tipo, monto, delta, ns) y la posición siguiente"""
+    (numero, id_tx, tipo_tx), pos = _leer_textos(cuerpo, 3, pos)
+    monto, delta, ns = _MOVIMIENTO.unpack_from(cuerpo, pos)
+    return (numero, id_tx, tipo_tx, monto, delta, ns), pos + _MOVIMIENTO.size
+
+
+def _registro(tipo: int, cuerpo: bytes) -> bytes:
+    return _CABECERA.pack(tipo, len(cuerpo), zlib.crc32(cuerpo)) + cuerpo
+
+
+def _registro_base(base: int) -> bytes:
+    return _registro(REG_BASE, _POSICION.pack(base))
+
+
+def _leer_registros(ruta: str) -> Iterator[Tuple[int, bytes, int]]:
+    """Devuelve (tipo, cuerpo, fin) de cada registro válido, en orden, leyendo de a uno"""
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb") as f:
+        pos = 0
+        while True:
+            cabecera = f.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                break
+            tipo, largo, crc = _CABECERA.unpack(cabecera)
+            cuerpo = f.read(largo)
+            if len(cuerpo) < largo or zlib.crc32(cuerpo) != crc:
+                break
+            pos += _CABECERA.size + largo
+            yield tipo, cuerpo, pos
+
+
+def _leer_journal(ruta: str) -> Iterator[Tuple[int, bytes, int]]:
+    """Como _leer_registros, pero con la posición absoluta del comienzo de cada registro"""
+    base = 0
+    for tipo, cuerpo, fin in _leer_registros(ruta):
+        if tipo == REG_BASE:
+            (base,) = _POSICION.unpack(cuerpo)
+        else:
+            yield tipo, cuerpo, base + fin - _CABECERA.size - len(cuerpo)
+
+
+class Journal:
+    """Registro previo a escritura de clientes, cuentas y movimientos con commit agrupado.
+
+    Cada llamada vuelve recién cuando su registro está en disco (fsync). Las llamadas
+    concurrentes se agrupan: un hilo escritor junta hasta ``tam_lote`` registros
+    (esperando como mucho ``espera_max`` segundos a que se acumulen) y los baja
+    con un único fsync. ``checkpoint`` vuelca el estado del banco a un snapshot y
+    acorta el archivo, que si no crecería sin límite.
+    """
+
+    def __init__(self, ruta: str, tam_lote: int = 64, espera_max: float = 0.001):
+        if tam_lote < 1:
+            raise ValueError("tam_lote debe ser al menos 1")
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self.espera_max = espera_max
+        # descartar una cola incompleta de una caída anterior antes de seguir agregando
+        fin_valido = 0
+        base = 0
+        for tipo, cuerpo, fin_valido in _leer_registros(ruta):
+            if tipo == REG_BASE:
+                (base,) = _POSICION.unpack(cuerpo)
+        self._archivo = open(ruta, "ab")
+        self._archivo.truncate(fin_valido)
+        if fin_valido == 0:
+            self._archivo.write(_registro_base(0))
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            fin_valido = _LARGO_BASE
+        self._base = base
+        self._fin = base + fin_valido  # posición absoluta hasta la que hay fsync hecho
+        # lo toma el escritor mientras baja un lote y el checkpoint mientras reemplaza el archivo
+        self._candado_archivo = threading.Lock()
+        self._cond = threading.Condition()
+        self._pendientes: List[bytes] = []
+        self._seq = 0          # último registro encolado
+        self._seq_durable = 0  # último registro con fsync hecho
+        self._error: Optional[BaseException] = None
+        self._cerrando = False
+        # estadísticas para medir el agrupamiento
+        self.registros = 0
+        self.fsyncs = 0
+        self._hilo = threading.Thread(target=self._escritor, name="journal-escritor", daemon=True)
+        self._hilo.start()
+
+    # API usada por el Banco
+    def registrar_cliente(self, cliente: Cliente):
+        self.registrar_clientes([cliente])
+
+    def registrar_clientes(self, clientes: List[Cliente]):
+        self._escribir([
+            _registro(REG_CLIENTE, _texto(c.dni) + _texto(c.nombre) + _texto(c.apellido))
+            for c in clientes
+        ])
+
+    def registrar_cuenta(self, cuenta: Cuenta):
+        self.registrar_cuentas([cuenta])
+
+    def registrar_cuentas(self, cuentas: List[Cuenta]):
+        self._escribir([self._registro_cuenta(c) for c in cuentas])
+
+    @staticmethod
+    def _registro_cuenta(cuenta: Cuenta) -> bytes:
+        if isinstance(cuenta, CuentaAhorro):
+            parametro = cuenta.tasa_interes
+        elif isinstance(cuenta, CuentaCorriente):
+            parametro = cuenta.limite_descubierto
+        else:
+            parametro = 0.0
+        cuerpo = (_texto(cuenta.numero_cuenta) + _texto(cuenta.cliente.dni)
+                  + _texto(cuenta.__class__.__name__) + _PARAMETRO.pack(parametro))
+        return _registro(REG_CUENTA, cuerpo)
+
+    def registrar_cierre(self, cuenta: Cuenta):
+        self._escribir([_registro(REG_CIERRE, _texto(cuenta.numero_cuenta))])
+
+    def registrar_movimientos(self, cuenta: Cuenta, movimientos: List[Movimiento]):
+        numero = _texto(cuenta.numero_cuenta)
+        self._escribir([
+            _registro(REG_MOVIMIENTO, numero + _cuerpo_movimiento(tx, delta))
+            for tx, delta in movimientos
+        ])
+
+    def registrar_bloque(self, pares: List[Tuple[Cuenta, List[Movimiento]]], marca_ns: Optional[int] = None):
+        # todos los movimientos en una sola espera: comparten los fsync del commit agrupado
+        registros = []
+        for cuenta, movimientos in pares:
+            if marca_ns is not None and isinstance(cuenta, CuentaAhorro):
+                # interés y marca en un registro, como registrar_devengo
+                registros.append(_registro(REG_DEVENGO, self._cuerpo_devengo(cuenta, movimientos, marca_ns)))
+            else:
+                registros += [_registro(REG_MOVIMIENTO, _texto(cuenta.numero_cuenta) + _cuerpo_movimiento(tx, delta))
+                              for tx, delta in movimientos]
+        self._escribir(registros)
+
+    @staticmethod
+    def _cuerpo_devengo(cuenta: CuentaAhorro, movimientos: List[Movimiento], marca_ns: int) -> bytes:
+        cuerpo = _texto(cuenta.numero_cuenta) + _MARCA.pack(marca_ns, len(movimientos))
+        return cuerpo + b"".join(_cuerpo_movimiento(tx, delta) for tx, delta in movimientos)
+
+    def registrar_devengo(self, cuenta: CuentaAhorro, movimientos: List[Movimiento], marca_ns: int):
+        self._escribir([_registro(REG_DEVENGO, self._cuerpo_devengo(cuenta, movimientos, marca_ns))])
+
+    def registrar_transferencia(self, origen: Cuenta, debito: Movimiento, destino: Cuenta, credito: Movimiento):
+        cuerpo = (_texto(origen.numero_cuenta) + _cuerpo_movimiento(*debito)
+                  + _texto(destino.numero_cuenta) + _cuerpo_movimiento(*credito))
+        self._escribir([_registro(REG_TRANSFERENCIA, cuerpo)])
+
+    @property
+    def ruta_snapshot(self) -> str:
+        return self.ruta + ".snapshot"
+
+    def posicion(self) -> int:
+        """Posición absoluta del final de lo que ya está en disco"""
+        with self._candado_archivo:
+            return self._fin
+
+    def checkpoint(self, banco) -> int:
+        """Vuelca el estado del banco a ruta_snapshot y quita del journal lo que ya cubre.
+
+        Las altas y cierres de cuentas esperan mientras dura; los movimientos solo
+        esperan mientras se copia su cuenta. Cada cuenta guarda la posición del
+        journal en la que se copió: al recuperar se omiten sus registros anteriores,
+        de modo que lo escrito durante el checkpoint no se aplica dos veces.
+        Devuelve los bytes que se quitaron del journal.
+        """
+        temporal = self.ruta_snapshot + ".tmp"
+        with banco._candado:
+            # todo lo anterior a esta posición ya está aplicado en el banco y queda en el snapshot
+            desde = self.posicion()
+            with open(temporal, "wb") as archivo:
+                for cliente in banco.iterar_clientes():
+                    archivo.write(_registro(REG_CLIENTE, _texto(cliente.dni) + _texto(cliente.nombre)
+                                            + _texto(cliente.apellido)))
+                for cuenta in banco.iterar_cuentas():
+                    # mismo orden de candados que cerrar_cuenta: primero el banco, después la cuenta
+                    with cuenta._candado:
+                        self._volcar_cuenta(archivo, cuenta, self.posicion())
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self.ruta_snapshot)
+        return self._truncar(desde)
+
+    def _volcar_cuenta(self, archivo, cuenta: Cuenta, posicion: int):
+        numero = _texto(cuenta.numero_cuenta)
+        archivo.write(self._registro_cuenta(cuenta))
+        libro = cuenta.libro
+        for desde in range(0, len(libro), TAM_TRAMO):
+            hasta = min(desde + TAM_TRAMO, len(libro))
+            cuerpo = [numero, _CANTIDAD.pack(hasta - desde)]
+            for i in range(desde, hasta):
+                tx = libro.transaccion(i)
+                cuerpo.append(_cuerpo_movimiento(tx, libro.delta_en(i)) + _texto(tx.referencia or ""))
+            archivo.write(_registro(REG_HISTORIAL, b"".join(cuerpo)))
+        marca = getattr(cuenta, "ultimo_devengo_ns", None)
+        archivo.write(_registro(REG_ESTADO, numero + _ESTADO.pack(posicion, -1 if marca is None else marca)))
+
+    def _truncar(self, hasta: int) -> int:
+        # copia la cola posterior a "hasta" a un archivo nuevo que arranca en esa posición
+        with self._candado_archivo:
+            desde = hasta - self._base
+            if desde <= _LARGO_BASE:
+                return 0
+            temporal = self.ruta + ".tmp"
+            with open(self.ruta, "rb") as origen, open(temporal, "wb") as destino:
+                destino.write(_registro_base(hasta - _LARGO_BASE))
+                origen.seek(desde)
+                shutil.copyfileobj(origen, destino)
+                destino.flush()
+                os.fsync(destino.fileno())
+            self._archivo.close()
+            os.replace(temporal, self.ruta)
+            self._archivo = open(self.ruta, "ab")
+            self._base = hasta - _LARGO_BASE
+            return desde - _LARGO_BASE
+
+    def cerrar(self):
+        with self._cond:
+            self._cerrando = True
+            self._cond.notify_all()
+        self._hilo.join()
+        self._archivo.close()
+
+    # Commit agrupado
+    def _escribir(self, registros: List[bytes]):
+        with self._cond:
+            if self._cerrando:
+                raise RuntimeError("El journal está cerrado")
+            self._pendientes.extend(registros)
+            self._seq += len(registros)
+            mio = self._seq
+            self._cond.notify_all()
+            while self._seq_durable < mio and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise RuntimeError("No se pudo escribir el journal") from self._error
+
+    def _escritor(self):
+        while True:
+            with self._cond:
+                while not self._pendientes and not self._cerrando:
+                    self._cond.wait()
+                if not self._pendientes:
+                    return
+                # dar una ventana corta para que otros hilos se sumen al mismo fsync
+                limite = time.monotonic() + self.espera_max
+                while len(self._pendientes) < self.tam_lote and not self._cerrando:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._cond.wait(restante)
+                lote = self._pendientes[:self.tam_lote]
+                del self._pendientes[:self.tam_lote]
+                hasta = self._seq_durable + len(lote)
+            datos = b"".join(lote)
+            try:
+                with self._candado_archivo:
+                    self._archivo.write(datos)
+                    self._archivo.flush()
+                    os.fsync(self._archivo.fileno())
+                    self._fin += len(datos)
+            except BaseException as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._seq_durable = hasta
+                self.registros += len(lote)
+                self.fsyncs += 1
+                self._cond.notify_all()
+
+
+# -------------------- RECUPERACIÓN --------------------
+
+def recuperar(ruta: str, banco=None):
+    """Reconstruye un Banco a partir del último snapshot (si hay) y el journal.
+
+    El banco recibido no debe tener este journal enganchado (se volvería a escribir);
+    lo habitual es recuperar en un Banco nuevo y recién después llamar a usar_journal.
+    """
+    if banco is None:
+        from almacenamiento import Banco
+        banco = Banco()
+    # número de cuenta -> posición del journal hasta la que la cubre el snapshot
+    cubiertas = _cargar_snapshot(ruta + ".snapshot", banco)
+    motor = banco._motor
+    for tipo, cuerpo, inicio in _leer_journal(ruta):
+        if tipo == REG_CLIENTE:
+            _recuperar_cliente(motor, cuerpo)
+        elif tipo == REG_CUENTA:
+            _recuperar_cuenta(motor, cuerpo)
+        elif tipo == REG_MOVIMIENTO:
+            movimiento, _ = _leer_movimiento(cuerpo)
+            if cubiertas.get(movimiento[0], -1) <= inicio:
+                _reaplicar(banco, movimiento)
+        elif tipo == REG_TRANSFERENCIA:
+            debito, pos = _leer_movimiento(cuerpo)
+            credito, _ = _leer_movimiento(cuerpo, pos)
+            # cada pata referencia el id de la otra
+            if cubiertas.get(debito[0], -1) <= inicio:
+                _reaplicar(banco, debito, referencia=credito[1])
+            if cubiertas.get(credito[0], -1) <= inicio:
+                _reaplicar(banco, credito, referencia=debito[1])
+        elif tipo == REG_DEVENGO:
+            (numero,), pos = _leer_textos(cuerpo, 1)
+            if cubiertas.get(numero, -1) > inicio:
+                continue
+            marca, cantidad = _MARCA.unpack_from(cuerpo, pos)
+            pos += _MARCA.size
+            movimientos = []
+            for _ in range(cantidad):
+                (id_tx, tipo_tx), pos = _leer_textos(cuerpo, 2, pos)
+                monto, delta, ns = _MOVIMIENTO.unpack_from(cuerpo, pos)
+                pos += _MOVIMIENTO.size
+                movimientos.append((Transaccion(tipo_tx, monto, id_transaccion=id_tx, fecha_ns=ns), delta))
+            cuenta = banco.buscar_cuenta_por_num(numero)
+            if not isinstance(cuenta, CuentaAhorro):
+                raise ValueError(f"Journal inconsistente: devengo de cuenta inexistente {numero}")
+            cuenta._confirmar(movimientos)
+            cuenta._avanzar_devengo(marca)
+        elif tipo == REG_CIERRE:
+            (numero,), _ = _leer_textos(cuerpo, 1)
+            cuenta = motor.obtener_cuenta(numero)
+            if cuenta is not None:
+                motor.eliminar_cuenta(cuenta)
+    return banco
+
+
+def _cargar_snapshot(ruta: str, banco) -> dict:
+    cubiertas = {}
+    motor = banco._motor
+    for tipo, cuerpo, _ in _leer_registros(ruta):
+        if tipo == REG_CLIENTE:
+            _recuperar_cliente(motor, cuerpo)
+        elif tipo == REG_CUENTA:
+            _recuperar_cuenta(motor, cuerpo)
+        elif tipo == REG_HISTORIAL:
+            (numero,), pos = _leer_textos(cuerpo, 1)
+            (cantidad,) = _CANTIDAD.unpack_from(cuerpo, pos)
+            pos += _CANTIDAD.size
+            movimientos = []
+            for _ in range(cantidad):
+                (id_tx, tipo_tx), pos = _leer_textos(cuerpo, 2, pos)
+                monto, delta, ns = _MOVIMIENTO.unpack_from(cuerpo, pos)
+                (referencia,), pos = _leer_textos(cuerpo, 1, pos + _MOVIMIENTO.size)
+                tx = Transaccion(tipo_tx, monto, id_transaccion=id_tx, fecha_ns=ns, referencia=referencia or None)
+                movimientos.append((tx, delta))
+            banco.buscar_cuenta_por_num(numero)._aplicar(movimientos)
+        elif tipo == REG_ESTADO:
+            (numero,), pos = _leer_textos(cuerpo, 1)
+            posicion, marca = _ESTADO.unpack_from(cuerpo, pos)
+            cubiertas[numero] = posicion
+            if marca >= 0:
+                banco.buscar_cuenta_por_num(numero)._avanzar_devengo(marca)
+    return cubiertas
+
+
+def _recuperar_cliente(motor, cuerpo: bytes):
+    (dni, nombre, apellido), _ = _leer_textos(cuerpo, 3)
+    if motor.obtener_cliente(dni) is None:
+        motor.agregar_cliente(Cliente(nombre, apellido, dni))
+
+
+def _recuperar_cuenta(motor, cuerpo: bytes):
+    (numero, dni, clase), pos = _leer_textos(cuerpo, 3)
+    (parametro,) = _PARAMETRO.unpack_from(cuerpo, pos)
+    if motor.existe_cuenta(numero):
+        return
+    cliente = motor.obtener_cliente(dni)
+    if clase == "CuentaAhorro":
+        cuenta = CuentaAhorro(cliente, parametro, numero_cuenta=numero)
+    elif clase == "CuentaCorriente":
+        cuenta = CuentaCorriente(cliente, parametro, numero_cuenta=numero)
+    else:
+        cuenta = Cuenta(cliente, numero_cuenta=numero)
+    motor.agregar_cuenta(cuenta)
+
+
+def _reaplicar(banco, movimiento, referencia: Optional[str] = None):
+    numero, id_tx, tipo_tx, monto, delta, ns = movimiento
+    cuenta = banco.buscar_cuenta_por_num(numero)
+    if cuenta is None:
+        raise ValueError(f"Journal inconsistente: movimiento de cuenta inexistente {numero}")
+    tx = Transaccion(tipo_tx, monto, id_transaccion=id_tx, fecha_ns=ns, referencia=referencia)
+    cuenta._aplicar([(tx, delta)])
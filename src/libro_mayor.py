@@ -0,0 +1,273 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple
+import threading
+import uuid
+# Importación de modelos
+from transaccion import Transaccion
+
+# -------------------- LIBRO MAYOR COLUMNAR --------------------
+
+TIPOS = ("DEP", "RET")
+_CODIGO_TIPO = {"DEP": 0, "RET": 1}
+
+# las columnas arrancan chicas y duplican su capacidad hasta TAM_BLOQUE; desde ahí
+# crecen de a TAM_BLOQUE (una cuenta con pocos movimientos no reserva un bloque entero)
+CAPACIDAD_INICIAL = 8
+TAM_BLOQUE = 1024
+# id todavía no generado (un uuid4 nunca es todo ceros)
+_ID_VACIO = bytes(16)
+# generar un id es leer, comparar y escribir: sin candado dos lectores concurrentes
+# (un reporte y una consulta sin el candado de la cuenta) podrían ver ids distintos.
+# Solo lo toma la primera lectura de cada id.
+_CANDADO_IDS = threading.Lock()
+
+
+class LibroMayor:
+    """Historial de una cuenta guardado en columnas tipadas paralelas.
+
+    Cada movimiento ocupa 8 (fecha ns) + 8 (monto) + 8 (delta de saldo) + 8 (saldo
+    acumulado) + 1 (tipo) + 16 (id uuid) bytes. Las columnas crecen por duplicación
+    y luego de a TAM_BLOQUE posiciones, las Transaccion se construyen recién cuando se piden y los ids se
+    generan la primera vez que alguien los lee.
+
+    El saldo acumulado (suma de deltas hasta cada posición) permite responder
+    saldos a una fecha y flujos por rango con búsqueda binaria sobre las fechas,
+    mientras las fechas vengan en orden (el caso normal); si no, se recorre.
+    """
+
+    def __init__(self):
+        self._n = 0
+        self._capacidad = 0
+        self._fechas = array("q")
+        self._montos = array("d")
+        self._deltas = array("d")
+        self._acumulados = array("d")
+        self._tipos = array("b")
+        self._ids = bytearray()
+        # ids que no son uuid (registrados desde afuera): posición -> texto
+        self._ids_texto = {}
+        # pocas posiciones tienen transacción vinculada (transferencias): posición -> id
+        self._referencias = {}
+        # fechas no decrecientes: habilita la búsqueda binaria
+        self._ordenado = True
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _reservar(self, cantidad: int):
+        necesaria = self._n + cantidad
+        if necesaria <= self._capacidad:
+            return
+        capacidad = self._capacidad
+        nueva = max(necesaria, min(max(2 * capacidad, CAPACIDAD_INICIAL), capacidad + TAM_BLOQUE))
+        extra = nueva - capacidad
+        ceros = bytes(8 * extra)
+        self._fechas.frombytes(ceros)
+        self._montos.frombytes(ceros)
+        self._deltas.frombytes(ceros)
+        self._acumulados.frombytes(ceros)
+        self._tipos.frombytes(ceros[:extra])
+        self._ids.extend(bytes(16 * extra))
+        self._capacidad = nueva
+
+    # Escritura
+    def agregar(self, tipo: str, monto: float, delta: float, fecha_ns: int, id_transaccion: Optional[str] = None,
+                referencia: Optional[str] = None) -> int:
+        if self._n == self._capacidad:
+            self._reservar(1)
+        i = self._n
+        if i and fecha_ns < self._fechas[i - 1]:
+            self._ordenado = False
+        self._fechas[i] = fecha_ns
+        self._montos[i] = monto
+        self._deltas[i] = delta
+        self._acumulados[i] = self._acumulados[i - 1] + delta if i else delta
+        self._tipos[i] = _CODIGO_TIPO[tipo]
+        if id_transaccion is not None:
+            self._guardar_id(i, id_transaccion)
+        if referencia is not None:
+            self._referencias[i] = referencia
+        self._n = i + 1
+        return i
+
+    def agregar_transaccion(self, tx: Transaccion, delta: float) -> int:
+        i = self.agregar(tx.tipo, tx.monto, delta, tx.fecha_ns, referencia=tx.referencia)
+        tx._vincular(self, i)
+        return i
+
+    def extender(self, tipos: Sequence[str], montos: Sequence[float], deltas: Sequence[float],
+                 fechas_ns: Sequence[int]):
+        """Agrega muchos movimientos de una vez (los ids se generan al leerlos)"""
+        cantidad = len(montos)
+        if not cantidad:
+            return
+        self._reservar(cantidad)
+        i, j = self._n, self._n + cantidad
+        fechas = array("q", fechas_ns)
+        if self._ordenado and (i and fechas[0] < self._fechas[i - 1]
+                               or any(a > b for a, b in zip(fechas, fechas[1:]))):
+            self._ordenado = False
+        self._fechas[i:j] = fechas
+        self._montos[i:j] = array("d", montos)
+        self._deltas[i:j] = array("d", deltas)
+        # mismo orden de sumas que Cuenta al actualizar el saldo: resultados idénticos
+        previo = self._acumulados[i - 1] if i else 0.0
+        self._acumulados[i:j] = array("d", accumulate(deltas, initial=previo))[1:]
+        self._tipos[i:j] = array("b", [_CODIGO_TIPO[t] for t in tipos])
+        self._n = j
+
+    def _guardar_id(self, i: int, id_transaccion: str):
+        try:
+            self._ids[16 * i:16 * i + 16] = uuid.UUID(id_transaccion).bytes
+        except ValueError:
+            self._ids_texto[i] = id_transaccion
+
+    # Lectura
+    def id_en(self, i: int) -> str:
+        texto = self._ids_texto.get(i)
+        if texto is not None:
+            return texto
+        crudo = bytes(self._ids[16 * i:16 * i + 16])
+        if crudo == _ID_VACIO:
+            with _CANDADO_IDS:
+                crudo = bytes(self._ids[16 * i:16 * i + 16])
+                if crudo == _ID_VACIO:
+                    crudo = uuid.uuid4().bytes
+                    self._ids[16 * i:16 * i + 16] = crudo
+        return str(uuid.UUID(bytes=crudo))
+
+    def transaccion(self, i: int) -> Transaccion:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("posición fuera del libro")
+        return Transaccion._vista(self, i, TIPOS[self._tipos[i]], self._montos[i], self._fechas[i],
+                                  self._referencias.get(i))
+
+    __getitem__ = transaccion
+
+    def __iter__(self) -> Iterator[Transaccion]:
+        return self.transacciones()
+
+    def transacciones(self, desde: int = 0, hasta: Optional[int] = None) -> Iterator[Transaccion]:
+        hasta = self._n if hasta is None else min(hasta, self._n)
+        for i in range(desde, hasta):
+            yield self.transaccion(i)
+
+    def delta_en(self, i: int) -> float:
+        return self._deltas[i]
+
+    def fecha_ns_en(self, i: int) -> int:
+        return self._fechas[i]
+
+    def movimientos(self, desde_ns: Optional[int] = None, hasta_ns: Optional[int] = None) -> List[Tuple[int, str, float]]:
+        """(fecha_ns, tipo, monto) con desde_ns <= fecha <= hasta_ns, sin construir Transaccion"""
+        fechas, montos, tipos = self._fechas, self._montos, self._tipos
+        return [(fechas[i], TIPOS[tipos[i]], montos[i]) for i in self.buscar(desde_ns, hasta_ns)]
+
+    def recorrer(self, desde_ns: Optional[int] = None,
+                 hasta_ns: Optional[int] = None) -> Iterator[Tuple[int, str, float, float]]:
+        """Como movimientos, pero perezoso y con el delta: (fecha_ns, tipo, monto, delta)"""
+        fechas, montos, deltas, tipos = self._fechas, self._montos, self._deltas, self._tipos
+        for i in self.buscar(desde_ns, hasta_ns):
+            yield fechas[i], TIPOS[tipos[i]], montos[i], deltas[i]
+
+    # Agregados a velocidad de arreglo (sin construir Transaccion).
+    # Las memoryview no deben conservarse mientras se agregan movimientos.
+    def montos(self) -> memoryview:
+        return memoryview(self._montos)[:self._n]
+
+    def deltas(self) -> memoryview:
+        return memoryview(self._deltas)[:self._n]
+
+    def fechas_ns(self) -> memoryview:
+        return memoryview(self._fechas)[:self._n]
+
+    def suma_montos(self, tipo: Optional[str] = None) -> float:
+        if tipo is None:
+            return sum(self.montos())
+        codigo = _CODIGO_TIPO[tipo]
+        return sum(m for m, t in zip(self.montos(), memoryview(self._tipos)[:self._n]) if t == codigo)
+
+    def suma_deltas(self) -> float:
+        return sum(self.deltas())
+
+    def buscar(self, desde_ns: Optional[int] = None, hasta_ns: Optional[int] = None, tipo: Optional[str] = None,
+               monto_min: Optional[float] = None, monto_max: Optional[float] = None,
+               inicio: Optional[int] = None, descendente: bool = False) -> Iterator[int]:
+        """Posiciones (perezosas) con desde_ns <= fecha <= hasta_ns y el resto de los filtros.
+
+        Con fechas ordenadas el rango se acota con búsqueda binaria; `inicio` es la
+        posición desde la que se sigue recorriendo (para paginar). Los movimientos
+        agregados después de empezar no se incluyen.
+        """
+        bajo, alto = 0, self._n
+        filtra_fecha = desde_ns is not None or hasta_ns is not None
+        if self._ordenado:
+            if desde_ns is not None:
+                bajo = bisect_left(self._fechas, desde_ns, 0, alto)
+            if hasta_ns is not None:
+                alto = bisect_right(self._fechas, hasta_ns, bajo, alto)
+            filtra_fecha = False
+        desde_ns = float("-inf") if desde_ns is None else desde_ns
+        hasta_ns = float("inf") if hasta_ns is None else hasta_ns
+        codigo = None if tipo is None else _CODIGO_TIPO[tipo]
+        minimo = float("-inf") if monto_min is None else monto_min
+        maximo = float("inf") if monto_max is None else monto_max
+        if descendente:
+            arranque = alto - 1 if inicio is None else min(inicio, alto - 1)
+            rango = range(arranque, bajo - 1, -1)
+        else:
+            rango = range(bajo if inicio is None else max(inicio, bajo), alto)
+        # acceso por índice, sin memoryview: el generador puede quedar suspendido mientras se agrega
+        fechas, montos, tipos = self._fechas, self._montos, self._tipos
+        for i in rango:
+            if codigo is not None and tipos[i] != codigo:
+                continue
+            if not minimo <= montos[i] <= maximo:
+                continue
+            if filtra_fecha and not desde_ns <= fechas[i] <= hasta_ns:
+                continue
+            yield i
+
+    # Saldos en el tiempo
+    @property
+    def ordenado(self) -> bool:
+        return self._ordenado
+
+    def saldo_acumulado(self) -> float:
+        """Suma de todos los deltas, O(1)"""
+        return self._acumulados[self._n - 1] if self._n else 0.0
+
+    def cantidad_hasta(self, fecha_ns: int) -> int:
+        """Cantidad de movimientos con fecha <= fecha_ns (O(log n) si está ordenado)"""
+        if self._ordenado:
+            return bisect_right(self._fechas, fecha_ns, 0, self._n)
+        return sum(1 for f in self.fechas_ns() if f <= fecha_ns)
+
+    def saldo_hasta(self, fecha_ns: int) -> float:
+        """Suma de deltas de los movimientos con fecha <= fecha_ns"""
+        if self._ordenado:
+            k = bisect_right(self._fechas, fecha_ns, 0, self._n)
+            return self._acumulados[k - 1] if k else 0.0
+        return sum(d for d, f in zip(self.deltas(), self.fechas_ns()) if f <= fecha_ns)
+
+    def flujo(self, desde_ns: int, hasta_ns: int) -> float:
+        """Suma de deltas con desde_ns < fecha <= hasta_ns"""
+        if hasta_ns <= desde_ns:
+            return 0.0
+        if self._ordenado:
+            return self.saldo_hasta(hasta_ns) - self.saldo_hasta(desde_ns)
+        return sum(d for d, f in zip(self.deltas(), self.fechas_ns()) if desde_ns < f <= hasta_ns)
+
+    def posiciones(self, tipo: Optional[str] = None, monto_min: Optional[float] = None,
+                   monto_max: Optional[float] = None) -> List[int]:
+        """Posiciones de los movimientos que cumplen el filtro"""
+        codigo = None if tipo is None else _CODIGO_TIPO[tipo]
+        minimo = float("-inf") if monto_min is None else monto_min
+        maximo = float("inf") if monto_max is None else monto_max
+        tipos = memoryview(self._tipos)[:self._n]
+        return [i for i, (m, t) in enumerate(zip(self.montos(), tipos))
+                if minimo <= m <= maximo and (codigo is None or t == codigo)]
@@ -1,23 +1,93 @@
+import functools
+import os
 import flet as ft
 from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from components.cache_vistas import CacheVistas
 from components.layout import BaseLayout
+from descargas import descargas
 from views.cliente_list_view import ClienteListView
 from views.cliente_detail_view import ClienteDetailView
 
-def main(page: ft.Page):
-    page.title = "Sistema Bancario - TP Integrador Final"
-     # Establecer el favicon
-    page.client_storage.set("favicon", "/assets/favicon.png")
-    
-   
-    page.padding = 0
-    page.window_width = 1200
-    page.window_height = 800
-    
-    # Inicializar banco
-    banco = Banco()
+MAX_VISTAS = 8  # vistas armadas que se conservan por sesión
+
+
+class Navegacion:
+    """Rutas de una sesión: reutiliza las vistas ya armadas y el layout"""
+
+    def __init__(self, page: ft.Page, banco: Banco, max_vistas: int = MAX_VISTAS):
+        self.page = page
+        self.banco = banco
+        self.layout = BaseLayout(page)
+        # se guardan pares (vista, controles): la vista se cierra cuando la cache la suelta
+        self.vistas = CacheVistas(max_vistas, al_descartar=self.descartar)
+        self.ruta_mostrada = None
+
+    def navigate(self, vista: str, dni: str = None):
+        """Navega entre vistas"""
+        if vista == "listado":
+            self.page.go("/")
+        elif vista == "detalle" and dni:
+            self.page.go(f"/detalle/{dni}")
+
+    def firma(self, ruta: str):
+        """Estado del Banco que muestra la vista de `ruta`: si cambia, la vista se rearma"""
+        if ruta == "/":
+            return self.banco.version
+        if ruta.startswith("/detalle/"):
+            dni = ruta.split("/")[-1]
+            return tuple((c.numero_cuenta, c.version) for c in self.banco.listar_cuentas_por_cliente(dni))
+        return None
+
+    def contenido(self, ruta: str):
+        """Controles de la vista de `ruta` (armados ahora o reutilizados)"""
+        if ruta == "/":
+            # Vista listado de clientes
+            return self.vistas.obtener(ruta, self.firma(ruta),
+                                       lambda: self.armar(ClienteListView(self.page, self.banco, self.navigate)))[1]
+        if ruta.startswith("/detalle/"):
+            # Vista detalle de cliente
+            dni = ruta.split("/")[-1]
+            try:
+                return self.vistas.obtener(ruta, self.firma(ruta), lambda: self.armar(
+                    ClienteDetailView(self.page, self.banco, dni, self.navigate)))[1]
+            except ValueError:
+                return ft.Text("Cliente no encontrado", size=24, color=ft.colors.RED_700)
+        return ft.Text("Página no encontrada", size=24)
+
+    @staticmethod
+    def armar(vista):
+        return vista, vista.render()
+
+    @staticmethod
+    def descartar(par):
+        """La cache soltó la vista: que saque de la página lo que haya agregado"""
+        vista, _ = par
+        cerrar = getattr(vista, "cerrar", None)
+        if cerrar is not None:
+            cerrar()
+
+    def route_change(self, route):
+        """Maneja los cambios de ruta"""
+        # lo que cambió mientras la vista estaba visible ya lo muestra ella misma
+        if self.ruta_mostrada is not None:
+            self.vistas.sellar(self.ruta_mostrada, self.firma(self.ruta_mostrada))
+        self.ruta_mostrada = self.page.route
+
+        # el layout se arma una sola vez; solo cambia el contenido del centro
+        shell = self.layout.render(self.contenido(self.page.route))
+        if len(self.page.controls) != 1 or self.page.controls[0] is not shell:
+            self.page.controls[:] = [shell]
+        self.page.update()
+
+
+def crear_banco() -> Banco:
+    """Banco único del proceso: todas las sesiones comparten cuentas, índices y candados"""
+    # con BANCO_DB se persiste en SQLite, si no queda en memoria
+    ruta_db = os.environ.get("BANCO_DB")
+    banco = Banco(MotorSQLite(ruta_db)) if ruta_db else Banco()
     
-    # Pre-cargar datos de ejemplo (opcional)
+    # Pre-cargar datos de ejemplo (opcional; con SQLite el cliente ya puede existir)
     try:
         c1 = banco.crear_cliente("Rocio", "Jacob", "12345678")
         ca = banco.crear_cuenta_ahorro(c1.dni, tasa_interes=0.02)
@@ -27,51 +97,34 @@ def main(page: ft.Page):
         cc.retirar(200)
     except:
         pass
+    return banco
+
+
+def main(page: ft.Page, banco: Banco):
+    page.title = "Sistema Bancario - TP Integrador Final"
+     # Establecer el favicon
+    page.client_storage.set("favicon", "/assets/favicon.png")
     
-    # Layout base
-    layout = BaseLayout(page)
-    
-    def navigate(vista: str, dni: str = None):
-        """Navega entre vistas"""
-        if vista == "listado":
-            page.go("/")
-        elif vista == "detalle" and dni:
-            page.go(f"/detalle/{dni}")
+   
+    page.padding = 0
+    page.window_width = 1200
+    page.window_height = 800
     
-    def route_change(route):
-        """Maneja los cambios de ruta"""
-        page.controls.clear()
-        
-        # Determinar qué vista mostrar
-        if page.route == "/":
-            # Vista listado de clientes
-            vista = ClienteListView(page, banco, navigate)
-            contenido = vista.render()
-        elif page.route.startswith("/detalle/"):
-            # Vista detalle de cliente
-            dni = page.route.split("/")[-1]
-            try:
-                vista = ClienteDetailView(page, banco, dni, navigate)
-                contenido = vista.render()
-            except ValueError:
-                contenido = ft.Text("Cliente no encontrado", size=24, color=ft.colors.RED_700)
-        else:
-            contenido = ft.Text("Página no encontrada", size=24)
-        
-        # Renderizar con el layout
-        page.add(layout.render(contenido))
-            # Ocultar splash cuando esté listo
-        # page.splash = None
-        page.update()
+    # Layout base y vistas de la sesión; el banco es el mismo para todas
+    navegacion = Navegacion(page, banco)
     
     # Configurar routing
-    page.on_route_change = route_change
+    page.on_route_change = navegacion.route_change
     page.go("/")
 
 if __name__ == "__main__":
+    # Inicializar banco una sola vez, antes de atender sesiones
+    banco = crear_banco()
+    # los PDF publicados por ejecuciones anteriores ya no los pide nadie
+    descargas.limpiar()
     # ft.app(target=main)
     ft.app(
-        target=main, 
+        target=functools.partial(main, banco=banco), 
         view=ft.WEB_BROWSER,
         assets_dir="assets"
         )
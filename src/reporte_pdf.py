@@ -1,44 +1,494 @@
-from typing import List
-from datetime import datetime
+import io
+import os
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
 # Importación de modelos
 from cliente import Cliente
 from cuenta import Cuenta 
+from transaccion import fecha_a_ns, ns_a_fecha
 
 try:
 # ... (el resto de la implementación es el mismo) ...
     from fpdf import FPDF
+    from fpdf.fonts import CORE_FONTS_CHARWIDTHS
 except Exception:
     FPDF = None
+    CORE_FONTS_CHARWIDTHS = {}
+
+# Reporte como datos planos (se puede mandar a otro proceso):
+# {"dni", "nombre", "apellido", "cuentas": [(numero, clase, saldo, [(fecha_ns, tipo, monto), ...])]}
+# Con período es el extracto del período: además "periodo": (desde_ns, hasta_ns) y
+# cada cuenta es (numero, clase, saldo al final del período, páginas de paginar_extracto).
+
+def datos_cliente(cliente: Cliente, cuentas: List[Cuenta], periodo: Optional[Tuple[datetime, datetime]] = None,
+                  filas_por_pagina: int = 40) -> dict:
+    datos = {"dni": cliente.dni, "nombre": cliente.nombre, "apellido": cliente.apellido}
+    if periodo is None:
+        datos["cuentas"] = [(c.numero_cuenta, c.__class__.__name__, c.saldo,
+                             [(tx.fecha_ns, tx.tipo, tx.monto) for tx in c.ultimas_transacciones(10)])
+                            for c in cuentas]
+        return datos
+    desde, hasta = periodo
+    datos["periodo"] = (fecha_a_ns(desde), fecha_a_ns(hasta))
+    datos["cuentas"] = []
+    for c in cuentas:
+        paginas = list(paginas_de_cuenta(c, desde, hasta, filas_por_pagina))
+        datos["cuentas"].append((c.numero_cuenta, c.__class__.__name__, paginas[-1]["saldo_final"], paginas))
+    return datos
+
+
+def ruta_reporte(directorio: str, dni: str, nombre: str) -> str:
+    """reportes/<últimos 2 del DNI>/<los 2 anteriores>/nombre: pocos miles de archivos por carpeta"""
+    return os.path.join(directorio, dni[-2:].rjust(2, "0"), dni[-4:-2].rjust(2, "0"), nombre)
+
+
+# Extracto completo: páginas armadas a medida que se recorre el libro, sin
+# cargar el historial. Cada página es un dict con numero, saldo_anterior
+# (transporte), filas [(fecha_ns, tipo, monto, saldo)], debitos, creditos y saldo_final.
+
+def paginar_extracto(movimientos: Iterable[Tuple[int, str, float, float]], saldo_inicial: float,
+                     filas_por_pagina: int = 40) -> Iterator[dict]:
+    """Agrupa (fecha_ns, tipo, monto, delta) en páginas; solo hay una página en memoria"""
+    if filas_por_pagina <= 0:
+        raise ValueError("Las filas por página deben ser positivas")
+    saldo = saldo_inicial
+    numero = 1
+    pagina = {"numero": numero, "saldo_anterior": saldo, "filas": [], "debitos": 0.0, "creditos": 0.0}
+    for fecha_ns, tipo, monto, delta in movimientos:
+        saldo += delta
+        pagina["filas"].append((fecha_ns, tipo, monto, saldo))
+        if delta < 0:
+            pagina["debitos"] -= delta
+        else:
+            pagina["creditos"] += delta
+        if len(pagina["filas"]) == filas_por_pagina:
+            pagina["saldo_final"] = saldo
+            yield pagina
+            numero += 1
+            pagina = {"numero": numero, "saldo_anterior": saldo, "filas": [], "debitos": 0.0, "creditos": 0.0}
+    # la última página (o la única, vacía, si no hubo movimientos)
+    if pagina["filas"] or numero == 1:
+        pagina["saldo_final"] = saldo
+        yield pagina
+
+
+def paginas_de_cuenta(cuenta: Cuenta, desde: datetime, hasta: datetime, filas_por_pagina: int = 40) -> Iterator[dict]:
+    """Páginas del extracto de `cuenta` para desde <= fecha <= hasta"""
+    saldo_inicial = cuenta.saldo_a_fecha(desde - timedelta(microseconds=1))
+    movimientos = cuenta.libro.recorrer(fecha_a_ns(desde), fecha_a_ns(hasta))
+    return paginar_extracto(movimientos, saldo_inicial, filas_por_pagina)
+
+
+def datos_guardados(lector, dni: str, periodo: Tuple[int, int], filas_por_pagina: int = 40) -> Optional[dict]:
+    """Como datos_cliente con período, leyendo del archivo con un almacenamiento_sqlite.LectorSQLite.
+
+    Las páginas se leen recién al recorrerlas: el reporte se tiene que escribir
+    dentro de la misma lector.foto(). None si el cliente no existe.
+    """
+    fila = lector.cliente(dni)
+    if fila is None:
+        return None
+    dni, nombre, apellido = fila
+    desde_ns, hasta_ns = periodo
+    datos = {"dni": dni, "nombre": nombre, "apellido": apellido, "periodo": periodo, "cuentas": []}
+    for numero, clase, saldo in lector.cuentas_de_cliente(dni):
+        # el saldo guardado es el actual: se le restan los movimientos posteriores
+        saldo_inicial = saldo - lector.suma_deltas(numero, desde_ns)
+        paginas = _paginas_guardadas(lector, numero, desde_ns, hasta_ns, saldo_inicial, filas_por_pagina)
+        datos["cuentas"].append((numero, clase, saldo - lector.suma_deltas(numero, hasta_ns + 1), paginas))
+    return datos
+
+
+def _paginas_guardadas(lector, numero: str, desde_ns: int, hasta_ns: int, saldo_inicial: float,
+                       filas_por_pagina: int) -> Iterator[dict]:
+    # generador: la consulta corre cuando se pide la primera página
+    yield from paginar_extracto(lector.movimientos(numero, desde_ns, hasta_ns), saldo_inicial, filas_por_pagina)
+
+
+# -------------------- CACHÉ DE REPORTES --------------------
+
+PLANTILLA_CLIENTE = "cliente-1"  # cambiarla si cambia el diseño del reporte
+
+
+def clave_reporte(cliente: Cliente, cuentas: List[Cuenta], plantilla: str = PLANTILLA_CLIENTE) -> tuple:
+    """Cambia si cambia el cliente, alguna cuenta (Cuenta.version y saldo) o la plantilla.
+
+    Solo usa datos persistidos: la clave es la misma aunque el motor recargue la cuenta.
+    """
+    return (cliente.dni, cliente.nombre, cliente.apellido, plantilla,
+            tuple(sorted((c.numero_cuenta, c.version, c.saldo) for c in cuentas)))
+
+
+class CacheReportes:
+    """PDFs ya generados, con desalojo LRU por tamaño total en bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20):
+        if max_bytes <= 0:
+            raise ValueError("El tamaño máximo debe ser positivo")
+        self.max_bytes = max_bytes
+        self._entradas: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._candado = threading.Lock()
+        self.aciertos = self.fallos = self.desalojos = 0
+
+    def obtener(self, clave: Hashable, generar: Callable[[], bytes]) -> bytes:
+        with self._candado:
+            contenido = self._entradas.get(clave)
+            if contenido is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return contenido
+            self.fallos += 1
+        # se genera sin el candado: otros pedidos no esperan a FPDF
+        contenido = generar()
+        self._guardar(clave, contenido)
+        return contenido
+
+    def _guardar(self, clave: Hashable, contenido: bytes):
+        if len(contenido) > self.max_bytes:
+            return
+        with self._candado:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[clave] = contenido
+            self._bytes += len(contenido)
+            while self._bytes > self.max_bytes:
+                _, viejo = self._entradas.popitem(last=False)
+                self._bytes -= len(viejo)
+                self.desalojos += 1
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> dict:
+        with self._candado:
+            pedidos = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / pedidos if pedidos else 0.0,
+            }
+
+
+# compartida por las vistas de la aplicación
+cache_reportes = CacheReportes()
+
+
+# -------------------- PDF EN STREAMING --------------------
+
+_PT_POR_MM = 72 / 25.4
+
+
+class EscritorPDF:
+    """PDF que se escribe en `archivo` página por página, a medida que se dibuja.
+
+    FPDF guarda todas las páginas hasta output(): un extracto de un millón de
+    movimientos no entra en memoria. Acá cada página se comprime y se escribe al
+    empezar la siguiente; solo queda el offset de cada objeto para la tabla xref
+    (16 bytes por página). Dibuja como FPDF: mm desde arriba a la izquierda,
+    márgenes de 10 mm y Helvetica (la "Arial" de FPDF).
+    """
+
+    ANCHO, ALTO, MARGEN = 210.0, 297.0, 10.0  # A4
+    PAGINAS = 2  # número de objeto del árbol de páginas (se escribe al cerrar)
+
+    def __init__(self, archivo: BinaryIO):
+        self.archivo = archivo
+        self.paginas = 0
+        self._posicion = 0
+        self._offsets = array("Q", [0])  # el objeto 0 es el libre
+        self._ops: Optional[List[str]] = None
+        self._bordes: List[str] = []
+        self._tabla = None  # (anchos, x, y de la última fila, y de la primera) de la tabla en curso
+        self.x = self.y = self.MARGEN
+        self._tam, self._negrita = 10.0, False
+        self._escribir(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._objeto(1, f"<< /Type /Catalog /Pages {self.PAGINAS} 0 R >>")
+        self._offsets.append(0)  # el árbol de páginas va al final
+        for numero, fuente in ((3, "Helvetica"), (4, "Helvetica-Bold")):
+            self._objeto(numero, f"<< /Type /Font /Subtype /Type1 /BaseFont /{fuente} /Encoding /WinAnsiEncoding >>")
+
+    def _escribir(self, datos: bytes):
+        self.archivo.write(datos)
+        self._posicion += len(datos)
+
+    def _objeto(self, numero: int, cuerpo: str, flujo: bytes = b""):
+        if numero == len(self._offsets):
+            self._offsets.append(self._posicion)
+        else:
+            self._offsets[numero] = self._posicion
+        if flujo:
+            cuerpo = f"<< /Filter /FlateDecode /Length {len(flujo)} >>\nstream\n"
+        self._escribir(f"{numero} 0 obj\n{cuerpo}".encode("latin-1"))
+        if flujo:
+            self._escribir(flujo + b"\nendstream")
+        self._escribir(b"\nendobj\n")
+
+    def nueva_pagina(self):
+        self._terminar_pagina()
+        self.paginas += 1
+        self._ops = []
+        self.x = self.y = self.MARGEN
+
+    def _terminar_pagina(self):
+        if self._ops is None:
+            return
+        self._cerrar_tabla()
+        if self._bordes:
+            self._ops.append("0.57 w " + " ".join(self._bordes) + " S")
+        contenido = zlib.compress("\n".join(self._ops).encode("latin-1"))
+        self._ops, self._bordes = None, []
+        flujo = 2 * self.paginas + 3
+        self._objeto(flujo, "", contenido)
+        self._objeto(flujo + 1, f"<< /Type /Page /Parent {self.PAGINAS} 0 R /MediaBox [0 0 595.28 841.89] "
+                                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {flujo} 0 R >>")
+
+    def fuente(self, tam: float, negrita: bool = False):
+        self._tam, self._negrita = tam, negrita
+
+    def _ancho(self, texto: str) -> float:
+        anchos = CORE_FONTS_CHARWIDTHS.get("helveticaB" if self._negrita else "helvetica", {})
+        try:
+            unidades = sum(map(anchos.__getitem__, texto))
+        except KeyError:
+            unidades = sum(anchos.get(c, 556) for c in texto)
+        return unidades * self._tam / 1000 / _PT_POR_MM
+
+    def celda(self, ancho: float, alto: float, texto: str = "", borde: bool = False, alinear: str = "L",
+              salto: bool = False):
+        """Como FPDF.cell: ancho 0 llega hasta el margen derecho"""
+        if ancho == 0:
+            ancho = self.ANCHO - self.MARGEN - self.x
+        k = _PT_POR_MM
+        if borde:
+            self._bordes.append(f"{self.x * k:.2f} {(self.ALTO - self.y - alto) * k:.2f} {ancho * k:.2f} "
+                                f"{alto * k:.2f} re")
+        if texto:
+            if alinear == "R":
+                x = self.x + ancho - 1 - self._ancho(texto)
+            elif alinear == "C":
+                x = self.x + (ancho - self._ancho(texto)) / 2
+            else:
+                x = self.x + 1
+            y = self.y + alto / 2 + 0.3 * self._tam / k
+            self._ops.append(f"BT /F{2 if self._negrita else 1} {self._tam:.2f} Tf {x * k:.2f} "
+                             f"{(self.ALTO - y) * k:.2f} Td ({self._literal(texto)}) Tj ET")
+        if salto:
+            self.salto(alto)
+        else:
+            self.x += ancho
+
+    def fila(self, anchos: Tuple[float, ...], alto: float, textos: Tuple[str, ...], alineaciones: str):
+        """Una fila de celdas con borde, de una vez (el extracto dibuja millones).
+
+        Filas seguidas con las mismas columnas forman una tabla: su grilla se dibuja
+        con una línea por fila y las verticales de toda la tabla al final.
+        """
+        k = _PT_POR_MM
+        x = self.x
+        if self._tabla is None or self._tabla[:3] != (anchos, x, self.y):
+            self._cerrar_tabla()
+            self._tabla = (anchos, x, self.y, self.y)
+            self._bordes.append(f"{x * k:.2f} {(self.ALTO - self.y) * k:.2f} m {(x + sum(anchos)) * k:.2f} "
+                                f"{(self.ALTO - self.y) * k:.2f} l")
+        inicio = self._tabla[3]
+        base = f"{(self.ALTO - self.y - alto / 2 - 0.3 * self._tam / k) * k:.2f}"
+        fuente = f"BT /F{2 if self._negrita else 1} {self._tam:.2f} Tf "
+        for ancho, texto, alinear in zip(anchos, textos, alineaciones):
+            if alinear == "R":
+                tx = x + ancho - 1 - self._ancho(texto)
+            elif alinear == "C":
+                tx = x + (ancho - self._ancho(texto)) / 2
+            else:
+                tx = x + 1
+            self._ops.append(f"{fuente}{tx * k:.2f} {base} Td ({self._literal(texto)}) Tj ET")
+            x += ancho
+        self.salto(alto)
+        abajo = f"{(self.ALTO - self.y) * k:.2f}"
+        self._bordes.append(f"{self._tabla[1] * k:.2f} {abajo} m {x * k:.2f} {abajo} l")
+        self._tabla = (anchos, self._tabla[1], self.y, inicio)
+
+    def _cerrar_tabla(self):
+        # verticales de la tabla en curso, de la primera fila a la última
+        if self._tabla is None:
+            return
+        anchos, x, fin, inicio = self._tabla
+        k = _PT_POR_MM
+        arriba, abajo = f"{(self.ALTO - inicio) * k:.2f}", f"{(self.ALTO - fin) * k:.2f}"
+        for ancho in (0,) + anchos:
+            x += ancho
+            self._bordes.append(f"{x * k:.2f} {arriba} m {x * k:.2f} {abajo} l")
+        self._tabla = None
+
+    @staticmethod
+    def _literal(texto: str) -> str:
+        # WinAnsiEncoding: cp1252 escrito byte a byte, con \, ( y ) escapados
+        if not texto.isascii():
+            texto = texto.encode("cp1252", "replace").decode("latin-1")
+        return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def salto(self, alto: float):
+        self.x = self.MARGEN
+        self.y += alto
+
+    def cerrar(self):
+        """Escribe la última página, el árbol de páginas, la tabla xref y el trailer"""
+        if self.paginas == 0:
+            self.nueva_pagina()
+        self._terminar_pagina()
+        # el árbol de páginas se arma de a tramos: las páginas son los objetos 6, 8, 10...
+        self._offsets[self.PAGINAS] = self._posicion
+        self._escribir(f"{self.PAGINAS} 0 obj\n<< /Type /Pages /Count {self.paginas} /Kids [".encode("latin-1"))
+        for inicio in range(0, self.paginas, 1000):
+            fin = min(inicio + 1000, self.paginas)
+            self._escribir("".join(f"{2 * i + 6} 0 R " for i in range(inicio, fin)).encode("latin-1"))
+        self._escribir(b"] >>\nendobj\n")
+        xref = self._posicion
+        self._escribir(f"xref\n0 {len(self._offsets)}\n0000000000 65535 f \n".encode("latin-1"))
+        for inicio in range(1, len(self._offsets), 1000):
+            tramo = self._offsets[inicio:inicio + 1000]
+            self._escribir("".join(f"{offset:010d} 00000 n \n" for offset in tramo).encode("latin-1"))
+        self._escribir(f"trailer\n<< /Size {len(self._offsets)} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+                       .encode("latin-1"))
+
 
 # -------------------- GENERADOR DE PDF (FPDF) --------------------
 
+_COLUMNAS_EXTRACTO = (50, 20, 45, 45)  # Fecha, Tipo, Monto, Saldo (mm)
+_directorios_creados = set()  # se crean una vez por proceso, no en cada reporte
+
+
 class PDFGenerator:
-    def __init__(self, filename: str = "reporte.pdf"):
+    def __init__(self, filename: str = "reporte.pdf", directorio: str = "reportes",
+                 cache: Optional[CacheReportes] = None):
         if FPDF is None:
             raise ImportError("FPDF no está instalado. Ejecutar: pip install fpdf2")
         self.filename = filename
+        self.directorio = directorio
+        self.cache = cache
+
+    def _preparar_directorio(self):
+        if self.directorio not in _directorios_creados:
+            os.makedirs(self.directorio, exist_ok=True)
+            _directorios_creados.add(self.directorio)
 
     def generar_pdf_cliente(self, cliente: Cliente, cuentas: List[Cuenta]):
+        self._preparar_directorio()
+        ruta = os.path.join(self.directorio, self.filename)
+        if self.cache is None:
+            self.generar_desde_datos(datos_cliente(cliente, cuentas), ruta)
+        else:
+            with open(ruta, "wb") as archivo:
+                archivo.write(self.generar_pdf_bytes(cliente, cuentas))
+        return self.filename
+
+    def generar_pdf_bytes(self, cliente: Cliente, cuentas: List[Cuenta]) -> bytes:
+        """El mismo reporte en memoria, sin escribir nada en disco (y de la caché si hay)"""
+        if self.cache is None:
+            return self.generar_desde_datos(datos_cliente(cliente, cuentas))
+        return self.cache.obtener(clave_reporte(cliente, cuentas),
+                                  lambda: self.generar_desde_datos(datos_cliente(cliente, cuentas)))
+
+    def generar_extracto(self, cuenta: Cuenta, desde: datetime, hasta: datetime, guardar: bool = True,
+                         filas_por_pagina: int = 40):
+        """Extracto con todos los movimientos del período, página por página.
+
+        Con guardar=True escribe reportes/<filename> a medida que dibuja y devuelve
+        el nombre; si no, devuelve los bytes del PDF.
+        """
+        cliente = cuenta.cliente
+        titular = f"{cliente.nombre} {cliente.apellido} - DNI {cliente.dni}"
+        periodo = f"{desde.strftime('%d/%m/%Y')} al {hasta.strftime('%d/%m/%Y')}"
+
+        def escribir(archivo: BinaryIO):
+            escritor = EscritorPDF(archivo)
+            self._dibujar_extracto(escritor, cuenta.numero_cuenta, cuenta.__class__.__name__, titular, periodo,
+                                   paginas_de_cuenta(cuenta, desde, hasta, filas_por_pagina))
+            escritor.cerrar()
+
+        if not guardar:
+            salida = io.BytesIO()
+            escribir(salida)
+            return salida.getvalue()
+        self._preparar_directorio()
+        with open(os.path.join(self.directorio, self.filename), "wb") as archivo:
+            escribir(archivo)
+        return self.filename
+
+    @staticmethod
+    def _dibujar_extracto(pdf: "EscritorPDF", numero: str, clase: str, titular: str, periodo: str,
+                          paginas: Iterable[dict]):
+        for pagina in paginas:
+            pdf.nueva_pagina()
+            pdf.fuente(14, negrita=True)
+            pdf.celda(0, 8, f"Extracto de cuenta {numero} ({clase})", salto=True)
+            pdf.fuente(10)
+            pdf.celda(0, 6, f"{titular} - Período {periodo} - Página {pagina['numero']}", salto=True)
+            pdf.salto(2)
+            pdf.celda(0, 6, f"Saldo anterior: {pagina['saldo_anterior']:,.2f}", salto=True)
+            pdf.fuente(10, negrita=True)
+            pdf.fila(_COLUMNAS_EXTRACTO, 6, ("Fecha", "Tipo", "Monto", "Saldo"), "CCCC")
+            pdf.fuente(9)
+            for fecha_ns, tipo, monto, saldo in pagina["filas"]:
+                pdf.fila(_COLUMNAS_EXTRACTO, 5, (ns_a_fecha(fecha_ns).strftime("%Y-%m-%d %H:%M:%S"), tipo,
+                                                 f"{monto:,.2f}", f"{saldo:,.2f}"), "LCRR")
+            pdf.salto(2)
+            pdf.fuente(10)
+            pdf.celda(0, 6, f"Créditos de la página: {pagina['creditos']:,.2f}   "
+                            f"Débitos de la página: {pagina['debitos']:,.2f}", salto=True)
+            pdf.celda(0, 6, f"Saldo a transportar: {pagina['saldo_final']:,.2f}", salto=True)
+
+    def generar_desde_datos(self, datos: dict, ruta: Optional[str] = None):
+        """Escribe el PDF en `ruta` y la devuelve; sin ruta devuelve los bytes"""
+        if "periodo" in datos:
+            # extracto del período: las páginas de cada cuenta, una detrás de otra
+            if ruta is None:
+                salida = io.BytesIO()
+                self._escribir_periodo(datos, salida)
+                return salida.getvalue()
+            with open(ruta, "wb") as archivo:
+                self._escribir_periodo(datos, archivo)
+            return ruta
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, f"Reporte Cliente: {cliente.nombre} {cliente.apellido}", ln=True)
+        pdf.cell(0, 10, f"Reporte Cliente: {datos['nombre']} {datos['apellido']}", ln=True)
         pdf.set_font("Arial", size=12)
-        pdf.cell(0, 8, f"DNI: {cliente.dni}", ln=True)
+        pdf.cell(0, 8, f"DNI: {datos['dni']}", ln=True)
         pdf.ln(6)
-        for cuenta in cuentas:
+        for numero, clase, saldo, movimientos in datos["cuentas"]:
             pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 8, f"Cuenta: {cuenta.numero_cuenta} ({cuenta.__class__.__name__})", ln=True)
+            pdf.cell(0, 8, f"Cuenta: {numero} ({clase})", ln=True)
             pdf.set_font("Arial", size=11)
-            pdf.cell(0, 8, f"Saldo: {cuenta.saldo:.2f}", ln=True)
+            pdf.cell(0, 8, f"Saldo: {saldo:.2f}", ln=True)
             pdf.cell(0, 6, "Transacciones (Últimas 10):", ln=True)
-            for tx in cuenta.obtener_transacciones()[-10:]:
-                pdf.cell(0, 6, f" - {tx.fecha.strftime('%Y-%m-%d %H:%M:%S')} {tx.tipo} {tx.monto:.2f}", ln=True)
+            for fecha_ns, tipo, monto in movimientos:
+                pdf.cell(0, 6, f" - {ns_a_fecha(fecha_ns).strftime('%Y-%m-%d %H:%M:%S')} {tipo} {monto:.2f}", ln=True)
             pdf.ln(4)
         pdf.cell(0, 6, f"Generado: {datetime.now().isoformat()}")
-        import os
-        directory = 'reportes'
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        pdf.output(os.path.join(directory, self.filename))
-        return self.filename
\ No newline at end of file
+        if ruta is None:
+            return bytes(pdf.output())
+        pdf.output(ruta)
+        return ruta
+
+    def _escribir_periodo(self, datos: dict, archivo: BinaryIO):
+        pdf = EscritorPDF(archivo)
+        desde, hasta = (ns_a_fecha(ns).strftime("%d/%m/%Y") for ns in datos["periodo"])
+        titular = f"{datos['nombre']} {datos['apellido']} - DNI {datos['dni']}"
+        for numero, clase, _, paginas in datos["cuentas"]:
+            self._dibujar_extracto(pdf, numero, clase, titular, f"{desde} al {hasta}", paginas)
+        if not datos["cuentas"]:
+            pdf.nueva_pagina()
+            pdf.fuente(12)
+            pdf.celda(0, 8, f"{titular} - Período {desde} al {hasta}: sin cuentas", salto=True)
+        pdf.cerrar()
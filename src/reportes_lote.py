@@ -0,0 +1,174 @@
+"""Generación masiva de reportes PDF de todos los clientes en un pool de procesos.
+
+Cada reporte es el extracto mensual del cliente: los movimientos de todas sus
+cuentas en el período, paginados como reporte_pdf.paginas_de_cuenta. Los
+clientes se recorren de a lotes. Con un banco en SQLite cada lote viaja a un
+proceso como lista de DNIs: el proceso abre el archivo en solo lectura y escribe
+cada PDF a medida que lee sus páginas (reporte_pdf.datos_guardados). Con el banco
+en memoria el lote viaja como datos planos (reporte_pdf.datos_cliente). Hay como
+mucho dos lotes por proceso en vuelo, así que la memoria no depende de la
+cantidad de clientes. Los archivos quedan en reportes/<DNI[-2:]>/<DNI[-4:-2]>/.
+
+Uso: python src/reportes_lote.py --db banco.db [--periodo 2024-05] [--procesos 4]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Callable, List, Optional, Tuple
+# Importación de modelos
+import reporte_pdf
+from almacenamiento import Banco
+from almacenamiento_sqlite import LectorSQLite, MotorSQLite
+from reporte_pdf import PDFGenerator, datos_cliente, datos_guardados, ruta_reporte
+from transaccion import fecha_a_ns
+
+
+def rango_periodo(periodo: str) -> Tuple[datetime, datetime]:
+    """'AAAA-MM' -> (primer instante del mes, último instante del mes)"""
+    try:
+        desde = datetime.strptime(periodo, "%Y-%m")
+    except ValueError:
+        raise ValueError("El período debe tener el formato AAAA-MM")
+    siguiente = (desde + timedelta(days=32)).replace(day=1)
+    return desde, siguiente - timedelta(microseconds=1)
+
+
+def _ruta(directorio: str, dni: str, periodo: str, creados: set) -> str:
+    ruta = ruta_reporte(directorio, dni, f"cliente_{dni}_{periodo}.pdf")
+    carpeta = os.path.dirname(ruta)
+    if carpeta not in creados:
+        os.makedirs(carpeta, exist_ok=True)
+        creados.add(carpeta)
+    return ruta
+
+
+def generar_lote(lote: List[dict], directorio: str, periodo: str) -> int:
+    """Trabajo de un proceso del pool: un PDF por cliente del lote"""
+    generador = PDFGenerator()
+    creados = set()
+    for datos in lote:
+        generador.generar_desde_datos(datos, _ruta(directorio, datos["dni"], periodo, creados))
+    return len(lote)
+
+
+def generar_lote_guardado(ruta: str, dnis: List[str], directorio: str, periodo: str) -> int:
+    """Como generar_lote, leyendo cada cliente del archivo SQLite mientras se escribe su PDF"""
+    desde, hasta = rango_periodo(periodo)
+    rango = (fecha_a_ns(desde), fecha_a_ns(hasta))
+    generador = PDFGenerator()
+    creados = set()
+    lector = LectorSQLite(ruta)
+    try:
+        for dni in dnis:
+            # una foto por cliente: saldos y movimientos de sus cuentas coinciden
+            with lector.foto():
+                datos = datos_guardados(lector, dni, rango)
+                if datos is not None:
+                    generador.generar_desde_datos(datos, _ruta(directorio, dni, periodo, creados))
+    finally:
+        lector.cerrar()
+    return len(dnis)
+
+
+def generar_reportes(banco: Banco, directorio: str = "reportes", periodo: Optional[str] = None,
+                     procesos: Optional[int] = None, tam_lote: int = 100,
+                     tareas_por_proceso: Optional[int] = None,
+                     progreso: Optional[Callable[[int, int], None]] = None) -> dict:
+    """Genera el reporte de cada cliente y devuelve un resumen con PDFs por segundo.
+
+    procesos=0 genera en este mismo proceso. Con `tareas_por_proceso` cada proceso
+    se recicla después de esa cantidad de lotes (tope de memoria por proceso).
+    `progreso(hechos, total)` se llama cada vez que termina un lote.
+    """
+    if reporte_pdf.FPDF is None:
+        raise ImportError("FPDF no está instalado. Ejecutar: pip install fpdf2")
+    if tam_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser positivo")
+    inicio = time.perf_counter()
+    periodo = periodo or date.today().strftime("%Y-%m")
+    rango = rango_periodo(periodo)
+    total = banco.contar_clientes()
+    clientes = iter(banco.iterar_clientes())
+    archivo = banco.archivo
+    hechos = 0
+
+    def siguiente_lote() -> Optional[tuple]:
+        # (función, argumentos) del próximo lote; con archivo viajan solo los DNIs
+        lote = list(islice(clientes, tam_lote))
+        if not lote:
+            return None
+        if archivo is not None:
+            return generar_lote_guardado, (archivo, [c.dni for c in lote], directorio, periodo)
+        datos = [datos_cliente(c, banco.listar_cuentas_por_cliente(c.dni), rango) for c in lote]
+        return generar_lote, (datos, directorio, periodo)
+
+    def avanzar(cantidad: int):
+        nonlocal hechos
+        hechos += cantidad
+        if progreso is not None:
+            progreso(hechos, total)
+
+    if procesos == 0:
+        while True:
+            tarea = siguiente_lote()
+            if tarea is None:
+                break
+            funcion, argumentos = tarea
+            avanzar(funcion(*argumentos))
+    else:
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos, max_tasks_per_child=tareas_por_proceso) as pool:
+            en_vuelo = set()
+            agotado = False
+            while not agotado or en_vuelo:
+                while not agotado and len(en_vuelo) < 2 * procesos:
+                    tarea = siguiente_lote()
+                    if tarea is not None:
+                        funcion, argumentos = tarea
+                        en_vuelo.add(pool.submit(funcion, *argumentos))
+                    else:
+                        agotado = True
+                if en_vuelo:
+                    listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        avanzar(futuro.result())
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "pdfs": hechos,
+        "procesos": procesos,
+        "segundos": segundos,
+        "pdfs_por_segundo": hechos / segundos if segundos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="archivo SQLite del banco")
+    parser.add_argument("--periodo", help="período del reporte (AAAA-MM), por defecto el mes actual")
+    parser.add_argument("--salida", default="reportes", help="directorio raíz de los reportes")
+    parser.add_argument("--procesos", type=int, help="procesos del pool (0: sin pool); por defecto, uno por núcleo")
+    parser.add_argument("--lote", type=int, default=100, help="clientes por lote")
+    parser.add_argument("--reciclar", type=int, help="reiniciar cada proceso después de N lotes")
+    args = parser.parse_args()
+
+    def mostrar(hechos: int, total: int):
+        print(f"\r{hechos}/{total} PDFs", end="", flush=True)
+
+    motor = MotorSQLite(args.db)
+    try:
+        resumen = generar_reportes(Banco(motor), args.salida, args.periodo, args.procesos, args.lote,
+                                   args.reciclar, mostrar)
+    finally:
+        motor.cerrar()
+    print(f"\n{resumen['pdfs']} PDFs en {resumen['segundos']:.1f}s "
+          f"({resumen['pdfs_por_segundo']:,.1f} PDFs/s, {resumen['procesos']} procesos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""Servicio HTTP/JSON local sobre un Banco (solo biblioteca estándar, asyncio).
+
+Rutas:
+    GET  /clientes?desde=0&limite=100       listado paginado
+    POST /clientes                          {"nombre", "apellido", "dni"}
+    GET  /clientes/{dni}                    cliente y sus cuentas
+    POST /clientes/{dni}/cuentas            {"tipo": "ahorro"|"corriente", "tasa_interes"|"limite_descubierto"}
+    GET  /cuentas/{numero}
+    POST /cuentas/{numero}/depositos        {"monto"}
+    POST /cuentas/{numero}/retiros          {"monto"}
+    GET  /cuentas/{numero}/historial?desde=0&limite=100
+    POST /transferencias                    {"origen", "destino", "monto"}
+    POST /lotes                             {"operaciones": [[numero, "DEP"|"RET", monto], ...]}
+
+Las conexiones son keep-alive (HTTP/1.1). Cada pedido entra a una cola acotada
+que atienden unos pocos trabajadores ejecutando las operaciones del Banco en un
+pool de hilos; si la cola está llena la conexión deja de leer y, pasado
+`espera_cola`, se responde 503.
+
+Uso: python src/servicio.py [--host 127.0.0.1] [--puerto 8080] [--db banco.db]
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+# Importación de modelos
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cuenta import Cuenta, CuentaAhorro, CuentaCorriente
+
+MAX_CUERPO = 1 << 20
+MAX_LIMITE = 1000
+
+_MOTIVOS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+Respuesta = Tuple[int, object]
+
+
+class NoEncontrado(ValueError):
+    pass
+
+
+def _datos_cuenta(cuenta: Cuenta) -> dict:
+    datos = {
+        "numero_cuenta": cuenta.numero_cuenta,
+        "tipo": cuenta.__class__.__name__,
+        "saldo": cuenta.saldo,
+        "dni": cuenta.cliente.dni,
+    }
+    if isinstance(cuenta, CuentaAhorro):
+        datos["tasa_interes"] = cuenta.tasa_interes
+    elif isinstance(cuenta, CuentaCorriente):
+        datos["limite_descubierto"] = cuenta.limite_descubierto
+    return datos
+
+
+def _entero(consulta: dict, nombre: str, defecto: int, maximo: Optional[int] = None) -> int:
+    try:
+        valor = int(consulta.get(nombre, defecto))
+    except ValueError:
+        raise ValueError(f"{nombre} debe ser entero")
+    if valor < 0:
+        raise ValueError(f"{nombre} no puede ser negativo")
+    return min(valor, maximo) if maximo is not None else valor
+
+
+def _no_negativo(datos: dict, nombre: str, defecto: float) -> float:
+    valor = datos.get(nombre, defecto)
+    # float() acepta "inf" y "nan": un límite infinito sería descubierto ilimitado
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{nombre} debe ser numérico")
+    if not math.isfinite(valor) or valor < 0:
+        raise ValueError(f"{nombre} debe ser finito y no negativo")
+    return valor
+
+
+class ServicioBanco:
+    def __init__(self, banco: Banco, hilos: int = 4, tam_cola: int = 1024, espera_cola: float = 1.0,
+                 inactividad: float = 30.0):
+        self.banco = banco
+        self.hilos = hilos
+        self.espera_cola = espera_cola
+        # segundos sin pedidos antes de cerrar una conexión keep-alive
+        self.inactividad = inactividad
+        self._cola: Optional[asyncio.Queue] = None
+        self._tam_cola = tam_cola
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._trabajadores: List[asyncio.Task] = []
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self.atendidos = 0
+        self.rechazados = 0
+        self._rutas: List[Tuple[str, "re.Pattern", Callable[..., Respuesta]]] = [
+            ("GET", re.compile(r"/clientes"), self._listar_clientes),
+            ("POST", re.compile(r"/clientes"), self._crear_cliente),
+            ("GET", re.compile(r"/clientes/(\w+)"), self._obtener_cliente),
+            ("POST", re.compile(r"/clientes/(\w+)/cuentas"), self._crear_cuenta),
+            ("GET", re.compile(r"/cuentas/(\w+)"), self._obtener_cuenta),
+            ("POST", re.compile(r"/cuentas/(\w+)/depositos"), self._depositar),
+            ("POST", re.compile(r"/cuentas/(\w+)/retiros"), self._retirar),
+            ("GET", re.compile(r"/cuentas/(\w+)/historial"), self._historial),
+            ("POST", re.compile(r"/transferencias"), self._transferir),
+            ("POST", re.compile(r"/lotes"), self._procesar_lote),
+        ]
+
+    # Ciclo de vida
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8080) -> int:
+        """Empieza a escuchar; devuelve el puerto (útil con puerto=0)"""
+        self._cola = asyncio.Queue(maxsize=self._tam_cola)
+        self._pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="servicio")
+        self._trabajadores = [asyncio.create_task(self._trabajar()) for _ in range(self.hilos)]
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        for tarea in self._trabajadores:
+            tarea.cancel()
+        await asyncio.gather(*self._trabajadores, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    async def _trabajar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            funcion, futuro = await self._cola.get()
+            try:
+                resultado = await loop.run_in_executor(self._pool, funcion)
+            except BaseException as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+            else:
+                if not futuro.done():
+                    futuro.set_result(resultado)
+            finally:
+                self._cola.task_done()
+
+    # HTTP
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    linea = await asyncio.wait_for(reader.readline(), self.inactividad)
+                except asyncio.TimeoutError:
+                    break
+                if not linea:
+                    break
+                try:
+                    metodo, destino, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "Línea de pedido inválida"}, False)
+                    break
+                encabezados = {}
+                while True:
+                    linea = await reader.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                conexion = encabezados.get("connection", "").lower()
+                mantener = conexion == "keep-alive" if version == "HTTP/1.0" else conexion != "close"
+                try:
+                    largo = int(encabezados.get("content-length", 0) or 0)
+                except ValueError:
+                    await self._responder(writer, 400, {"error": "Content-Length inválido"}, False)
+                    break
+                if largo > MAX_CUERPO:
+                    await self._responder(writer, 413, {"error": "Cuerpo demasiado grande"}, False)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b""
+                estado, datos = await self._despachar(metodo, destino, cuerpo)
+                await self._responder(writer, estado, datos, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _responder(writer: asyncio.StreamWriter, estado: int, datos, mantener: bool):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        cabecera = (f"HTTP/1.1 {estado} {_MOTIVOS.get(estado, '')}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(cuerpo)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n")
+        if estado == 503:
+            cabecera += "Retry-After: 1\r\n"
+        writer.write(cabecera.encode("latin-1") + b"\r\n" + cuerpo)
+        await writer.drain()
+
+    async def _despachar(self, metodo: str, destino: str, cuerpo: bytes) -> Respuesta:
+        url = urlsplit(destino)
+        ruta = url.path.rstrip("/") or "/"
+        manejador, argumentos, metodos = None, (), set()
+        for metodo_ruta, patron, funcion in self._rutas:
+            coincidencia = patron.fullmatch(ruta)
+            if coincidencia:
+                metodos.add(metodo_ruta)
+                if metodo_ruta == metodo:
+                    manejador, argumentos = funcion, coincidencia.groups()
+        if manejador is None:
+            return (405, {"error": "Método no permitido"}) if metodos else (404, {"error": "Ruta inexistente"})
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+        except ValueError:
+            return 400, {"error": "JSON inválido"}
+        if not isinstance(datos, dict):
+            return 400, {"error": "El cuerpo debe ser un objeto JSON"}
+        consulta = dict(parse_qsl(url.query))
+
+        def ejecutar() -> Respuesta:
+            try:
+                return manejador(*argumentos, consulta=consulta, datos=datos)
+            except NoEncontrado as e:
+                return 404, {"error": str(e)}
+            except (ValueError, TypeError, KeyError) as e:
+                return 400, {"error": str(e)}
+
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            # cola llena: este pedido (y su conexión) esperan; pasado el plazo, 503
+            await asyncio.wait_for(self._cola.put((ejecutar, futuro)), self.espera_cola)
+        except asyncio.TimeoutError:
+            self.rechazados += 1
+            return 503, {"error": "Servicio saturado, reintente"}
+        try:
+            respuesta = await futuro
+        except Exception as e:
+            return 500, {"error": str(e)}
+        self.atendidos += 1
+        return respuesta
+
+    # Operaciones (se ejecutan en el pool de hilos)
+    def _cuenta(self, numero: str) -> Cuenta:
+        cuenta = self.banco.buscar_cuenta_por_num(numero)
+        if cuenta is None:
+            raise NoEncontrado("Cuenta no encontrada")
+        return cuenta
+
+    def _monto(self, datos: dict) -> float:
+        monto = datos.get("monto")
+        if isinstance(monto, bool) or not isinstance(monto, (int, float)):
+            raise ValueError("monto debe ser numérico")
+        # json acepta NaN e Infinity: un saldo nan haría inválidas todas las respuestas
+        if not math.isfinite(monto):
+            raise ValueError("monto debe ser finito")
+        return monto
+
+    def _listar_clientes(self, consulta: dict, datos: dict) -> Respuesta:
+        desde = _entero(consulta, "desde", 0)
+        limite = _entero(consulta, "limite", 100, MAX_LIMITE)
+        # página directa del motor: no se recorren los clientes anteriores a `desde`
+        clientes = [c.mostrar_datos() for c in self.banco.listar_clientes_pagina(desde, limite)] if limite else []
+        return 200, {"total": self.banco.contar_clientes(), "desde": desde, "clientes": clientes}
+
+    def _crear_cliente(self, consulta: dict, datos: dict) -> Respuesta:
+        cliente = self.banco.crear_cliente(datos.get("nombre"), datos.get("apellido"), datos.get("dni"))
+        return 201, cliente.mostrar_datos()
+
+    def _obtener_cliente(self, dni: str, consulta: dict, datos: dict) -> Respuesta:
+        cliente = self.banco.buscar_cliente_por_dni(dni)
+        if cliente is None:
+            raise NoEncontrado("Cliente no encontrado")
+        cuentas = [_datos_cuenta(c) for c in self.banco.listar_cuentas_por_cliente(dni)]
+        return 200, {**cliente.mostrar_datos(), "cuentas": cuentas}
+
+    def _crear_cuenta(self, dni: str, consulta: dict, datos: dict) -> Respuesta:
+        if self.banco.buscar_cliente_por_dni(dni) is None:
+            raise NoEncontrado("Cliente no encontrado")
+        tipo = datos.get("tipo")
+        if tipo == "ahorro":
+            cuenta = self.banco.crear_cuenta_ahorro(dni, _no_negativo(datos, "tasa_interes", 0.01))
+        elif tipo == "corriente":
+            cuenta = self.banco.crear_cuenta_corriente(dni, _no_negativo(datos, "limite_descubierto", 0.0))
+        else:
+            raise ValueError("tipo debe ser 'ahorro' o 'corriente'")
+        return 201, _datos_cuenta(cuenta)
+
+    def _obtener_cuenta(self, numero: str, consulta: dict, datos: dict) -> Respuesta:
+        return 200, _datos_cuenta(self._cuenta(numero))
+
+    def _depositar(self, numero: str, consulta: dict, datos: dict) -> Respuesta:
+        cuenta = self._cuenta(numero)
+        tx = cuenta.ingresar(self._monto(datos))
+        return 201, {"transaccion": tx.to_dict(), "saldo": cuenta.saldo}
+
+    def _retirar(self, numero: str, consulta: dict, datos: dict) -> Respuesta:
+        cuenta = self._cuenta(numero)
+        tx = cuenta.retirar(self._monto(datos))
+        return 201, {"transaccion": tx.to_dict(), "saldo": cuenta.saldo}
+
+    def _historial(self, numero: str, consulta: dict, datos: dict) -> Respuesta:
+        cuenta = self._cuenta(numero)
+        desde = _entero(consulta, "desde", 0)
+        limite = _entero(consulta, "limite", 100, MAX_LIMITE)
+        with cuenta._candado:
+            total = len(cuenta.libro)
+            transacciones = [tx.to_dict() for tx in cuenta.libro.transacciones(desde, desde + limite)]
+        return 200, {"total": total, "desde": desde, "transacciones": transacciones}
+
+    def _transferir(self, consulta: dict, datos: dict) -> Respuesta:
+        retiro, deposito = self.banco.transferir(datos.get("origen"), datos.get("destino"), self._monto(datos))
+        return 201, {"retiro": retiro.to_dict(), "deposito": deposito.to_dict()}
+
+    def _procesar_lote(self, consulta: dict, datos: dict) -> Respuesta:
+        operaciones = datos.get("operaciones")
+        if not isinstance(operaciones, list) or not all(isinstance(o, list) and len(o) == 3 for o in operaciones):
+            raise ValueError("operaciones debe ser una lista de [numero, tipo, monto]")
+        resultados = self.banco.procesar_lote([tuple(o) for o in operaciones])
+        return 200, {"resultados": resultados, "aplicadas": sum(r is None for r in resultados)}
+
+
+async def servir(banco: Banco, host: str, puerto: int, hilos: int, tam_cola: int):
+    servicio = ServicioBanco(banco, hilos=hilos, tam_cola=tam_cola)
+    puerto = await servicio.iniciar(host, puerto)
+    print(f"Servicio escuchando en http://{host}:{puerto}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servicio.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--hilos", type=int, default=4)
+    parser.add_argument("--cola", type=int, default=1024, help="pedidos pendientes como máximo")
+    parser.add_argument("--db", help="archivo SQLite (por defecto, banco en memoria)")
+    args = parser.parse_args()
+
+    banco = Banco(MotorSQLite(args.db)) if args.db else Banco()
+    try:
+        asyncio.run(servir(banco, args.host, args.puerto, args.hilos, args.cola))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,78 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import datetime
+import math
+import time
 import uuid
 
+
+# Conversión exacta (aritmética entera) entre datetime local y nanosegundos desde epoch
+def fecha_a_ns(fecha: datetime) -> int:
+    return int(fecha.replace(microsecond=0).timestamp()) * 1_000_000_000 + fecha.microsecond * 1000
+
+
+def ns_a_fecha(ns: int) -> datetime:
+    return datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=(ns // 1000) % 1_000_000)
+
+
 class Transaccion:
-    def __init__(self, tipo: str, monto: float, fecha: Optional[datetime] = None):
+    # sin __dict__: la fecha se guarda como entero (ns) y el id se genera recién cuando se pide
+    __slots__ = ("__tipo", "__monto", "__ns", "__id", "__libro", "__pos", "__referencia")
+
+    def __init__(self, tipo: str, monto: float, fecha: Optional[datetime] = None,
+                 id_transaccion: Optional[str] = None, fecha_ns: Optional[int] = None,
+                 referencia: Optional[str] = None):
         if tipo not in ("DEP", "RET"):
             raise ValueError("Tipo de transacción debe ser 'DEP' o 'RET'")
-        if monto <= 0:
+        # NaN e infinito no son montos: NaN pasaría cualquier comparación con <= 0
+        if not (math.isfinite(monto) and monto > 0):
             raise ValueError("El monto debe ser mayor que 0")
         self.__tipo = tipo
         self.__monto = float(monto)
-        self.__fecha = fecha or datetime.now()
-        self.__id = str(uuid.uuid4())
+        if fecha_ns is not None:
+            self.__ns = fecha_ns
+        else:
+            self.__ns = fecha_a_ns(fecha) if fecha else time.time_ns()
+        self.__id = id_transaccion
+        # id de la transacción vinculada (la otra pata de una transferencia)
+        self.__referencia = referencia
+        # libro mayor y posición donde quedó registrada (para compartir el id generado)
+        self.__libro = None
+        self.__pos = 0
+
+    @classmethod
+    def _vista(cls, libro, pos: int, tipo: str, monto: float, fecha_ns: int,
+               referencia: Optional[str] = None) -> Transaccion:
+        # construcción rápida desde el libro mayor, sin volver a validar
+        tx = cls.__new__(cls)
+        tx.__tipo = tipo
+        tx.__monto = monto
+        tx.__ns = fecha_ns
+        tx.__id = None
+        tx.__referencia = referencia
+        tx.__libro = libro
+        tx.__pos = pos
+        return tx
+
+    def _vincular(self, libro, pos: int):
+        # si el id ya existe lo guarda el libro; si no, se generará una sola vez para ambos
+        if self.__id is not None:
+            libro._guardar_id(pos, self.__id)
+        self.__libro = libro
+        self.__pos = pos
+
+    @property
+    def id(self) -> str:
+        if self.__id is None:
+            if self.__libro is not None:
+                self.__id = self.__libro.id_en(self.__pos)
+            else:
+                self.__id = str(uuid.uuid4())
+        return self.__id
+
+    @property
+    def referencia(self) -> Optional[str]:
+        return self.__referencia
 
     @property
     def tipo(self) -> str:
@@ -24,10 +84,17 @@ class Transaccion:
 
     @property
     def fecha(self) -> datetime:
-        return self.__fecha
+        return ns_a_fecha(self.__ns)
+
+    @property
+    def fecha_ns(self) -> int:
+        return self.__ns
 
     def to_dict(self) -> dict:
-        return {"id": self.__id, "tipo": self.tipo, "monto": self.monto, "fecha": self.fecha.isoformat()}
+        datos = {"id": self.id, "tipo": self.tipo, "monto": self.monto, "fecha": self.fecha.isoformat()}
+        if self.__referencia is not None:
+            datos["referencia"] = self.__referencia
+        return datos
 
     def __repr__(self):
-        return f"Transaccion({self.tipo}, {self.monto}, {self.fecha.isoformat()})"
\ No newline at end of file
+        return f"Transaccion({self.tipo}, {self.monto}, {self.fecha.isoformat()})"
@@ -1,7 +1,8 @@
 import flet as ft
-import datetime
 from almacenamiento import Banco
-from reporte_pdf import PDFGenerator
+from components.filas import FilasPorClave
+from descargas import descargas
+from reporte_pdf import PDFGenerator, cache_reportes
 
 
 class ClienteDetailView:
@@ -28,10 +29,16 @@ class ClienteDetailView:
                 self.cuenta_corriente = cuenta
 
         self.mensaje = ft.Text(value="", color=ft.Colors.RED_700)
+        self.guardar_pdf = ft.Checkbox(label="Guardar copia en reportes/", value=False)
+        # en escritorio el PDF se guarda donde elija el usuario
+        self.selector_archivo = ft.FilePicker(on_result=self.guardar_descarga)
+        self._pdf_pendiente = None
 
         # contenedores que se actualizarán sin recargar
         self.card_ahorro_container = ft.Container()
         self.card_corriente_container = ft.Container()
+        # filas de transacciones por número de cuenta, con el id de la transacción como clave
+        self.filas_transacciones = {}
 
     def volver_listado(self, e):
         self.on_navigate("listado")
@@ -89,11 +96,12 @@ class ClienteDetailView:
 
     # ---- TABLA ----
     def actualizar_tabla_transacciones(self, tabla: ft.DataTable, cuenta):
-        tabla.rows.clear()
-        transacciones = cuenta.obtener_transacciones()
+        """Solo construye las filas de transacciones nuevas; las ya mostradas se reutilizan"""
+        # solo las filas que se muestran, sin copiar todo el historial
+        transacciones = cuenta.ultimas_transacciones(10)
 
         if not transacciones:
-            tabla.rows.append(
+            tabla.rows[:] = [
                 ft.DataRow(
                     cells=[
                         ft.DataCell(
@@ -108,49 +116,61 @@ class ClienteDetailView:
                         ft.DataCell(ft.Container()),  # celda vacía
                     ]
                 )
-            )
-        else:
-            for tx in transacciones[-10:]:
-                color = ft.Colors.GREEN_700 if tx.tipo == "DEP" else ft.Colors.RED_700
-                tabla.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(tx.fecha.strftime("%d/%m/%Y %H:%M"), size=12),
-                                    padding=ft.padding.symmetric(vertical=4, horizontal=8),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(tx.tipo, color=color, weight=ft.FontWeight.BOLD, size=12),
-                                    padding=ft.padding.symmetric(vertical=4, horizontal=8),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(f"${tx.monto:.2f}", color=color, size=12),
-                                    padding=ft.padding.symmetric(vertical=4, horizontal=8),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                        ]
+            ]
+            return
+        filas = self.filas_transacciones.get(cuenta.numero_cuenta)
+        if filas is None:
+            filas = self.filas_transacciones[cuenta.numero_cuenta] = FilasPorClave(
+                clave=lambda tx: tx.id, construir=self.fila_transaccion)
+        filas.sincronizar(tabla.rows, transacciones)
+
+    def fila_transaccion(self, tx) -> ft.DataRow:
+        color = ft.Colors.GREEN_700 if tx.tipo == "DEP" else ft.Colors.RED_700
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(tx.fecha.strftime("%d/%m/%Y %H:%M"), size=12),
+                        padding=ft.padding.symmetric(vertical=4, horizontal=8),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
                     )
-                )
+                ),
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(tx.tipo, color=color, weight=ft.FontWeight.BOLD, size=12),
+                        padding=ft.padding.symmetric(vertical=4, horizontal=8),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
+                    )
+                ),
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(f"${tx.monto:.2f}", color=color, size=12),
+                        padding=ft.padding.symmetric(vertical=4, horizontal=8),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
+                    )
+                ),
+            ]
+        )
 
     # ---- PDF ----
     def generar_pdf(self, e):
         try:
-            pdf_gen = PDFGenerator(f"cliente_{self.dni_cliente}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.pdf")
+            nombre = f"cliente_{self.dni_cliente}.pdf"
+            # si ninguna cuenta cambió desde el último reporte, sale de la caché
+            pdf_gen = PDFGenerator(nombre, cache=cache_reportes)
             cuentas_actualizadas = self.banco.listar_cuentas_por_cliente(self.dni_cliente)
-            archivo = pdf_gen.generar_pdf_cliente(self.cliente, cuentas_actualizadas)
-            # archivo = pdf_gen.generar_pdf_cliente(self.cliente, self.cuentas)
-            self.mensaje.value = f"✅ PDF generado: {archivo}"
+            if self.guardar_pdf.value:
+                archivo = pdf_gen.generar_pdf_cliente(self.cliente, cuentas_actualizadas)
+                self.mensaje.value = f"✅ PDF generado: {archivo}"
+            else:
+                # se arma en memoria y se entrega al navegador, sin archivo temporal
+                contenido = pdf_gen.generar_pdf_bytes(self.cliente, cuentas_actualizadas)
+                self.descargar(contenido, nombre)
+                tasa = cache_reportes.estadisticas()["tasa_aciertos"]
+                self.mensaje.value = f"✅ PDF listo para descargar: {nombre} (caché de reportes: {tasa:.0%} aciertos)"
             self.mensaje.color = ft.Colors.GREEN_700
             self.page.update()
         except Exception as ex:
@@ -158,6 +178,28 @@ class ClienteDetailView:
             self.mensaje.color = ft.Colors.RED_700
             self.page.update()
 
+    def descargar(self, contenido: bytes, nombre: str):
+        if self.page.web:
+            # el navegador no abre URLs data: de nivel superior: se sirve desde assets/
+            self.page.launch_url(descargas.publicar(contenido, nombre), web_window_name="_blank")
+        else:
+            self._pdf_pendiente = contenido
+            self.selector_archivo.save_file(file_name=nombre, allowed_extensions=["pdf"])
+
+    def guardar_descarga(self, e: ft.FilePickerResultEvent):
+        contenido, self._pdf_pendiente = self._pdf_pendiente, None
+        if contenido is None:
+            return
+        try:
+            ruta = descargas.guardar(contenido, e.path)
+            if ruta:
+                self.mensaje.value = f"✅ PDF guardado: {ruta}"
+                self.mensaje.color = ft.Colors.GREEN_700
+        except OSError as ex:
+            self.mensaje.value = f"❌ No se pudo guardar el PDF: {ex}"
+            self.mensaje.color = ft.Colors.RED_700
+        self.page.update()
+
     # ---- RENDERIZADO DE CARD ----
     def render_cuenta_card(self, titulo: str, cuenta, tipo: str):
         if cuenta is None:
@@ -255,9 +297,17 @@ class ClienteDetailView:
         self.card_ahorro_container.content = self.render_cuenta_card("Caja de Ahorro", self.cuenta_ahorro, "ahorro")
         self.card_corriente_container.content = self.render_cuenta_card("Cuenta Corriente", self.cuenta_corriente, "corriente")
 
+    def cerrar(self):
+        """Saca el FilePicker de la página cuando la vista ya no se va a mostrar"""
+        if self.selector_archivo in self.page.overlay:
+            self.page.overlay.remove(self.selector_archivo)
+
     # ---- RENDER PRINCIPAL ----
     def render(self):
         self.actualizar_cards()
+        # los FilePicker viven en el overlay de la página: uno por vista, hasta cerrar()
+        if self.selector_archivo not in self.page.overlay:
+            self.page.overlay.append(self.selector_archivo)
         return ft.Column(
             controls=[
                 ft.Row([
@@ -275,6 +325,7 @@ class ClienteDetailView:
                                 ft.Text(f"DNI: {self.cliente.dni}", size=14),
                             ]),
                             ft.Container(expand=True),
+                            self.guardar_pdf,
                             ft.ElevatedButton("Generar PDF", icon=ft.Icons.PICTURE_AS_PDF, on_click=self.generar_pdf),
                         ]),
                         padding=15,
@@ -1,5 +1,11 @@
+import asyncio
 import flet as ft
 from almacenamiento import Banco
+from components.filas import FilasPorClave
+
+TAMANOS_PAGINA = (10, 25, 50, 100)
+TAM_PAGINA_INICIAL = 25
+ESPERA_BUSQUEDA = 0.25  # segundos sin teclear antes de buscar
 
 class ClienteListView:
     """Vista del listado de clientes en tabla"""
@@ -32,6 +38,37 @@ class ClienteListView:
             vertical_lines=ft.border.BorderSide(1, ft.Colors.GREY_300),
             horizontal_lines=ft.border.BorderSide(1, ft.Colors.GREY_300),
         )
+        # filas por DNI: al cambiar de página, buscar o dar de alta solo se construyen las que faltan
+        self.filas_clientes = FilasPorClave(clave=lambda c: c.dni, construir=self.fila_cliente)
+        self.fila_sin_clientes = self.fila_vacia("No hay clientes registrados")
+
+        # Paginación del lado del servidor: solo se construye la página visible
+        self.pagina = 0
+        self.tam_pagina = TAM_PAGINA_INICIAL
+        self.texto_paginacion = ft.Text("", size=12, color=ft.Colors.GREY_700)
+        self.boton_anterior = ft.IconButton(icon=ft.Icons.CHEVRON_LEFT, tooltip="Página anterior",
+                                            on_click=lambda e: self.cambiar_pagina(e, -1))
+        self.boton_siguiente = ft.IconButton(icon=ft.Icons.CHEVRON_RIGHT, tooltip="Página siguiente",
+                                             on_click=lambda e: self.cambiar_pagina(e, 1))
+        self.selector_tam_pagina = ft.Dropdown(
+            label="Filas",
+            width=90,
+            value=str(self.tam_pagina),
+            options=[ft.dropdown.Option(str(n)) for n in TAMANOS_PAGINA],
+            on_change=self.cambiar_tam_pagina,
+        )
+
+        # Búsqueda por prefijo de nombre, apellido o DNI (índice en Banco.buscar_clientes)
+        self.termino_busqueda = ""
+        self._busqueda_pendiente = None  # Future de page.run_task
+        self.busqueda_input = ft.TextField(
+            label="Buscar por nombre, apellido o DNI",
+            width=320,
+            height=35,
+            content_padding=ft.padding.all(5),
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=self.programar_busqueda,
+        )
     
     def crear_cliente(self, e):
         """Crea un nuevo cliente"""
@@ -63,79 +100,135 @@ class ClienteListView:
         self.on_navigate("detalle", dni)
     
     def actualizar_tabla(self):
-        """Actualiza la tabla con los clientes"""
-        self.tabla_clientes.rows.clear()
-        clientes = self.banco.listar_clientes()
-
-        if not clientes:
-            self.tabla_clientes.rows.append(
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(
-                            ft.Container(
-                                ft.Text(
-                                    "No hay clientes registrados",
-                                    italic=True,
-                                    color=ft.Colors.GREY_600,
-                                    size=12,
-                                ),
-                                padding=ft.padding.symmetric(vertical=6, horizontal=10),
-                                alignment=ft.alignment.center_left,
-                                expand=True,
-                            )
-                        )
-                    ]
-                )
-            )
+        """Actualiza la tabla con la página actual de clientes (solo esas filas viajan al navegador)"""
+        if self.termino_busqueda:
+            self.mostrar_busqueda()
+            return
+        total = self.banco.contar_clientes()
+        ultima = max(0, (total - 1) // self.tam_pagina)
+        self.pagina = min(self.pagina, ultima)
+        desde = self.pagina * self.tam_pagina
+        clientes = self.banco.listar_clientes_pagina(desde, self.tam_pagina) if total else []
+
+        if clientes:
+            self.filas_clientes.sincronizar(self.tabla_clientes.rows, clientes)
         else:
-            for cliente in clientes:
-                self.tabla_clientes.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(cliente.dni, size=12),
-                                    padding=ft.padding.symmetric(vertical=6, horizontal=10),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(cliente.nombre, size=12),
-                                    padding=ft.padding.symmetric(vertical=6, horizontal=10),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.Text(cliente.apellido, size=12),
-                                    padding=ft.padding.symmetric(vertical=6, horizontal=10),
-                                    alignment=ft.alignment.center_left,
-                                    expand=True,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.Container(
-                                    ft.IconButton(
-                                        icon=ft.Icons.VISIBILITY,
-                                        tooltip="Ver detalle",
-                                        icon_size=18,
-                                        on_click=lambda e, d=cliente.dni: self.ver_detalle_cliente(d),
-                                    ),
-                                    padding=ft.padding.symmetric(vertical=2, horizontal=2),
-                                    alignment=ft.alignment.center,
-                                    expand=True,
-                                )
-                            ),
-                        ]
+            self.tabla_clientes.rows[:] = [self.fila_sin_clientes]
+
+        if total:
+            self.texto_paginacion.value = (f"{desde + 1:,}–{desde + len(clientes):,} de {total:,} clientes "
+                                           f"(página {self.pagina + 1:,} de {ultima + 1:,})")
+        else:
+            self.texto_paginacion.value = "0 clientes"
+        self.boton_anterior.disabled = self.pagina == 0
+        self.boton_siguiente.disabled = self.pagina >= ultima
+
+        # Forzar actualización visual
+        self.page.update()
+
+    def fila_vacia(self, texto: str) -> ft.DataRow:
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(
+                            texto,
+                            italic=True,
+                            color=ft.Colors.GREY_600,
+                            size=12,
+                        ),
+                        padding=ft.padding.symmetric(vertical=6, horizontal=10),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
                     )
                 )
-        
-        # Forzar actualización visual
+            ]
+        )
+
+    def fila_cliente(self, cliente) -> ft.DataRow:
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(cliente.dni, size=12),
+                        padding=ft.padding.symmetric(vertical=6, horizontal=10),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
+                    )
+                ),
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(cliente.nombre, size=12),
+                        padding=ft.padding.symmetric(vertical=6, horizontal=10),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
+                    )
+                ),
+                ft.DataCell(
+                    ft.Container(
+                        ft.Text(cliente.apellido, size=12),
+                        padding=ft.padding.symmetric(vertical=6, horizontal=10),
+                        alignment=ft.alignment.center_left,
+                        expand=True,
+                    )
+                ),
+                ft.DataCell(
+                    ft.Container(
+                        ft.IconButton(
+                            icon=ft.Icons.VISIBILITY,
+                            tooltip="Ver detalle",
+                            icon_size=18,
+                            on_click=lambda e, d=cliente.dni: self.ver_detalle_cliente(d),
+                        ),
+                        padding=ft.padding.symmetric(vertical=2, horizontal=2),
+                        alignment=ft.alignment.center,
+                        expand=True,
+                    )
+                ),
+            ]
+        )
+
+    # ---- BÚSQUEDA ----
+    def programar_busqueda(self, e):
+        # debounce en el loop de la página: cada tecla cancela la búsqueda pendiente
+        # y la tabla se actualiza desde el loop, no desde otro hilo
+        if self._busqueda_pendiente is not None:
+            self._busqueda_pendiente.cancel()
+        self._busqueda_pendiente = self.page.run_task(self._buscar_tras_espera, e.control.value)
+
+    async def _buscar_tras_espera(self, texto: str):
+        await asyncio.sleep(ESPERA_BUSQUEDA)
+        self.buscar(texto)
+
+    def buscar(self, texto: str):
+        self.termino_busqueda = (texto or "").strip()
+        self.pagina = 0
+        self.actualizar_tabla()
+
+    def mostrar_busqueda(self):
+        clientes = self.banco.buscar_clientes(self.termino_busqueda, self.tam_pagina)
+        self.filas_clientes.sincronizar(self.tabla_clientes.rows, clientes)
+        if len(clientes) == self.tam_pagina:
+            self.texto_paginacion.value = f"Primeras {len(clientes)} coincidencias"
+        elif clientes:
+            self.texto_paginacion.value = f"{len(clientes)} coincidencias"
+        else:
+            self.texto_paginacion.value = f"Sin coincidencias para «{self.termino_busqueda}»"
+        self.boton_anterior.disabled = self.boton_siguiente.disabled = True
         self.page.update()
-    
+
+    # ---- PAGINACIÓN ----
+    def cambiar_pagina(self, e, paso: int):
+        self.pagina = max(0, self.pagina + paso)
+        self.actualizar_tabla()
+
+    def cambiar_tam_pagina(self, e):
+        # se mantiene visible el primer cliente de la página actual
+        primero = self.pagina * self.tam_pagina
+        self.tam_pagina = int(self.selector_tam_pagina.value)
+        self.pagina = primero // self.tam_pagina
+        self.actualizar_tabla()
+
     def render(self):
         """Renderiza la vista completa"""
         self.actualizar_tabla()
@@ -173,11 +266,22 @@ class ClienteListView:
                 ft.Card(
                     content=ft.Container(
                         content=ft.Column([
-                            ft.Text("Listado de Clientes", size=14, weight=ft.FontWeight.BOLD),
+                            ft.Row([
+                                ft.Text("Listado de Clientes", size=14, weight=ft.FontWeight.BOLD),
+                                ft.Container(expand=True),
+                                self.busqueda_input,
+                            ]),
                             ft.Container(
                                 content=self.tabla_clientes,
                                 padding=0,  # sin padding adicional para que los bordes sean precisos
                             ),
+                            ft.Row([
+                                self.boton_anterior,
+                                self.texto_paginacion,
+                                self.boton_siguiente,
+                                ft.Container(expand=True),
+                                self.selector_tam_pagina,
+                            ]),
                         ]),
                         padding=10,
                     ),
@@ -1,11 +1,14 @@
 import pytest
 import sys
+import threading
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from almacenamiento import Banco
 from cliente import Cliente
+from cuenta import Cuenta
 
 
 class TestBanco:
@@ -50,4 +53,259 @@ class TestBanco:
         banco.crear_cliente("Ana", "Torres", "66666666")
         banco.crear_cliente("Luis", "Ramírez", "77777777")
         clientes = banco.listar_clientes()
-        assert len(clientes) == 2
\ No newline at end of file
+        assert len(clientes) == 2
+
+class TestIndicesBanco:
+    """Tests de los índices hash de clientes y cuentas"""
+
+    @pytest.fixture
+    def banco(self):
+        return Banco()
+
+    def test_buscar_cliente_por_dni(self, banco):
+        cliente = banco.crear_cliente("Sofía", "Díaz", "10101010")
+        assert banco.buscar_cliente_por_dni("10101010") is cliente
+        assert banco.buscar_cliente_por_dni("20202020") is None
+
+    def test_dni_duplicado(self, banco):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        with pytest.raises(ValueError):
+            banco.crear_cliente("Otra", "Persona", "10101010")
+        # el DNI se normaliza antes de comparar
+        with pytest.raises(ValueError):
+            banco.crear_cliente("Otra", "Persona", " 10101010 ")
+        assert len(banco.listar_clientes()) == 1
+
+    def test_buscar_cuenta_por_num(self, banco):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        ca = banco.crear_cuenta_ahorro("10101010")
+        cc = banco.crear_cuenta_corriente("10101010", limite_descubierto=100)
+        assert banco.buscar_cuenta_por_num(ca.numero_cuenta) is ca
+        assert banco.buscar_cuenta_por_num(cc.numero_cuenta) is cc
+        assert banco.buscar_cuenta_por_num("noexiste") is None
+
+    def test_numero_cuenta_repetido_se_regenera(self, banco, monkeypatch):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        primera = banco.crear_cuenta_ahorro("10101010")
+        numeros = iter([primera.numero_cuenta, primera.numero_cuenta, "abcd1234"])
+        monkeypatch.setattr(Cuenta, "_generar_numero", lambda self: next(numeros))
+        segunda = banco.crear_cuenta_ahorro("10101010")
+        assert segunda.numero_cuenta == "abcd1234"
+        assert len(banco.listar_cuentas()) == 2
+
+    def test_listar_cuentas_por_cliente(self, banco):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        banco.crear_cliente("Mario", "Paz", "20202020")
+        ca = banco.crear_cuenta_ahorro("10101010")
+        cc = banco.crear_cuenta_corriente("10101010")
+        otra = banco.crear_cuenta_ahorro("20202020")
+        assert banco.listar_cuentas_por_cliente("10101010") == [ca, cc]
+        assert banco.listar_cuentas_por_cliente("20202020") == [otra]
+        assert banco.listar_cuentas_por_cliente("30303030") == []
+
+    def test_listar_clientes_pagina(self, banco):
+        dnis = [str(40_000_000 + i) for i in range(7)]
+        for dni in dnis:
+            banco.crear_cliente("Sofía", "Díaz", dni)
+        paginas = [[c.dni for c in banco.listar_clientes_pagina(desde, 3)] for desde in (0, 3, 6, 9)]
+        assert paginas == [dnis[0:3], dnis[3:6], dnis[6:], []]
+        with pytest.raises(ValueError):
+            banco.listar_clientes_pagina(-1, 3)
+        with pytest.raises(ValueError):
+            banco.listar_clientes_pagina(0, 0)
+
+    def test_cerrar_cuenta(self, banco):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        ca = banco.crear_cuenta_ahorro("10101010")
+        cc = banco.crear_cuenta_corriente("10101010")
+        banco.cerrar_cuenta(ca.numero_cuenta)
+        assert banco.buscar_cuenta_por_num(ca.numero_cuenta) is None
+        assert banco.listar_cuentas_por_cliente("10101010") == [cc]
+        assert banco.listar_cuentas() == [cc]
+
+    def test_cerrar_cuenta_con_saldo(self, banco):
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        ca = banco.crear_cuenta_ahorro("10101010")
+        ca.ingresar(10)
+        with pytest.raises(ValueError):
+            banco.cerrar_cuenta(ca.numero_cuenta)
+        assert banco.listar_cuentas_por_cliente("10101010") == [ca]
+
+
+class TestProcesarLote:
+    """Tests de operaciones masivas en Banco"""
+
+    def test_procesar_lote(self):
+        banco = Banco()
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        ca = banco.crear_cuenta_ahorro("10101010")
+        cc = banco.crear_cuenta_corriente("10101010", limite_descubierto=50)
+        resultados = banco.procesar_lote([
+            (ca.numero_cuenta, "DEP", 100),
+            (cc.numero_cuenta, "RET", 40),
+            ("noexiste", "DEP", 10),
+            (ca.numero_cuenta, "RET", 150),
+            (cc.numero_cuenta, "RET", 20),
+            (ca.numero_cuenta, "RET", 60),
+        ])
+        assert resultados == [None, None, "Cuenta no encontrada", "Saldo insuficiente", "Saldo insuficiente", None]
+        assert ca.saldo == 40.0
+        assert cc.saldo == -40.0
+
+
+class TestConcurrencia:
+    """Tests de Banco y Cuenta usados desde varios hilos"""
+
+    def test_retiros_concurrentes_no_sobregiran(self):
+        banco = Banco()
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        cuenta = banco.crear_cuenta_ahorro("10101010")
+        cuenta.ingresar(100)
+        # observador lento: sin candado, varios hilos pasarían la validación del saldo a la vez
+        cuenta._observador = lambda c, movimientos: time.sleep(0)
+        exitos = []
+
+        def retirar():
+            for _ in range(50):
+                try:
+                    cuenta.retirar(1)
+                    exitos.append(1)
+                except ValueError:
+                    pass
+
+        hilos = [threading.Thread(target=retirar) for _ in range(8)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        assert len(exitos) == 100
+        assert cuenta.saldo == 0.0
+        assert cuenta.libro.suma_deltas() == 0.0
+
+    def test_altas_concurrentes_con_mismo_dni(self):
+        banco = Banco()
+        errores = []
+
+        def crear():
+            try:
+                banco.crear_cliente("Sofía", "Díaz", "10101010")
+            except ValueError:
+                errores.append(1)
+
+        hilos = [threading.Thread(target=crear) for _ in range(8)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        assert banco.contar_clientes() == 1
+        assert len(errores) == 7
+
+
+class TestTransferencias:
+    """Tests de Banco.transferir"""
+
+    @pytest.fixture
+    def banco(self):
+        banco = Banco()
+        banco.crear_cliente("Sofía", "Díaz", "10101010")
+        return banco
+
+    def test_transferir(self, banco):
+        origen = banco.crear_cuenta_ahorro("10101010")
+        destino = banco.crear_cuenta_ahorro("10101010")
+        origen.ingresar(100)
+        retiro, deposito = banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 30)
+        assert origen.saldo == 70.0
+        assert destino.saldo == 30.0
+        assert retiro.referencia == deposito.id
+        assert deposito.referencia == retiro.id
+        assert origen.obtener_transacciones()[-1].referencia == deposito.id
+        assert destino.obtener_transacciones()[-1].id == deposito.id
+
+    def test_saldo_insuficiente_no_mueve_nada(self, banco):
+        origen = banco.crear_cuenta_ahorro("10101010")
+        destino = banco.crear_cuenta_ahorro("10101010")
+        origen.ingresar(10)
+        with pytest.raises(ValueError):
+            banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 30)
+        assert origen.saldo == 10.0
+        assert destino.saldo == 0.0
+        assert len(destino.obtener_transacciones()) == 0
+
+    def test_descubierto_de_cuenta_corriente(self, banco):
+        origen = banco.crear_cuenta_corriente("10101010", limite_descubierto=50)
+        destino = banco.crear_cuenta_ahorro("10101010")
+        banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 50)
+        assert origen.saldo == -50.0
+        with pytest.raises(ValueError):
+            banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 1)
+
+    def test_cuentas_invalidas(self, banco):
+        cuenta = banco.crear_cuenta_ahorro("10101010")
+        cuenta.ingresar(10)
+        with pytest.raises(ValueError):
+            banco.transferir(cuenta.numero_cuenta, cuenta.numero_cuenta, 1)
+        with pytest.raises(ValueError):
+            banco.transferir(cuenta.numero_cuenta, "noexiste", 1)
+        with pytest.raises(ValueError):
+            banco.transferir(cuenta.numero_cuenta, "noexiste", -1)
+
+    def test_transferencias_cruzadas_sin_interbloqueo(self, banco):
+        a = banco.crear_cuenta_ahorro("10101010")
+        b = banco.crear_cuenta_ahorro("10101010")
+        a.ingresar(1000)
+        b.ingresar(1000)
+
+        hechas, rechazadas, iteraciones = [], [], []
+
+        def mover(origen, destino):
+            ok = rechazos = 0
+            for _ in range(500):
+                try:
+                    banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 1)
+                    ok += 1
+                except ValueError as e:
+                    # con 4 hilos vaciando la misma cuenta puede quedarse sin saldo
+                    assert str(e) == "Saldo insuficiente"
+                    rechazos += 1
+            hechas.append(ok)
+            rechazadas.append(rechazos)
+            iteraciones.append(ok + rechazos)
+
+        hilos = [threading.Thread(target=mover, args=par) for par in [(a, b), (b, a)] * 4]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join(timeout=30)
+        assert not any(h.is_alive() for h in hilos)
+        # ningún hilo murió: todos terminaron sus 500 iteraciones
+        assert iteraciones == [500] * len(hilos)
+        assert sum(hechas) + sum(rechazadas) == 500 * len(hilos)
+        # cada transferencia hecha dejó un asiento en cada cuenta (además del depósito inicial)
+        assert len(a.libro) + len(b.libro) == 2 + 2 * sum(hechas)
+        assert a.saldo + b.saldo == 2000.0
+        assert a.saldo == a.libro.suma_deltas()
+
+
+class TestVersionBanco:
+    """Tests de Banco.version (clave de las vistas cacheadas)"""
+
+    def test_sube_con_las_altas(self):
+        banco = Banco()
+        inicial = banco.version
+        banco.crear_cliente("Ana", "Gómez", "12345678")
+        despues_cliente = banco.version
+        banco.crear_cuenta_ahorro("12345678")
+        despues_cuenta = banco.version
+        banco.crear_clientes_lote([("Luis", "Pérez", "23456789")])
+        assert inicial < despues_cliente < despues_cuenta < banco.version
+
+    def test_no_cambia_con_movimientos_ni_rechazos(self):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Gómez", "12345678")
+        cuenta = banco.crear_cuenta_ahorro("12345678")
+        version = banco.version
+        cuenta.ingresar(100)
+        with pytest.raises(ValueError):
+            banco.crear_cliente("Ana", "Gómez", "12345678")
+        assert banco.version == version
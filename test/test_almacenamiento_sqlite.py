@@ -0,0 +1,160 @@
+import pytest
+from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from transaccion import Transaccion
+
+
+class TestMotorSQLite:
+    """Tests del almacenamiento persistente en SQLite"""
+
+    @pytest.fixture
+    def ruta(self, tmp_path):
+        return str(tmp_path / "banco.db")
+
+    def test_persistencia_entre_aperturas(self, ruta):
+        motor = MotorSQLite(ruta)
+        banco = Banco(motor)
+        banco.crear_cliente("Carlos", "Gómez", "33333333")
+        ca = banco.crear_cuenta_ahorro("33333333", tasa_interes=0.03)
+        cc = banco.crear_cuenta_corriente("33333333", limite_descubierto=500)
+        ca.ingresar(1000)
+        ca.retirar(250)
+        cc.retirar(100)
+        ids = [tx.id for tx in ca.obtener_transacciones()]
+        motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        cliente = banco.buscar_cliente_por_dni("33333333")
+        assert cliente.nombre == "Carlos"
+        ca2 = banco.buscar_cuenta_por_num(ca.numero_cuenta)
+        assert ca2.saldo == 750.0
+        assert ca2.tasa_interes == 0.03
+        assert [tx.id for tx in ca2.obtener_transacciones()] == ids
+        cc2 = banco.buscar_cuenta_por_num(cc.numero_cuenta)
+        assert cc2.saldo == -100.0
+        assert cc2.limite_descubierto == 500.0
+        assert banco.listar_cuentas_por_cliente("33333333") == [ca2, cc2]
+
+    def test_movimientos_tras_reapertura(self, ruta):
+        banco = Banco(MotorSQLite(ruta))
+        banco.crear_cliente("Laura", "Fernández", "44444444")
+        numero = banco.crear_cuenta_ahorro("44444444").numero_cuenta
+        banco._motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        banco.buscar_cuenta_por_num(numero).ingresar(40)
+        banco._motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        assert banco.buscar_cuenta_por_num(numero).saldo == 40.0
+
+    def test_identidad_de_objetos(self, ruta):
+        banco = Banco(MotorSQLite(ruta))
+        banco.crear_cliente("Laura", "Fernández", "44444444")
+        cuenta = banco.crear_cuenta_ahorro("44444444")
+        assert banco.buscar_cuenta_por_num(cuenta.numero_cuenta) is cuenta
+        assert banco.buscar_cliente_por_dni("44444444") is cuenta.cliente
+
+    def test_dni_duplicado(self, ruta):
+        banco = Banco(MotorSQLite(ruta))
+        banco.crear_cliente("Laura", "Fernández", "44444444")
+        with pytest.raises(ValueError):
+            banco.crear_cliente("Otra", "Persona", "44444444")
+
+    def test_alta_masiva_e_iteracion_por_bloques(self, ruta):
+        banco = Banco(MotorSQLite(ruta, tam_bloque=7))
+        filas = [("Nombre", "Apellido", str(1000 + i)) for i in range(50)]
+        banco.crear_clientes_lote(filas)
+        assert banco.contar_clientes() == 50
+        assert [c.dni for c in banco.iterar_clientes()] == [dni for _, _, dni in filas]
+        with pytest.raises(ValueError):
+            banco.crear_clientes_lote([("A", "B", "1000")])
+
+    def test_cerrar_cuenta(self, ruta):
+        banco = Banco(MotorSQLite(ruta))
+        banco.crear_cliente("Laura", "Fernández", "44444444")
+        cuenta = banco.crear_cuenta_ahorro("44444444")
+        cuenta.ingresar(10)
+        cuenta.retirar(10)
+        banco.cerrar_cuenta(cuenta.numero_cuenta)
+        assert banco.buscar_cuenta_por_num(cuenta.numero_cuenta) is None
+        assert banco.listar_cuentas_por_cliente("44444444") == []
+
+    def test_transferencia_persistida(self, ruta):
+        motor = MotorSQLite(ruta)
+        banco = Banco(motor)
+        banco.crear_cliente("Carlos", "Gómez", "33333333")
+        origen = banco.crear_cuenta_ahorro("33333333")
+        destino = banco.crear_cuenta_ahorro("33333333")
+        origen.ingresar(100)
+        retiro, deposito = banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 40)
+        motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        assert banco.buscar_cuenta_por_num(origen.numero_cuenta).saldo == 60.0
+        destino2 = banco.buscar_cuenta_por_num(destino.numero_cuenta)
+        assert destino2.saldo == 40.0
+        assert destino2.obtener_transacciones()[0].referencia == retiro.id
+
+    def test_marca_de_devengo_persistida(self, ruta):
+        motor = MotorSQLite(ruta)
+        banco = Banco(motor)
+        banco.crear_cliente("Carlos", "Gómez", "33333333")
+        cuenta = banco.crear_cuenta_ahorro("33333333", tasa_interes=0.001)
+        cuenta._aplicar([(Transaccion("DEP", 1000, datetime(2024, 1, 1)), 1000.0)])
+        cuenta.devengar_interes(datetime(2024, 1, 31, 12))
+        motor.cerrar()
+
+        cuenta2 = Banco(MotorSQLite(ruta)).buscar_cuenta_por_num(cuenta.numero_cuenta)
+        assert cuenta2.ultimo_devengo_ns == cuenta.ultimo_devengo_ns
+        assert cuenta2.saldo == pytest.approx(cuenta.saldo)
+        # el mismo período no se devenga dos veces tras reabrir
+        assert cuenta2.devengar_interes(datetime(2024, 1, 31, 23)) is None
+
+    def test_clientes_pagina(self, ruta):
+        motor = MotorSQLite(ruta)
+        banco = Banco(motor)
+        dnis = [str(40_000_000 + i) for i in range(5)]
+        for dni in dnis:
+            banco.crear_cliente("Sofía", "Díaz", dni)
+        motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        assert banco.contar_clientes() == 5
+        assert [c.dni for c in banco.listar_clientes_pagina(2, 2)] == dnis[2:4]
+        pagina = banco.listar_clientes_pagina(4, 10)
+        assert pagina == [banco.buscar_cliente_por_dni(dnis[4])]
+
+    def test_historial_diferido_y_consistente(self, ruta):
+        banco = Banco(MotorSQLite(ruta))
+        banco.crear_cliente("Carlos", "Gómez", "33333333")
+        a = banco.crear_cuenta_ahorro("33333333")
+        b = banco.crear_cuenta_ahorro("33333333")
+        for monto in (10, 20, 30):
+            a.ingresar(monto)
+            b.ingresar(monto)
+        banco._motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta, tam_bloque=1))
+        otro = Banco(MotorSQLite(ruta))
+        cuentas = banco.iterar_cuentas()
+        a2 = next(cuentas)
+        # otro proceso escribe en b después de que se leyó el bloque que la trae
+        otro.buscar_cuenta_por_num(b.numero_cuenta).ingresar(5)
+        b2 = next(cuentas)
+        assert b2.saldo == 65.0 and b2.version == 4
+        # y en a después de armarla: su historial se corta donde se leyó el saldo
+        otro.buscar_cuenta_por_num(a.numero_cuenta).ingresar(7)
+        assert a2._diferido is not None and a2.version == 3
+        assert [tx.monto for tx in a2.movimientos_recientes()] == [10.0, 20.0, 30.0]
+        a2.ingresar(1)
+        assert a2._diferido is not None and a2.version == 4
+        assert [tx.monto for tx in a2.obtener_transacciones()] == [10.0, 20.0, 30.0, 1.0]
+        assert a2._diferido is None and a2.libro.saldo_acumulado() == a2.saldo == 61.0
+        assert a2.obtener_transacciones()[-1].id == a2.movimientos_recientes()[-1].id
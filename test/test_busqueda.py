@@ -0,0 +1,68 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from busqueda import IndicePrefijos, normalizar
+from cliente import Cliente
+
+
+class TestIndicePrefijos:
+    """Tests del índice de búsqueda por prefijo"""
+
+    @pytest.fixture
+    def indice(self):
+        indice = IndicePrefijos(tam_buffer=4)
+        indice.agregar_lote([
+            Cliente("Ana", "Gómez", "30111222"),
+            Cliente("Juan Carlos", "Pérez", "30111333"),
+            Cliente("Anabel", "Torres", "28999000"),
+            Cliente("Mario", "Gomez", "40123456"),
+        ])
+        return indice
+
+    def test_normalizar(self):
+        assert normalizar("  Gómez ") == "gomez"
+        assert normalizar("MUÑOZ") == "munoz"
+
+    def test_prefijo_de_nombre_apellido_y_dni(self, indice):
+        assert indice.buscar("ana") == ["30111222", "28999000"]
+        assert sorted(indice.buscar("GOM")) == ["30111222", "40123456"]
+        assert indice.buscar("carl") == ["30111333"]
+        assert indice.buscar("30111") == ["30111222", "30111333"]
+        assert indice.buscar("zzz") == []
+        assert indice.buscar("   ") == []
+
+    def test_varios_terminos_y_limite(self, indice):
+        assert indice.buscar("gomez mar") == ["40123456"]
+        assert indice.buscar("a", limite=1) == ["30111222"]
+
+    def test_altas_en_el_buffer_y_fusionadas(self, indice):
+        indice.agregar(Cliente("Andrés", "Ruiz", "50000000"))
+        assert "50000000" in indice.buscar("andr")
+        for i in range(10):
+            indice.agregar(Cliente("Andrea", f"Ruiz{i}", str(51_000_000 + i)))
+        resultado = indice.buscar("andr", limite=20)
+        assert len(resultado) == 11
+        assert len(indice) == 15
+
+
+class TestBuscarClientes:
+    def test_se_actualiza_con_las_altas(self):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Gómez", "30111222")
+        assert banco.buscar_clientes("gom") == [banco.buscar_cliente_por_dni("30111222")]
+        banco.crear_cliente("Mario", "Gomez", "40123456")
+        banco.crear_clientes_lote([("Gomeza", "Ruiz", "50123456")])
+        assert sorted(c.dni for c in banco.buscar_clientes("gom")) == ["30111222", "40123456", "50123456"]
+
+    def test_sqlite(self, tmp_path):
+        ruta = str(tmp_path / "banco.db")
+        motor = MotorSQLite(ruta)
+        Banco(motor).crear_cliente("Ana", "Gómez", "30111222")
+        motor.cerrar()
+        banco = Banco(MotorSQLite(ruta))
+        assert [c.dni for c in banco.buscar_clientes("ana g")] == ["30111222"]
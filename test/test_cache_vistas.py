@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from components.cache_vistas import CacheVistas
+
+
+class TestCacheVistas:
+    """Tests del cache de vistas por ruta (no necesita Flet)"""
+
+    def test_reutiliza_con_la_misma_firma(self):
+        cache = CacheVistas()
+        construidas = []
+
+        def construir():
+            construidas.append(object())
+            return construidas[-1]
+
+        primera = cache.obtener("/", 1, construir)
+        assert cache.obtener("/", 1, construir) is primera
+        assert len(construidas) == 1
+        assert cache.estadisticas()["aciertos"] == 1
+
+    def test_firma_distinta_rearma(self):
+        cache = CacheVistas()
+        primera = cache.obtener("/", 1, object)
+        assert cache.obtener("/", 2, object) is not primera
+        assert cache.estadisticas()["fallos"] == 2
+
+    def test_sellar_acepta_los_cambios_hechos_en_la_vista(self):
+        cache = CacheVistas()
+        vista = cache.obtener("/detalle/1", ("a", 0), object)
+        # la vista mostró ella misma el movimiento antes de dejarla
+        cache.sellar("/detalle/1", ("a", 1))
+        assert cache.obtener("/detalle/1", ("a", 1), object) is vista
+
+    def test_desalojo_lru(self):
+        cache = CacheVistas(max_vistas=2)
+        a = cache.obtener("a", 0, object)
+        cache.obtener("b", 0, object)
+        cache.obtener("a", 0, object)  # "a" pasa a ser la más reciente
+        cache.obtener("c", 0, object)
+        assert len(cache) == 2
+        assert cache.estadisticas()["desalojos"] == 1
+        assert cache.obtener("a", 0, object) is a
+
+    def test_sin_cache_y_errores(self):
+        cache = CacheVistas(max_vistas=0)
+        assert cache.obtener("/", 0, object) is not cache.obtener("/", 0, object)
+        assert len(cache) == 0
+
+        def falla():
+            raise ValueError("Cliente no encontrado")
+
+        with pytest.raises(ValueError):
+            CacheVistas().obtener("/detalle/x", (), falla)
+        with pytest.raises(ValueError):
+            CacheVistas(max_vistas=-1)
+
+    def test_invalidar(self):
+        cache = CacheVistas()
+        vista = cache.obtener("/", 0, object)
+        cache.invalidar("/")
+        assert cache.obtener("/", 0, object) is not vista
+        cache.invalidar()
+        assert len(cache) == 0
+
+    def test_al_descartar_recibe_cada_vista_que_se_suelta(self):
+        descartadas = []
+        cache = CacheVistas(max_vistas=2, al_descartar=descartadas.append)
+        a = cache.obtener("a", 0, object)
+        b = cache.obtener("b", 0, object)
+        c = cache.obtener("c", 0, object)  # desaloja "a"
+        b2 = cache.obtener("b", 1, object)  # firma nueva: rearma "b"
+        assert descartadas == [a, b]
+        cache.invalidar()
+        assert descartadas == [a, b, c, b2]
+
+    def test_al_descartar_sin_cache(self):
+        descartadas = []
+        cache = CacheVistas(max_vistas=0, al_descartar=descartadas.append)
+        primera = cache.obtener("/", 0, object)
+        assert descartadas == []
+        cache.obtener("/detalle/1", 0, object)
+        assert descartadas == [primera]
@@ -0,0 +1,134 @@
+import pytest
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from cierre_diario import cierre_diario
+from transaccion import Transaccion
+
+FECHA = date(2024, 5, 31)
+
+
+def armar_banco(motor=None) -> Banco:
+    banco = Banco(motor)
+    for i in range(10):
+        dni = str(20_000_000 + i)
+        banco.crear_cliente("Ana", "Torres", dni)
+        ahorro = banco.crear_cuenta_ahorro(dni, tasa_interes=0.01)
+        ahorro._aplicar([(Transaccion("DEP", 100 * (i + 1), datetime(2024, 5, 31, 10)), 100.0 * (i + 1))])
+        corriente = banco.crear_cuenta_corriente(dni, limite_descubierto=1000)
+        corriente._aplicar([(Transaccion("RET", 200, datetime(2024, 5, 30, 9)), -200.0)])
+    return banco
+
+
+def saldos(banco: Banco):
+    return {c.numero_cuenta: c.saldo for c in banco.iterar_cuentas()}
+
+
+class TestCierreDiario:
+    """Tests del cierre diario por shards"""
+
+    @pytest.mark.parametrize("procesos", [0, 2])
+    def test_intereses_comisiones_y_estados(self, tmp_path, procesos):
+        banco = armar_banco()
+        resumen = cierre_diario(banco, FECHA, str(tmp_path), procesos=procesos, tam_shard=3)
+        assert resumen["cuentas"] == resumen["estados"] == 20
+        assert resumen["shards"] == 7
+        assert resumen["intereses"] == pytest.approx(sum(100 * (i + 1) * 0.01 for i in range(10)))
+        assert resumen["comisiones"] == pytest.approx(10 * 0.1)
+        for cuenta in banco.iterar_cuentas():
+            esperado = cuenta.libro.saldo_acumulado()
+            assert cuenta.saldo == esperado
+            ultimo = cuenta.obtener_transacciones()[-1]
+            assert ultimo.tipo == ("DEP" if cuenta.saldo > 0 else "RET")
+        estados = "".join(p.read_text(encoding="utf-8") for p in (tmp_path / FECHA.isoformat()).iterdir())
+        assert estados.count("Saldo final") == 20
+        assert estados.count("Comisión") == 10
+
+    def test_retoma_desde_el_checkpoint(self, tmp_path):
+        checkpoint = str(tmp_path / "cierre.json")
+        esperado = armar_banco()
+        cierre_diario(esperado, FECHA, str(tmp_path / "a"), procesos=0, tam_shard=3)
+
+        banco = armar_banco()
+        parcial = cierre_diario(banco, FECHA, str(tmp_path / "b"), procesos=0, tam_shard=3,
+                                checkpoint=checkpoint, max_shards=2)
+        assert parcial["estados"] == 6
+        resto = cierre_diario(banco, FECHA, str(tmp_path / "b"), procesos=0, tam_shard=3, checkpoint=checkpoint)
+        assert resto["omitidas"] == 6
+        assert resto["estados"] == 14
+        # cada cuenta recibió exactamente un asiento de cierre
+        assert sorted(len(c.obtener_transacciones()) for c in banco.iterar_cuentas()) == [2] * 20
+        assert sorted(saldos(banco).values()) == pytest.approx(sorted(saldos(esperado).values()))
+        # otro día: el checkpoint no aplica
+        otro = cierre_diario(banco, date(2024, 6, 1), str(tmp_path / "b"), procesos=0, checkpoint=checkpoint)
+        assert otro["omitidas"] == 0
+
+    def test_no_vuelve_a_asentar_el_mismo_dia(self, tmp_path):
+        checkpoint = tmp_path / "cierre.json"
+        banco = armar_banco()
+        cierre_diario(banco, FECHA, str(tmp_path), procesos=0, tam_shard=3, checkpoint=str(checkpoint))
+        esperado = saldos(banco)
+        estados = {p.name: p.read_text(encoding="utf-8") for p in (tmp_path / FECHA.isoformat()).iterdir()}
+        # como si se hubiera caído entre los asientos y el checkpoint, y también sin checkpoint
+        checkpoint.unlink()
+        repetido = cierre_diario(banco, FECHA, str(tmp_path), procesos=0, tam_shard=3, checkpoint=str(checkpoint))
+        cierre_diario(banco, FECHA, str(tmp_path), procesos=0, tam_shard=3)
+        assert repetido["intereses"] == repetido["comisiones"] == 0
+        assert saldos(banco) == esperado
+        assert {p.name: p.read_text(encoding="utf-8") for p in (tmp_path / FECHA.isoformat()).iterdir()} == estados
+
+    def test_avanza_la_marca_de_devengo(self, tmp_path):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Torres", "20000000")
+        ahorro = banco.crear_cuenta_ahorro("20000000", tasa_interes=0.01)
+        ahorro._aplicar([(Transaccion("DEP", 1000, datetime(2024, 5, 30, 10)), 1000.0)])
+        cierre_diario(banco, FECHA, str(tmp_path), procesos=0)
+        assert ahorro.saldo == pytest.approx(1010.0)
+        # el día ya está pagado: devengar ese mismo día no agrega nada
+        assert ahorro.devengar_interes(datetime(2024, 5, 31, 23)) is None
+        assert ahorro.saldo == pytest.approx(1010.0)
+
+    def test_usa_el_saldo_de_la_fecha(self, tmp_path):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Torres", "20000000")
+        ahorro = banco.crear_cuenta_ahorro("20000000", tasa_interes=0.01)
+        ahorro._aplicar([(Transaccion("DEP", 100, datetime(2024, 5, 31, 10)), 100.0)])
+        ahorro._aplicar([(Transaccion("DEP", 500, datetime(2024, 6, 2, 10)), 500.0)])
+        resumen = cierre_diario(banco, FECHA, str(tmp_path), procesos=0)
+        assert resumen["intereses"] == pytest.approx(1.0)
+        estado = next((tmp_path / FECHA.isoformat()).iterdir()).read_text(encoding="utf-8")
+        assert "DEP         100.00" in estado
+        assert "500.00" not in estado
+        assert "Saldo final:           101.00" in estado
+        assert ahorro.saldo == pytest.approx(601.0)
+
+    @pytest.mark.parametrize("procesos", [0, 2])
+    def test_banco_en_sqlite(self, tmp_path, procesos):
+        # los procesos leen las cuentas del archivo; el resultado es el mismo que en memoria
+        esperado = armar_banco()
+        cierre_diario(esperado, FECHA, str(tmp_path / "a"), procesos=0, tam_shard=3)
+        motor = MotorSQLite(str(tmp_path / "banco.db"))
+        banco = armar_banco(motor)
+        # la mitad de las cuentas en memoria (se enteran del asiento), el resto solo en el archivo
+        cargadas = list(banco.iterar_cuentas())[::2]
+        checkpoint = str(tmp_path / "cierre.json")
+        parcial = cierre_diario(banco, FECHA, str(tmp_path / "b"), procesos=procesos, tam_shard=3,
+                                checkpoint=checkpoint, max_shards=2)
+        resto = cierre_diario(banco, FECHA, str(tmp_path / "b"), procesos=procesos, tam_shard=3,
+                              checkpoint=checkpoint)
+        assert parcial["estados"] + resto["estados"] == 20 and resto["omitidas"] == 6
+        assert sorted(saldos(banco).values()) == pytest.approx(sorted(saldos(esperado).values()))
+        assert all(c.saldo == c.libro.saldo_acumulado() for c in cargadas)
+        motor.cerrar()
+        # reabierto: cada cuenta tiene un único asiento de cierre y lo guardado coincide
+        banco = Banco(MotorSQLite(str(tmp_path / "banco.db")))
+        assert sorted(len(c.obtener_transacciones()) for c in banco.iterar_cuentas()) == [2] * 20
+        estados = "".join(p.read_text(encoding="utf-8") for p in (tmp_path / "b" / FECHA.isoformat()).iterdir())
+        assert estados.count("Saldo final") == 20
+        repetido = cierre_diario(banco, FECHA, str(tmp_path / "b"), procesos=procesos, tam_shard=3)
+        assert repetido["intereses"] == repetido["comisiones"] == 0
@@ -3,8 +3,11 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from datetime import datetime, timedelta
+from fractions import Fraction
 from cuenta import CuentaAhorro, CuentaCorriente
 from cliente import Cliente
+from transaccion import Transaccion
 
 class TestCuentaAhorro:
     @pytest.fixture
@@ -40,6 +43,24 @@ class TestCuentaAhorro:
         with pytest.raises(ValueError):
             cuenta.ingresar(-100)
 
+    @pytest.mark.parametrize("monto", [float("nan"), float("inf"), float("-inf")])
+    def test_monto_no_finito(self, cuenta, monto):
+        cuenta.ingresar(100)
+        with pytest.raises(ValueError):
+            cuenta.ingresar(monto)
+        with pytest.raises(ValueError):
+            cuenta.retirar(monto)
+        assert cuenta.aplicar_lote([("DEP", monto)]) == ["El monto debe ser mayor que cero"]
+        assert cuenta.saldo == 100
+        with pytest.raises(ValueError):
+            Transaccion("DEP", monto)
+
+    def test_lote_con_montos_reales(self, cuenta):
+        np = pytest.importorskip("numpy")
+        operaciones = [("DEP", np.float64(10.5)), ("DEP", Fraction(1, 2)), ("RET", np.int64(1))]
+        assert cuenta.aplicar_lote(operaciones) == [None] * 3
+        assert cuenta.saldo == 10.0
+
 
 class TestCuentaCorriente:
     @pytest.fixture
@@ -74,3 +95,180 @@ def test_ingresar_parametrizado(monto, esperado):
     cuenta = CuentaAhorro(cliente, tasa_interes=0.02)
     cuenta.ingresar(monto)
     assert cuenta.saldo == esperado
+
+
+class TestAplicarLote:
+    @pytest.fixture
+    def cliente(self):
+        return Cliente("Ana", "Perez", "12345678")
+
+    def test_lote_cuenta_ahorro(self, cliente):
+        cuenta = CuentaAhorro(cliente)
+        resultados = cuenta.aplicar_lote([("DEP", 100), ("RET", 30), ("RET", 100), ("XXX", 5), ("DEP", -1)])
+        assert resultados[:2] == [None, None]
+        assert resultados[2] == "Saldo insuficiente"
+        assert resultados[3] is not None and resultados[4] is not None
+        assert cuenta.saldo == 70.0
+        assert [(t.tipo, t.monto) for t in cuenta.obtener_transacciones()] == [("DEP", 100.0), ("RET", 30.0)]
+
+    def test_lote_respeta_descubierto(self, cliente):
+        cc = CuentaCorriente(cliente, limite_descubierto=500)
+        resultados = cc.aplicar_lote([("RET", 400), ("RET", 100), ("RET", 1)])
+        assert resultados == [None, None, "Saldo insuficiente"]
+        assert cc.saldo == -500.0
+
+    def test_lote_igual_a_operaciones_sueltas(self, cliente):
+        operaciones = [("DEP", 0.1), ("DEP", 0.2), ("RET", 0.15), ("DEP", 10.7)]
+        suelta = CuentaAhorro(cliente)
+        for tipo, monto in operaciones:
+            suelta.ingresar(monto) if tipo == "DEP" else suelta.retirar(monto)
+        en_lote = CuentaAhorro(cliente)
+        en_lote.aplicar_lote(operaciones)
+        assert en_lote.saldo == suelta.saldo
+
+
+class TestSaldoAFecha:
+    def test_saldo_a_fecha_y_flujo_neto(self):
+        cuenta = CuentaCorriente(Cliente("Ana", "Perez", "12345678"), limite_descubierto=100)
+        for tipo, monto, delta, dia in [("DEP", 100, 100.0, 1), ("RET", 150, -150.0, 10), ("DEP", 80, 80.0, 20)]:
+            cuenta._aplicar([(Transaccion(tipo, monto, datetime(2024, 3, dia)), delta)])
+        assert cuenta.saldo_a_fecha(datetime(2024, 2, 28)) == 0.0
+        assert cuenta.saldo_a_fecha(datetime(2024, 3, 1)) == 100.0
+        assert cuenta.saldo_a_fecha(datetime(2024, 3, 15)) == -50.0
+        assert cuenta.saldo_a_fecha(datetime(2024, 4, 1)) == cuenta.saldo == 30.0
+        assert cuenta.flujo_neto(datetime(2024, 3, 1), datetime(2024, 3, 31)) == -70.0
+        desde, hasta = datetime(2024, 3, 5), datetime(2024, 3, 25)
+        assert cuenta.saldo_a_fecha(hasta) == cuenta.saldo_a_fecha(desde) + cuenta.flujo_neto(desde, hasta)
+
+
+class TestConsultarTransacciones:
+    @pytest.fixture
+    def cuenta(self):
+        cuenta = CuentaAhorro(Cliente("Ana", "Perez", "12345678"))
+        for dia in range(1, 31):
+            tipo = "DEP" if dia % 3 else "RET"
+            cuenta._aplicar([(Transaccion(tipo, dia, datetime(2024, 4, dia)), dia if tipo == "DEP" else -dia)])
+        return cuenta
+
+    def test_paginas_con_cursor(self, cuenta):
+        vistos, cursor = [], None
+        while True:
+            pagina, cursor = cuenta.consultar_transacciones(tipo="DEP", monto_min=5, tam_pagina=4, cursor=cursor)
+            vistos.extend(tx.monto for tx in pagina)
+            if cursor is None:
+                break
+        assert vistos == [float(d) for d in range(5, 31) if d % 3]
+
+    def test_rango_de_fechas(self, cuenta):
+        pagina, cursor = cuenta.consultar_transacciones(desde=datetime(2024, 4, 10), hasta=datetime(2024, 4, 12))
+        assert [tx.fecha.day for tx in pagina] == [10, 11, 12]
+        assert cursor is None
+
+    def test_generador_y_ultimas(self, cuenta):
+        recientes = list(cuenta.iterar_transacciones(tipo="RET", tam_pagina=3, recientes_primero=True))
+        assert [tx.monto for tx in recientes] == [30.0, 27.0, 24.0, 21.0, 18.0, 15.0, 12.0, 9.0, 6.0, 3.0]
+        assert [tx.fecha.day for tx in cuenta.ultimas_transacciones(3)] == [28, 29, 30]
+
+    def test_parametros_invalidos(self, cuenta):
+        with pytest.raises(ValueError):
+            cuenta.consultar_transacciones(cursor="abc")
+        with pytest.raises(ValueError):
+            cuenta.consultar_transacciones(tam_pagina=0)
+
+
+class TestMovimientosRecientes:
+    def test_buffer_acotado(self, monkeypatch):
+        monkeypatch.setattr(CuentaAhorro, "tam_recientes", 3)
+        cuenta = CuentaAhorro(Cliente("Ana", "Perez", "12345678"))
+        assert cuenta.movimientos_recientes() == []
+        for monto in range(1, 6):
+            cuenta.ingresar(monto)
+        cuenta.retirar(1)
+        cuenta.aplicar_lote([("DEP", 7), ("DEP", 8)])
+        assert [(t.tipo, t.monto) for t in cuenta.movimientos_recientes()] == [("RET", 1.0), ("DEP", 7.0), ("DEP", 8.0)]
+        assert [t.monto for t in cuenta.ultimas_transacciones(2)] == [7.0, 8.0]
+        # más de lo que guarda el buffer: se consulta el libro
+        assert [t.monto for t in cuenta.ultimas_transacciones(4)] == [5.0, 1.0, 7.0, 8.0]
+
+    def test_se_reconstruye_al_cargar_historial(self):
+        origen = CuentaAhorro(Cliente("Ana", "Perez", "12345678"))
+        for monto in range(1, 20):
+            origen.ingresar(monto)
+        copia = CuentaAhorro(origen.cliente)
+        copia._cargar_historial(origen.saldo, origen.libro)
+        assert [t.id for t in copia.movimientos_recientes()] == [t.id for t in origen.movimientos_recientes()]
+
+
+class TestDevengarInteres:
+    @staticmethod
+    def cuenta_con(movimientos, tasa=0.001):
+        cuenta = CuentaAhorro(Cliente("Ana", "Perez", "12345678"), tasa_interes=tasa)
+        for fecha, monto in movimientos:
+            tipo = "DEP" if monto > 0 else "RET"
+            cuenta._aplicar([(Transaccion(tipo, abs(monto), fecha), float(monto))])
+        return cuenta
+
+    @staticmethod
+    def simular(movimientos, desde, dias, tasa=0.001):
+        # referencia: aplicar_interes al cierre de cada día
+        saldo = sum(m for f, m in movimientos if f <= desde)
+        for dia in range(1, dias + 1):
+            cierre = desde + timedelta(days=dia)
+            saldo += sum(m for f, m in movimientos if cierre - timedelta(days=1) < f <= cierre)
+            if saldo > 0:
+                saldo += saldo * tasa
+        return saldo
+
+    def test_forma_cerrada_sin_movimientos(self):
+        inicio = datetime(2024, 1, 1)
+        cuenta = self.cuenta_con([(inicio, 1000)])
+        tx = cuenta.devengar_interes(inicio + timedelta(days=365, hours=5))
+        assert tx.monto == pytest.approx(1000 * (1.001 ** 365 - 1))
+        assert cuenta.saldo == pytest.approx(self.simular([(inicio, 1000)], inicio, 365))
+        assert cuenta.ultimo_devengo_ns == Transaccion("DEP", 1, inicio + timedelta(days=365)).fecha_ns
+
+    def test_movimientos_en_el_medio(self):
+        inicio = datetime(2024, 1, 1)
+        movimientos = [(inicio, 500), (inicio + timedelta(days=10), 300), (inicio + timedelta(days=10, hours=2), -200),
+                       (inicio + timedelta(days=40), -1000), (inicio + timedelta(days=60), 50)]
+        cuenta = self.cuenta_con(movimientos)
+        cuenta.devengar_interes(inicio + timedelta(days=90))
+        assert cuenta.saldo == pytest.approx(self.simular(movimientos, inicio, 90))
+
+    def test_en_tramos_igual_que_de_una_vez(self):
+        inicio = datetime(2024, 1, 1)
+        movimientos = [(inicio, 1000), (inicio + timedelta(days=5, hours=3), 250)]
+        de_una = self.cuenta_con(movimientos)
+        de_una.devengar_interes(inicio + timedelta(days=30))
+        en_tramos = self.cuenta_con(movimientos)
+        assert en_tramos.devengar_interes(inicio + timedelta(hours=20)) is None
+        for dias in (7, 8, 30):
+            en_tramos.devengar_interes(inicio + timedelta(days=dias, hours=1))
+        assert en_tramos.saldo == pytest.approx(de_una.saldo)
+        assert en_tramos.ultimo_devengo_ns == de_una.ultimo_devengo_ns
+        # el período ya devengado no se vuelve a pagar
+        assert en_tramos.devengar_interes(inicio + timedelta(days=30, hours=23)) is None
+
+    def test_saldo_negativo_o_sin_movimientos(self):
+        cuenta = CuentaAhorro(Cliente("Ana", "Perez", "12345678"))
+        assert cuenta.devengar_interes() is None
+        assert cuenta.ultimo_devengo_ns is None
+        with pytest.raises(ValueError):
+            cuenta.devengar_interes(periodo=timedelta(0))
+
+
+class TestVersion:
+    def test_crece_con_cada_cambio(self):
+        cuenta = CuentaCorriente(Cliente("Ana", "Perez", "12345678"), limite_descubierto=100)
+        versiones = [cuenta.version]
+        cuenta.ingresar(50)
+        versiones.append(cuenta.version)
+        cuenta.retirar(20)
+        versiones.append(cuenta.version)
+        cuenta.aplicar_lote([("DEP", 1), ("RET", 1)])
+        versiones.append(cuenta.version)
+        assert versiones == sorted(set(versiones))
+        # una operación rechazada no cambia nada
+        with pytest.raises(ValueError):
+            cuenta.retirar(1_000)
+        assert cuenta.version == versiones[-1]
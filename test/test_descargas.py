@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from descargas import Descargas
+
+
+class TestDescargas:
+    """Tests de la entrega de PDFs de la interfaz (no necesita Flet)"""
+
+    def test_publicar_sirve_desde_assets(self, tmp_path):
+        descargas = Descargas(tmp_path)
+        url = descargas.publicar(b"%PDF-1.4 datos", "cliente_12345678.pdf")
+        assert url.startswith("/descargas/") and url.endswith("/cliente_12345678.pdf")
+        # la URL es relativa a assets/, que el servidor de Flet sirve tal cual
+        assert (tmp_path / url.lstrip("/")).read_bytes() == b"%PDF-1.4 datos"
+        # cada publicación tiene su token: no se pisan ni se adivinan
+        assert descargas.publicar(b"otro", "cliente_12345678.pdf") != url
+
+    def test_conserva_solo_las_ultimas(self, tmp_path):
+        descargas = Descargas(tmp_path, max_archivos=2)
+        urls = [descargas.publicar(bytes([i]), "r.pdf") for i in range(4)]
+        existentes = [(tmp_path / u.lstrip("/")).exists() for u in urls]
+        assert existentes == [False, False, True, True]
+
+    def test_limpiar_borra_lo_de_ejecuciones_anteriores(self, tmp_path):
+        anterior = Descargas(tmp_path).publicar(b"viejo", "r.pdf")
+        descargas = Descargas(tmp_path)
+        descargas.limpiar()
+        assert not (tmp_path / anterior.lstrip("/")).exists()
+        assert not (tmp_path / "descargas").exists()
+        # y se puede seguir publicando
+        url = descargas.publicar(b"nuevo", "r.pdf")
+        assert (tmp_path / url.lstrip("/")).read_bytes() == b"nuevo"
+
+    def test_nombre_sin_directorios(self, tmp_path):
+        url = Descargas(tmp_path).publicar(b"x", "../../fuera de assets.pdf")
+        assert url.endswith("/fuera_de_assets.pdf")
+        assert not (tmp_path.parent / "fuera de assets.pdf").exists()
+        with pytest.raises(ValueError):
+            Descargas(tmp_path).publicar(b"x", "..")
+
+    def test_guardar_en_la_ruta_elegida(self, tmp_path):
+        ruta = Descargas.guardar(b"%PDF", str(tmp_path / "reporte"))
+        assert ruta.endswith("reporte.pdf")
+        assert Path(ruta).read_bytes() == b"%PDF"
+        # el usuario canceló el diálogo
+        assert Descargas.guardar(b"%PDF", None) is None
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from components.filas import FilasPorClave
+
+
+class TestFilasPorClave:
+    """Tests de la reutilización de filas por clave (no necesita Flet)"""
+
+    def test_solo_construye_las_nuevas(self):
+        filas_tabla = []
+        filas = FilasPorClave(clave=lambda e: e[0], construir=lambda e: {"fila": e})
+        assert filas.sincronizar(filas_tabla, [("a", 1), ("b", 2)])
+        primera = filas_tabla[0]
+        assert filas.construidas == 2
+        assert filas.sincronizar(filas_tabla, [("a", 1), ("b", 2), ("c", 3)])
+        assert filas.construidas == 3
+        assert filas_tabla[0] is primera
+        assert [f["fila"][0] for f in filas_tabla] == ["a", "b", "c"]
+
+    def test_sin_cambios_no_toca_la_lista(self):
+        filas_tabla = []
+        filas = FilasPorClave(clave=lambda e: e, construir=lambda e: object())
+        filas.sincronizar(filas_tabla, ["a", "b"])
+        antes = list(filas_tabla)
+        assert not filas.sincronizar(filas_tabla, ["a", "b"])
+        assert filas_tabla == antes
+
+    def test_quitar_y_reordenar(self):
+        filas_tabla = []
+        filas = FilasPorClave(clave=lambda e: e, construir=lambda e: [e])
+        filas.sincronizar(filas_tabla, ["a", "b", "c"])
+        a, b, c = filas_tabla
+        assert filas.sincronizar(filas_tabla, ["c", "a"])
+        assert filas_tabla[0] is c and filas_tabla[1] is a
+        # "b" ya no está visible: si vuelve, se construye de nuevo
+        filas.sincronizar(filas_tabla, ["b"])
+        assert filas_tabla[0] is not b
+        assert filas.construidas == 4
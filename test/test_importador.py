@@ -0,0 +1,76 @@
+import csv
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from importador import importar_csv
+
+
+class TestImportador:
+    """Tests de la importación masiva desde CSV"""
+
+    @pytest.fixture
+    def archivo(self, tmp_path):
+        ruta = tmp_path / "clientes.csv"
+        ruta.write_text(
+            "dni,nombre,apellido,tasa_ahorro,limite_corriente\n"
+            "11111111,Ana,Torres,0.02,\n"
+            "22222222,Luis,Ramírez,,500\n"
+            "abc,Mal,DNI,,\n"
+            "11111111,Ana,Repetida,,\n"
+            "33333333,,SinNombre,,\n"
+            "44444444,Eva,Paz,x,\n"
+            "55555555,Juan,Sosa,0.01,100\n",
+            encoding="utf-8",
+        )
+        return ruta
+
+    @pytest.mark.parametrize("procesos", [0, 2])
+    def test_importar(self, archivo, tmp_path, procesos):
+        banco = Banco()
+        banco.crear_cliente("Ya", "Existe", "55555555")
+        rechazados = tmp_path / "rechazados.csv"
+        resumen = importar_csv(banco, str(archivo), str(rechazados), procesos=procesos, tam_bloque=2)
+        assert resumen["leidas"] == 7
+        assert resumen["importados"] == 2
+        assert resumen["cuentas"] == 2
+        assert resumen["rechazados"] == 5
+        assert banco.buscar_cliente_por_dni("11111111").apellido == "Torres"
+        assert banco.listar_cuentas_por_cliente("11111111")[0].tasa_interes == 0.02
+        assert banco.listar_cuentas_por_cliente("22222222")[0].limite_descubierto == 500.0
+        assert banco.listar_cuentas_por_cliente("55555555") == []
+
+        with open(rechazados, newline="", encoding="utf-8") as f:
+            filas = list(csv.reader(f))
+        assert filas[0][:2] == ["linea", "motivo"]
+        assert sorted(int(f[0]) for f in filas[1:]) == [4, 5, 6, 7, 8]
+        # los duplicados también se escriben con la fila original, en el orden del CSV
+        duplicados = {int(f[0]): f[2:] for f in filas[1:] if f[1] == "DNI duplicado"}
+        assert duplicados == {5: ["11111111", "Ana", "Repetida", "", ""], 8: ["55555555", "Juan", "Sosa", "0.01", "100"]}
+
+    def test_sin_encabezado(self, tmp_path):
+        ruta = tmp_path / "malo.csv"
+        ruta.write_text("1,2,3\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            importar_csv(Banco(), str(ruta), procesos=0)
+
+    def test_numeros_no_finitos_se_rechazan(self, tmp_path):
+        ruta = tmp_path / "no_finitos.csv"
+        ruta.write_text(
+            "dni,nombre,apellido,tasa_ahorro,limite_corriente\n"
+            "11111111,Ana,Torres,,inf\n"
+            "22222222,Luis,Ramírez,nan,\n"
+            "33333333,Eva,Paz,,1e999\n",
+            encoding="utf-8",
+        )
+        banco = Banco()
+        rechazados = tmp_path / "rechazados.csv"
+        resumen = importar_csv(banco, str(ruta), str(rechazados), procesos=0)
+        assert resumen["importados"] == 0 and resumen["rechazados"] == 3
+        assert banco.contar_clientes() == 0
+        with open(rechazados, newline="", encoding="utf-8") as f:
+            filas = list(csv.reader(f))[1:]
+        assert [(int(f[0]), "finito" in f[1]) for f in filas] == [(2, True), (3, True), (4, True)]
@@ -0,0 +1,84 @@
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from intereses import acumular_intereses, calcular_intereses
+
+SALDOS = [0.0, 1000.0, 0.1, 123.45, 99999.99, 7.0]
+TASAS = [0.05, 0.013, 0.07, 0.0, 0.021, 0.3]
+
+
+def armar_banco(banco: Banco):
+    banco.crear_cliente("Ana", "Torres", "66666666")
+    cuentas = []
+    for saldo, tasa in zip(SALDOS, TASAS):
+        cuenta = banco.crear_cuenta_ahorro("66666666", tasa_interes=tasa)
+        if saldo:
+            cuenta.ingresar(saldo)
+        cuentas.append(cuenta)
+    corriente = banco.crear_cuenta_corriente("66666666", limite_descubierto=100)
+    corriente.ingresar(500)
+    return cuentas, corriente
+
+
+class TestIntereses:
+    """Tests de la acreditación masiva de intereses"""
+
+    @pytest.mark.parametrize("usar_numpy", [False, True])
+    def test_igual_a_aplicar_interes(self, usar_numpy):
+        if usar_numpy:
+            pytest.importorskip("numpy")
+        esperado, _ = armar_banco(Banco())
+        for cuenta in esperado:
+            cuenta.aplicar_interes()
+        banco = Banco()
+        cuentas, corriente = armar_banco(banco)
+        resumen = acumular_intereses(banco, usar_numpy=usar_numpy, tam_bloque=4)
+        assert resumen["cuentas"] == len(SALDOS)
+        assert resumen["acreditadas"] == 4
+        assert [c.saldo for c in cuentas] == [c.saldo for c in esperado]
+        assert [[(t.tipo, t.monto) for t in c.obtener_transacciones()] for c in cuentas] == \
+            [[(t.tipo, t.monto) for t in c.obtener_transacciones()] for c in esperado]
+        assert corriente.saldo == 500.0
+
+    def test_queda_persistido(self, tmp_path):
+        ruta = str(tmp_path / "banco.db")
+        motor = MotorSQLite(ruta)
+        cuentas, _ = armar_banco(Banco(motor))
+        acumular_intereses(Banco(motor), usar_numpy=False)
+        saldos = [c.saldo for c in cuentas]
+        motor.cerrar()
+
+        banco = Banco(MotorSQLite(ruta))
+        assert [banco.buscar_cuenta_por_num(c.numero_cuenta).saldo for c in cuentas] == saldos
+        acreditadas = [banco.buscar_cuenta_por_num(c.numero_cuenta) for c in cuentas if c.tasa_interes and c.saldo]
+        marcas = {c.ultimo_devengo_ns for c in acreditadas}
+        assert len(marcas) == 1 and None not in marcas
+
+    def test_no_se_vuelve_a_devengar(self):
+        banco = Banco()
+        cuentas, _ = armar_banco(banco)
+        fecha_ns = cuentas[1].libro.fecha_ns_en(0) + 1
+        acumular_intereses(banco, usar_numpy=False, fecha_ns=fecha_ns)
+        saldo = cuentas[1].saldo
+        assert cuentas[1].ultimo_devengo_ns == fecha_ns
+        # menos de un período después de la acreditación masiva no hay nada que devengar
+        assert cuentas[1].devengar_interes(datetime.fromtimestamp((fecha_ns + 3_600 * 10 ** 9) / 1e9)) is None
+        assert cuentas[1].saldo == saldo
+
+    def test_aplicar_interes_mueve_la_marca(self):
+        cuentas, _ = armar_banco(Banco())
+        cuenta = cuentas[1]
+        cuenta.aplicar_interes()
+        saldo = cuenta.saldo
+        assert cuenta.ultimo_devengo_ns is not None
+        assert cuenta.devengar_interes() is None
+        assert cuenta.saldo == saldo
+
+    def test_calcular_intereses(self):
+        assert calcular_intereses([100.0, -50.0], [0.1, 0.1], usar_numpy=False) == [100.0 * 0.1, -50.0 * 0.1]
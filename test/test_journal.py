@@ -0,0 +1,241 @@
+import pytest
+from datetime import datetime
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from journal import Journal, recuperar
+from transaccion import Transaccion
+
+
+class TestJournal:
+    """Tests del journal con commit agrupado y su recuperación"""
+
+    @pytest.fixture
+    def ruta(self, tmp_path):
+        return str(tmp_path / "banco.journal")
+
+    def test_recuperar_estado(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        ca = banco.crear_cuenta_ahorro("66666666", tasa_interes=0.05)
+        cc = banco.crear_cuenta_corriente("66666666", limite_descubierto=300)
+        ca.ingresar(1000)
+        ca.retirar(150.5)
+        cc.retirar(200)
+        journal.cerrar()
+
+        recuperado = recuperar(ruta)
+        assert recuperado.buscar_cliente_por_dni("66666666").apellido == "Torres"
+        ca2 = recuperado.buscar_cuenta_por_num(ca.numero_cuenta)
+        cc2 = recuperado.buscar_cuenta_por_num(cc.numero_cuenta)
+        assert ca2.saldo == 849.5
+        assert ca2.tasa_interes == 0.05
+        assert cc2.saldo == -200.0
+        assert cc2.limite_descubierto == 300.0
+        originales = [(t.id, t.tipo, t.monto, t.fecha) for t in ca.obtener_transacciones()]
+        assert [(t.id, t.tipo, t.monto, t.fecha) for t in ca2.obtener_transacciones()] == originales
+
+    def test_cuentas_previas_al_journal(self, ruta):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        journal = Journal(ruta)
+        banco.usar_journal(journal)
+        cuenta.ingresar(10)
+        journal.cerrar()
+        assert journal.registros == 1
+
+    def test_cola_incompleta_se_descarta(self, ruta):
+        journal = Journal(ruta)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        cuenta.ingresar(10)
+        cuenta.ingresar(20)
+        journal.cerrar()
+        with open(ruta, "r+b") as f:
+            f.truncate(Path(ruta).stat().st_size - 3)
+
+        recuperado = recuperar(ruta)
+        assert recuperado.buscar_cuenta_por_num(cuenta.numero_cuenta).saldo == 10.0
+        # al reabrir se trunca la cola rota y se puede seguir agregando
+        journal = Journal(ruta)
+        recuperado.usar_journal(journal)
+        recuperado.buscar_cuenta_por_num(cuenta.numero_cuenta).ingresar(5)
+        journal.cerrar()
+        assert recuperar(ruta).buscar_cuenta_por_num(cuenta.numero_cuenta).saldo == 15.0
+
+    def test_commit_agrupado(self, ruta):
+        journal = Journal(ruta, tam_lote=32, espera_max=0.05)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuentas = [banco.crear_cuenta_ahorro("66666666") for _ in range(16)]
+        fsyncs_previos = journal.fsyncs
+
+        barrera = threading.Barrier(len(cuentas))
+
+        def operar(cuenta):
+            barrera.wait()
+            for _ in range(5):
+                cuenta.ingresar(1)
+
+        hilos = [threading.Thread(target=operar, args=(c,)) for c in cuentas]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        journal.cerrar()
+        # 80 movimientos con menos fsyncs que movimientos
+        assert journal.fsyncs - fsyncs_previos < 80
+        recuperado = recuperar(ruta)
+        assert all(recuperado.buscar_cuenta_por_num(c.numero_cuenta).saldo == 5.0 for c in cuentas)
+
+    def test_journal_cerrado(self, ruta):
+        journal = Journal(ruta)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        journal.cerrar()
+        with pytest.raises(RuntimeError):
+            cuenta.ingresar(10)
+        assert cuenta.saldo == 0.0
+
+    def test_lote_queda_en_el_journal(self, ruta):
+        journal = Journal(ruta)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        banco.procesar_lote([(cuenta.numero_cuenta, "DEP", 10)] * 20 + [(cuenta.numero_cuenta, "RET", 500)])
+        journal.cerrar()
+        assert recuperar(ruta).buscar_cuenta_por_num(cuenta.numero_cuenta).saldo == 200.0
+
+    def test_transferencia_se_recupera_vinculada(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        origen = banco.crear_cuenta_corriente("66666666", limite_descubierto=100)
+        destino = banco.crear_cuenta_ahorro("66666666")
+        retiro, deposito = banco.transferir(origen.numero_cuenta, destino.numero_cuenta, 80)
+        journal.cerrar()
+
+        recuperado = recuperar(ruta)
+        origen2 = recuperado.buscar_cuenta_por_num(origen.numero_cuenta)
+        destino2 = recuperado.buscar_cuenta_por_num(destino.numero_cuenta)
+        assert origen2.saldo == -80.0
+        assert destino2.saldo == 80.0
+        tx = destino2.obtener_transacciones()[0]
+        assert (tx.id, tx.referencia) == (deposito.id, retiro.id)
+
+    def test_devengo_se_recupera_con_su_marca(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666", tasa_interes=0.001)
+        cuenta._aplicar([(Transaccion("DEP", 1000, datetime(2024, 1, 1)), 1000.0)])
+        interes = cuenta.devengar_interes(datetime(2024, 3, 1))
+        journal.cerrar()
+
+        recuperada = recuperar(ruta).buscar_cuenta_por_num(cuenta.numero_cuenta)
+        assert recuperada.saldo == cuenta.saldo
+        assert recuperada.ultimo_devengo_ns == cuenta.ultimo_devengo_ns
+        assert recuperada.obtener_transacciones()[-1].id == interes.id
+
+    def test_bloque_de_intereses_se_recupera_con_su_marca(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        ahorro = banco.crear_cuenta_ahorro("66666666")
+        corriente = banco.crear_cuenta_corriente("66666666", limite_descubierto=100)
+        banco.acreditar_en_bloque([(ahorro, 10.0), (corriente, -2.0)], fecha_ns=1_000, marca_ns=2_000)
+        journal.cerrar()
+
+        recuperado = recuperar(ruta)
+        assert recuperado.buscar_cuenta_por_num(ahorro.numero_cuenta).ultimo_devengo_ns == 2_000
+        assert recuperado.buscar_cuenta_por_num(ahorro.numero_cuenta).saldo == 10.0
+        assert recuperado.buscar_cuenta_por_num(corriente.numero_cuenta).saldo == -2.0
+
+    def test_cierre_de_cuenta_se_recupera(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cerrada = banco.crear_cuenta_ahorro("66666666")
+        abierta = banco.crear_cuenta_corriente("66666666")
+        banco.cerrar_cuenta(cerrada.numero_cuenta)
+        journal.cerrar()
+
+        recuperado = recuperar(ruta)
+        assert recuperado.buscar_cuenta_por_num(cerrada.numero_cuenta) is None
+        assert [c.numero_cuenta for c in recuperado.listar_cuentas_por_cliente("66666666")] == [abierta.numero_cuenta]
+
+    def test_checkpoint_acorta_el_journal(self, ruta):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        ahorro = banco.crear_cuenta_ahorro("66666666")
+        corriente = banco.crear_cuenta_corriente("66666666", limite_descubierto=100)
+        cerrada = banco.crear_cuenta_ahorro("66666666")
+        for _ in range(50):
+            ahorro.ingresar(10)
+        _, deposito = banco.transferir(corriente.numero_cuenta, ahorro.numero_cuenta, 80)
+        banco.cerrar_cuenta(cerrada.numero_cuenta)
+        banco.acreditar_en_bloque([(ahorro, 1.0)], fecha_ns=1_000, marca_ns=2_000)
+        tamano = Path(ruta).stat().st_size
+        assert journal.checkpoint(banco) > 0
+        assert Path(ruta).stat().st_size < tamano
+        ahorro.retirar(20)
+        journal.cerrar()
+        # al reabrir sigue agregando detrás de la cola que quedó
+        journal = Journal(ruta, tam_lote=1)
+        recuperar(ruta).usar_journal(journal)
+        journal.cerrar()
+
+        recuperado = recuperar(ruta)
+        ahorro2 = recuperado.buscar_cuenta_por_num(ahorro.numero_cuenta)
+        assert ahorro2.saldo == ahorro.saldo == 561.0
+        assert ahorro2.ultimo_devengo_ns == 2_000
+        assert recuperado.buscar_cuenta_por_num(corriente.numero_cuenta).saldo == -80.0
+        assert recuperado.buscar_cuenta_por_num(cerrada.numero_cuenta) is None
+        originales = [(t.id, t.tipo, t.monto, t.fecha_ns, t.referencia) for t in ahorro.obtener_transacciones()]
+        assert [(t.id, t.tipo, t.monto, t.fecha_ns, t.referencia)
+                for t in ahorro2.obtener_transacciones()] == originales
+        assert ahorro2.obtener_transacciones()[-3].id == deposito.id
+
+    def test_caida_antes_de_truncar_no_duplica(self, ruta, monkeypatch):
+        journal = Journal(ruta, tam_lote=1)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        cuenta.ingresar(10)
+        # el snapshot quedó escrito pero el journal conserva todo
+        monkeypatch.setattr(journal, "_truncar", lambda hasta: 0)
+        journal.checkpoint(banco)
+        cuenta.ingresar(5)
+        journal.cerrar()
+        recuperada = recuperar(ruta).buscar_cuenta_por_num(cuenta.numero_cuenta)
+        assert recuperada.saldo == 15.0
+        assert len(recuperada.obtener_transacciones()) == 2
+
+    def test_checkpoint_con_movimientos_en_curso(self, ruta):
+        journal = Journal(ruta, tam_lote=8, espera_max=0.001)
+        banco = Banco(journal=journal)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuentas = [banco.crear_cuenta_ahorro("66666666") for _ in range(4)]
+
+        def operar(cuenta):
+            for _ in range(100):
+                cuenta.ingresar(1)
+
+        hilos = [threading.Thread(target=operar, args=(c,)) for c in cuentas]
+        for h in hilos:
+            h.start()
+        journal.checkpoint(banco)
+        for h in hilos:
+            h.join()
+        journal.cerrar()
+        recuperado = recuperar(ruta)
+        assert [recuperado.buscar_cuenta_por_num(c.numero_cuenta).saldo for c in cuentas] == [100.0] * 4
@@ -0,0 +1,106 @@
+import pytest
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from libro_mayor import CAPACIDAD_INICIAL, LibroMayor, TAM_BLOQUE
+from transaccion import Transaccion, fecha_a_ns
+
+
+class TestLibroMayor:
+    """Tests del libro mayor columnar"""
+
+    @pytest.fixture
+    def libro(self):
+        libro = LibroMayor()
+        libro.agregar_transaccion(Transaccion("DEP", 100, datetime(2024, 1, 1, 10, 0, 0, 123456)), 100.0)
+        libro.agregar_transaccion(Transaccion("RET", 30, datetime(2024, 1, 2)), -30.0)
+        libro.agregar_transaccion(Transaccion("DEP", 50, datetime(2024, 1, 3)), 50.0)
+        return libro
+
+    def test_vistas_lazy(self, libro):
+        assert len(libro) == 3
+        tx = libro[0]
+        assert (tx.tipo, tx.monto, tx.fecha) == ("DEP", 100.0, datetime(2024, 1, 1, 10, 0, 0, 123456))
+        assert libro[-1].monto == 50.0
+        assert [t.tipo for t in libro] == ["DEP", "RET", "DEP"]
+        with pytest.raises(IndexError):
+            libro[3]
+
+    def test_id_se_conserva(self):
+        libro = LibroMayor()
+        tx = Transaccion("DEP", 10)
+        libro.agregar_transaccion(tx, 10.0)
+        libro.agregar("DEP", 5, 5.0, fecha_a_ns(datetime.now()), "externa-1")
+        assert libro[0].id == tx.id
+        assert libro[1].id == "externa-1"
+
+    def test_id_unico_con_lectores_concurrentes(self):
+        libro = LibroMayor()
+        libro.extender(["DEP"] * 500, [1.0] * 500, [1.0] * 500, range(500))
+        barrera = threading.Barrier(4)
+        vistos = []
+
+        def leer():
+            barrera.wait()
+            vistos.append([libro.id_en(i) for i in range(500)])
+
+        hilos = [threading.Thread(target=leer) for _ in range(4)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        assert all(ids == vistos[0] for ids in vistos)
+
+    def test_sumas_y_filtros(self, libro):
+        assert libro.suma_montos() == 180.0
+        assert libro.suma_montos("DEP") == 150.0
+        assert libro.suma_deltas() == 120.0
+        assert libro.posiciones(tipo="DEP") == [0, 2]
+        assert libro.posiciones(monto_min=40, monto_max=60) == [2]
+
+    def test_crece_por_bloques(self):
+        libro = LibroMayor()
+        cantidad = TAM_BLOQUE * 2 + 5
+        libro.extender(["DEP"] * cantidad, [1.0] * cantidad, [1.0] * cantidad, list(range(cantidad)))
+        libro.agregar("RET", 2.0, -2.0, cantidad)
+        assert len(libro) == cantidad + 1
+        assert libro.suma_deltas() == cantidad - 2.0
+        assert libro[-1].tipo == "RET"
+        assert len({libro.id_en(i) for i in range(len(libro))}) == len(libro)
+
+    def test_cuenta_chica_reserva_poco(self):
+        libro = LibroMayor()
+        libro.agregar("DEP", 1.0, 1.0, 0)
+        assert libro._capacidad == CAPACIDAD_INICIAL
+        libro.extender(["DEP"] * 10, [1.0] * 10, [1.0] * 10, range(1, 11))
+        assert libro._capacidad == 2 * CAPACIDAD_INICIAL
+        assert libro.suma_deltas() == 11.0
+
+    def test_saldo_hasta_y_flujo(self, libro):
+        assert libro.ordenado
+        assert libro.saldo_hasta(fecha_a_ns(datetime(2023, 12, 31))) == 0.0
+        assert libro.saldo_hasta(fecha_a_ns(datetime(2024, 1, 2))) == 70.0
+        assert libro.saldo_hasta(fecha_a_ns(datetime(2024, 2, 1))) == 120.0
+        assert libro.cantidad_hasta(fecha_a_ns(datetime(2024, 1, 2))) == 2
+        assert libro.flujo(fecha_a_ns(datetime(2024, 1, 1, 12)), fecha_a_ns(datetime(2024, 1, 3))) == 20.0
+        assert libro.saldo_acumulado() == libro.suma_deltas()
+
+    def test_fechas_desordenadas_recorre(self, libro):
+        libro.agregar("DEP", 5.0, 5.0, fecha_a_ns(datetime(2023, 6, 1)))
+        assert not libro.ordenado
+        assert libro.saldo_hasta(fecha_a_ns(datetime(2024, 1, 1))) == 5.0
+        assert libro.saldo_hasta(fecha_a_ns(datetime(2024, 1, 2))) == 75.0
+        assert libro.flujo(fecha_a_ns(datetime(2023, 1, 1)), fecha_a_ns(datetime(2024, 1, 1, 12))) == 105.0
+
+    def test_acumulado_de_extender_igual_a_sumas_sucesivas(self):
+        libro = LibroMayor()
+        deltas = [0.1, 0.2, -0.15, 10.7] * 300
+        libro.extender(["DEP"] * len(deltas), [abs(d) for d in deltas], deltas, range(len(deltas)))
+        saldo = 0.0
+        for i, d in enumerate(deltas):
+            saldo += d
+            assert libro.saldo_hasta(i) == saldo
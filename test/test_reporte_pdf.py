@@ -0,0 +1,203 @@
+import gc
+import io
+import pytest
+import re
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from datetime import datetime
+from almacenamiento import Banco
+from almacenamiento_sqlite import MotorSQLite
+from reporte_pdf import (CacheReportes, EscritorPDF, PDFGenerator, clave_reporte, paginar_extracto,
+                         paginas_de_cuenta)
+from transaccion import Transaccion
+
+
+class TestPDFGenerator:
+    """Tests del reporte PDF de un cliente"""
+
+    @pytest.fixture
+    def banco(self):
+        pytest.importorskip("fpdf")
+        banco = Banco()
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        banco.crear_cuenta_ahorro("66666666").ingresar(100)
+        return banco
+
+    def test_en_memoria_no_toca_el_disco(self, banco, tmp_path):
+        directorio = tmp_path / "reportes"
+        generador = PDFGenerator("a.pdf", str(directorio))
+        cliente = banco.buscar_cliente_por_dni("66666666")
+        contenido = generador.generar_pdf_bytes(cliente, banco.listar_cuentas_por_cliente("66666666"))
+        assert contenido.startswith(b"%PDF")
+        assert not directorio.exists()
+
+    def test_en_disco(self, banco, tmp_path):
+        generador = PDFGenerator("a.pdf", str(tmp_path / "reportes"))
+        cliente = banco.buscar_cliente_por_dni("66666666")
+        assert generador.generar_pdf_cliente(cliente, banco.listar_cuentas_por_cliente("66666666")) == "a.pdf"
+        assert (tmp_path / "reportes" / "a.pdf").read_bytes().startswith(b"%PDF")
+
+    def test_extracto_completo(self, banco, tmp_path):
+        cuenta = banco.listar_cuentas_por_cliente("66666666")[0]
+        cuenta.aplicar_lote([("DEP", 1.0)] * 120)
+        generador = PDFGenerator("extracto.pdf", str(tmp_path))
+        contenido = generador.generar_extracto(cuenta, datetime(2000, 1, 1), datetime(2100, 1, 1), guardar=False,
+                                               filas_por_pagina=50)
+        assert contenido.startswith(b"%PDF")
+        assert b"/Count 3 " in _objetos_por_xref(contenido)[2]
+        # en disco se escribe el mismo documento
+        assert generador.generar_extracto(cuenta, datetime(2000, 1, 1), datetime(2100, 1, 1),
+                                          filas_por_pagina=50) == "extracto.pdf"
+        assert (tmp_path / "extracto.pdf").read_bytes() == contenido
+
+
+def _objetos_por_xref(pdf: bytes) -> dict:
+    """{número: cuerpo} leyendo cada objeto desde el offset que dice la tabla xref"""
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    encabezado, *entradas = pdf[xref:].split(b"trailer")[0].split(b"\n")[1:-1]
+    objetos = {}
+    for numero, entrada in enumerate(entradas[1:], start=1):
+        offset = int(entrada[:10])
+        assert pdf[offset:].startswith(b"%d 0 obj\n" % numero)
+        objetos[numero] = pdf[offset:pdf.index(b"endobj", offset)]
+    assert int(encabezado.split()[1]) == len(entradas)
+    return objetos
+
+
+class TestEscritorPDF:
+    """PDF escrito página por página (no necesita fpdf)"""
+
+    def test_estructura_y_xref(self):
+        salida = io.BytesIO()
+        pdf = EscritorPDF(salida)
+        for numero in range(3):
+            pdf.nueva_pagina()
+            pdf.fuente(10, negrita=numero == 0)
+            pdf.celda(0, 6, f"Página {numero + 1} (de 3) \\ fin", salto=True)
+            pdf.celda(45, 5, "1,234.50", borde=True, alinear="R")
+        pdf.cerrar()
+        contenido = salida.getvalue()
+        assert contenido.startswith(b"%PDF-1.4")
+        objetos = _objetos_por_xref(contenido)
+        assert b"/Count 3 /Kids [6 0 R 8 0 R 10 0 R ]" in objetos[2]
+        primera = zlib.decompress(objetos[5].split(b"stream\n", 1)[1].rsplit(b"\nendstream", 1)[0])
+        # cp1252 byte a byte y paréntesis y barras escapados
+        assert b"/F2 10.00 Tf" in primera and b"(P\xe1gina 1 \\(de 3\\) \\\\ fin) Tj" in primera
+        assert primera.endswith(b" re S")
+
+    def test_escribe_cada_pagina_al_empezar_la_siguiente(self):
+        salida = io.BytesIO()
+        pdf = EscritorPDF(salida)
+        pdf.nueva_pagina()
+        pdf.celda(0, 6, "uno", salto=True)
+        assert b"5 0 obj" not in salida.getvalue()
+        pdf.nueva_pagina()
+        assert b"5 0 obj" in salida.getvalue() and b"6 0 obj" in salida.getvalue()
+        assert b"7 0 obj" not in salida.getvalue()
+
+    def test_sin_paginas_deja_una_en_blanco(self):
+        salida = io.BytesIO()
+        EscritorPDF(salida).cerrar()
+        assert b"/Count 1 /Kids [6 0 R ]" in _objetos_por_xref(salida.getvalue())[2]
+
+
+class TestPaginarExtracto:
+    """Paginación del extracto (no necesita fpdf)"""
+
+    def test_transporte_y_subtotales(self):
+        movimientos = [(i, "DEP" if i % 3 else "RET", 10.0, 10.0 if i % 3 else -10.0) for i in range(7)]
+        paginas = list(paginar_extracto(iter(movimientos), 100.0, filas_por_pagina=3))
+        assert [p["numero"] for p in paginas] == [1, 2, 3]
+        assert [len(p["filas"]) for p in paginas] == [3, 3, 1]
+        for anterior, siguiente in zip(paginas, paginas[1:]):
+            assert siguiente["saldo_anterior"] == anterior["saldo_final"]
+        for p in paginas:
+            assert p["saldo_final"] == p["saldo_anterior"] + p["creditos"] - p["debitos"]
+            assert p["filas"][-1][3] == p["saldo_final"]
+        assert paginas[-1]["saldo_final"] == 100.0 + 10 * 4 - 10 * 3
+
+    def test_sin_movimientos_una_pagina(self):
+        (pagina,) = paginar_extracto([], 55.0)
+        assert (pagina["filas"], pagina["saldo_anterior"], pagina["saldo_final"]) == ([], 55.0, 55.0)
+        with pytest.raises(ValueError):
+            next(paginar_extracto([], 0.0, filas_por_pagina=0))
+
+    def test_perezoso(self):
+        def infinitos():
+            i = 0
+            while True:
+                yield (i, "DEP", 1.0, 1.0)
+                i += 1
+        paginas = paginar_extracto(infinitos(), 0.0, filas_por_pagina=10)
+        assert next(paginas)["saldo_final"] == 10.0
+        assert next(paginas)["saldo_anterior"] == 10.0
+
+    def test_rango_de_fechas_de_la_cuenta(self):
+        banco = Banco()
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_corriente("66666666", limite_descubierto=500)
+        for dia, delta in [(1, 100.0), (5, -30.0), (10, 50.0), (20, -400.0)]:
+            cuenta._aplicar([(Transaccion("DEP" if delta > 0 else "RET", abs(delta), datetime(2024, 3, dia)), delta)])
+        (pagina,) = paginas_de_cuenta(cuenta, datetime(2024, 3, 5), datetime(2024, 3, 10))
+        assert pagina["saldo_anterior"] == 100.0
+        assert [(f[1], f[3]) for f in pagina["filas"]] == [("RET", 70.0), ("DEP", 120.0)]
+
+
+class TestCacheReportes:
+    """Caché de reportes por versión de cuenta (no necesita fpdf)"""
+
+    def test_clave_cambia_con_la_version(self):
+        banco = Banco()
+        cliente = banco.crear_cliente("Ana", "Torres", "66666666")
+        cuenta = banco.crear_cuenta_ahorro("66666666")
+        antes = clave_reporte(cliente, [cuenta])
+        assert clave_reporte(cliente, [cuenta]) == antes
+        cuenta.ingresar(10)
+        assert clave_reporte(cliente, [cuenta]) != antes
+        assert clave_reporte(cliente, [cuenta], "otra") != clave_reporte(cliente, [cuenta])
+
+    def test_clave_sobrevive_a_la_recarga_de_la_cuenta(self, tmp_path):
+        motor = MotorSQLite(str(tmp_path / "banco.db"))
+        banco = Banco(motor)
+        banco.crear_cliente("Ana", "Torres", "66666666")
+        numero = banco.crear_cuenta_ahorro("66666666").numero_cuenta
+        gc.collect()
+        inicial = clave_reporte(banco.buscar_cliente_por_dni("66666666"), banco.listar_cuentas_por_cliente("66666666"))
+        banco.buscar_cuenta_por_num(numero).ingresar(5)
+        gc.collect()  # el motor suelta la cuenta y la vuelve a leer de la base
+        recargada = banco.listar_cuentas_por_cliente("66666666")
+        clave = clave_reporte(banco.buscar_cliente_por_dni("66666666"), recargada)
+        assert clave != inicial
+        recargada[0].ingresar(1)
+        assert clave_reporte(recargada[0].cliente, recargada) != clave
+        motor.cerrar()
+
+    def test_aciertos_y_desalojo_por_tamano(self):
+        cache = CacheReportes(max_bytes=10)
+        generados = []
+
+        def generar(contenido):
+            def _generar():
+                generados.append(contenido)
+                return contenido
+            return _generar
+
+        assert cache.obtener("a", generar(b"aaaa")) == b"aaaa"
+        assert cache.obtener("a", generar(b"otro")) == b"aaaa"
+        cache.obtener("b", generar(b"bbbb"))
+        cache.obtener("a", generar(b"aaaa"))  # "a" pasa a ser la más reciente
+        cache.obtener("c", generar(b"cccc"))  # no entra todo: se va "b"
+        assert generados == [b"aaaa", b"bbbb", b"cccc"]
+        cache.obtener("b", generar(b"bbbb"))
+        assert generados[-1] == b"bbbb"
+        cache.obtener("x", generar(b"x" * 11))  # más grande que la caché: no se guarda
+        estadisticas = cache.estadisticas()
+        assert estadisticas["aciertos"] == 2
+        assert estadisticas["fallos"] == 5
+        assert estadisticas["bytes"] <= 10
+        assert estadisticas["desalojos"] == 2
+        assert estadisticas["tasa_aciertos"] == pytest.approx(2 / 7)
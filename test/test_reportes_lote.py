@@ -0,0 +1,107 @@
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import reporte_pdf
+from almacenamiento import Banco
+from almacenamiento_sqlite import LectorSQLite, MotorSQLite
+from reporte_pdf import datos_cliente, datos_guardados, ruta_reporte
+from reportes_lote import generar_reportes, rango_periodo
+from transaccion import Transaccion
+
+
+def armar_banco(clientes: int, motor=None) -> Banco:
+    banco = Banco(motor)
+    for i in range(clientes):
+        dni = str(30_000_000 + i * 37)
+        banco.crear_cliente("Ana", "Torres", dni)
+        banco.crear_cuenta_ahorro(dni).ingresar(100 + i)
+    return banco
+
+
+class TestReportesLote:
+    """Tests de la generación masiva de reportes"""
+
+    def test_ruta_particionada(self):
+        assert ruta_reporte("reportes", "12345678", "a.pdf") == str(Path("reportes", "78", "56", "a.pdf"))
+        assert ruta_reporte("reportes", "7", "a.pdf") == str(Path("reportes", "07", "00", "a.pdf"))
+
+    def test_datos_planos(self):
+        banco = armar_banco(1)
+        cliente = banco.listar_clientes()[0]
+        cuentas = banco.listar_cuentas_por_cliente(cliente.dni)
+        datos = datos_cliente(cliente, cuentas)
+        assert datos["dni"] == cliente.dni
+        numero, clase, saldo, movimientos = datos["cuentas"][0]
+        assert (numero, clase, saldo) == (cuentas[0].numero_cuenta, "CuentaAhorro", 100.0)
+        assert [(tipo, monto) for _, tipo, monto in movimientos] == [("DEP", 100.0)]
+
+    def test_rango_periodo(self):
+        desde, hasta = rango_periodo("2024-02")
+        assert desde == datetime(2024, 2, 1)
+        assert hasta == datetime(2024, 2, 29, 23, 59, 59, 999999)
+        assert rango_periodo("2024-12")[1] == datetime(2024, 12, 31, 23, 59, 59, 999999)
+        with pytest.raises(ValueError):
+            rango_periodo("mayo")
+
+    def test_datos_del_periodo(self):
+        banco = Banco()
+        cliente = banco.crear_cliente("Ana", "Torres", "30000000")
+        cuenta = banco.crear_cuenta_ahorro(cliente.dni)
+        for fecha, monto in ((datetime(2024, 4, 30), 100.0), (datetime(2024, 5, 10), 50.0),
+                             (datetime(2024, 5, 20), 25.0), (datetime(2024, 6, 1), 1000.0)):
+            cuenta._aplicar([(Transaccion("DEP", monto, fecha), monto)])
+        datos = datos_cliente(cliente, [cuenta], rango_periodo("2024-05"), filas_por_pagina=1)
+        numero, _, saldo, paginas = datos["cuentas"][0]
+        # solo los movimientos de mayo, con el saldo al cerrar el mes
+        assert numero == cuenta.numero_cuenta and saldo == 175.0
+        assert paginas[0]["saldo_anterior"] == 100.0
+        assert [f[2] for p in paginas for f in p["filas"]] == [50.0, 25.0]
+
+    def test_datos_del_periodo_desde_el_archivo(self, tmp_path):
+        ruta = str(tmp_path / "banco.db")
+        banco = Banco(MotorSQLite(ruta))
+        cliente = banco.crear_cliente("Ana", "Torres", "30000000")
+        cuenta = banco.crear_cuenta_ahorro(cliente.dni)
+        for fecha, monto in ((datetime(2024, 4, 30), 100.0), (datetime(2024, 5, 10), 50.0),
+                             (datetime(2024, 5, 20), 25.0), (datetime(2024, 6, 1), 1000.0)):
+            cuenta._aplicar([(Transaccion("DEP", monto, fecha), monto)])
+        desde, hasta = rango_periodo("2024-05")
+        esperado = datos_cliente(cliente, [cuenta], (desde, hasta), filas_por_pagina=1)
+        lector = LectorSQLite(ruta)
+        with lector.foto():
+            datos = datos_guardados(lector, cliente.dni, esperado["periodo"], filas_por_pagina=1)
+            cuentas = [(numero, clase, saldo, list(paginas)) for numero, clase, saldo, paginas in datos["cuentas"]]
+        lector.cerrar()
+        assert cuentas == esperado.pop("cuentas")
+        del datos["cuentas"]
+        assert datos == esperado
+
+    def test_sin_fpdf(self, monkeypatch):
+        monkeypatch.setattr(reporte_pdf, "FPDF", None)
+        with pytest.raises(ImportError):
+            generar_reportes(armar_banco(1))
+
+    @pytest.mark.parametrize("procesos", [0, 2])
+    def test_un_pdf_por_cliente(self, tmp_path, procesos):
+        pytest.importorskip("fpdf")
+        banco = armar_banco(7)
+        avances = []
+        resumen = generar_reportes(banco, str(tmp_path), "2024-05", procesos=procesos, tam_lote=3,
+                                   progreso=lambda hechos, total: avances.append((hechos, total)))
+        assert resumen["pdfs"] == 7
+        assert sorted(avances)[-1] == (7, 7)
+        archivos = sorted(p.name for p in tmp_path.rglob("*.pdf"))
+        assert archivos == sorted(f"cliente_{c.dni}_2024-05.pdf" for c in banco.listar_clientes())
+
+    @pytest.mark.parametrize("procesos", [0, 2])
+    def test_banco_en_sqlite(self, tmp_path, procesos):
+        pytest.importorskip("fpdf")
+        banco = armar_banco(7, MotorSQLite(str(tmp_path / "banco.db")))
+        resumen = generar_reportes(banco, str(tmp_path / "reportes"), "2024-05", procesos=procesos, tam_lote=3)
+        assert resumen["pdfs"] == 7
+        archivos = sorted(p.name for p in (tmp_path / "reportes").rglob("*.pdf"))
+        assert archivos == sorted(f"cliente_{c.dni}_2024-05.pdf" for c in banco.listar_clientes())
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from almacenamiento import Banco
+from servicio import ServicioBanco
+
+
+async def _pedir(reader, writer, metodo, ruta, datos=None):
+    cuerpo = json.dumps(datos).encode() if datos is not None else b""
+    writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode() + cuerpo)
+    await writer.drain()
+    estado = int((await reader.readline()).split()[1])
+    encabezados = {}
+    while True:
+        linea = await reader.readline()
+        if linea == b"\r\n":
+            break
+        nombre, _, valor = linea.decode().partition(":")
+        encabezados[nombre.lower()] = valor.strip()
+    respuesta = await reader.readexactly(int(encabezados["content-length"]))
+    return estado, json.loads(respuesta)
+
+
+def _con_servicio(prueba, **opciones):
+    async def correr():
+        servicio = ServicioBanco(Banco(), **opciones)
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+        try:
+            await prueba(servicio, reader, writer)
+        finally:
+            writer.close()
+            await servicio.cerrar()
+    asyncio.run(correr())
+
+
+class TestServicio:
+    """Tests del servicio HTTP/JSON sobre Banco"""
+
+    def test_flujo_completo_en_una_conexion(self):
+        async def prueba(servicio, reader, writer):
+            estado, cliente = await _pedir(reader, writer, "POST", "/clientes",
+                                           {"nombre": "Ana", "apellido": "Torres", "dni": "66666666"})
+            assert estado == 201 and cliente["dni"] == "66666666"
+            estado, cuenta = await _pedir(reader, writer, "POST", "/clientes/66666666/cuentas",
+                                          {"tipo": "corriente", "limite_descubierto": 100})
+            assert estado == 201
+            numero = cuenta["numero_cuenta"]
+            estado, dep = await _pedir(reader, writer, "POST", f"/cuentas/{numero}/depositos", {"monto": 50})
+            assert estado == 201 and dep["saldo"] == 50.0
+            estado, ret = await _pedir(reader, writer, "POST", f"/cuentas/{numero}/retiros", {"monto": 120})
+            assert estado == 201 and ret["saldo"] == -70.0
+            estado, historial = await _pedir(reader, writer, "GET", f"/cuentas/{numero}/historial?limite=1")
+            assert estado == 200 and historial["total"] == 2
+            assert [t["tipo"] for t in historial["transacciones"]] == ["DEP"]
+            estado, lote = await _pedir(reader, writer, "POST", "/lotes",
+                                        {"operaciones": [[numero, "DEP", 10], ["noexiste", "DEP", 1]]})
+            assert estado == 200 and lote["resultados"] == [None, "Cuenta no encontrada"]
+            estado, datos = await _pedir(reader, writer, "GET", "/clientes/66666666")
+            assert estado == 200 and datos["cuentas"][0]["saldo"] == -60.0
+        _con_servicio(prueba)
+
+    def test_errores(self):
+        async def prueba(servicio, reader, writer):
+            assert (await _pedir(reader, writer, "GET", "/cuentas/noexiste"))[0] == 404
+            assert (await _pedir(reader, writer, "GET", "/nada"))[0] == 404
+            assert (await _pedir(reader, writer, "DELETE", "/clientes"))[0] == 405
+            estado, datos = await _pedir(reader, writer, "POST", "/clientes", {"nombre": "Ana"})
+            assert estado == 400 and "error" in datos
+        _con_servicio(prueba)
+
+    def test_listado_paginado(self):
+        async def prueba(servicio, reader, writer):
+            servicio.banco.crear_clientes_lote(("Ana", "Torres", str(70_000_000 + i)) for i in range(5))
+            estado, datos = await _pedir(reader, writer, "GET", "/clientes?desde=3&limite=10")
+            assert estado == 200 and datos["total"] == 5 and datos["desde"] == 3
+            assert [c["dni"] for c in datos["clientes"]] == ["70000003", "70000004"]
+            estado, datos = await _pedir(reader, writer, "GET", "/clientes?limite=0")
+            assert estado == 200 and datos["clientes"] == []
+        _con_servicio(prueba)
+
+    def test_monto_no_finito_responde_400(self):
+        async def prueba(servicio, reader, writer):
+            await _pedir(reader, writer, "POST", "/clientes", {"nombre": "Ana", "apellido": "Torres", "dni": "66666666"})
+            _, cuenta = await _pedir(reader, writer, "POST", "/clientes/66666666/cuentas", {"tipo": "ahorro"})
+            numero = cuenta["numero_cuenta"]
+            # json.dumps escribe NaN e Infinity tal cual, como lo haría un cliente descuidado
+            for monto in (float("nan"), float("inf")):
+                estado, datos = await _pedir(reader, writer, "POST", f"/cuentas/{numero}/depositos", {"monto": monto})
+                assert estado == 400 and "finito" in datos["error"]
+            estado, datos = await _pedir(reader, writer, "GET", f"/cuentas/{numero}")
+            assert estado == 200 and datos["saldo"] == 0.0
+        _con_servicio(prueba)
+
+    def test_parametros_de_cuenta_invalidos_responden_400(self):
+        async def prueba(servicio, reader, writer):
+            await _pedir(reader, writer, "POST", "/clientes", {"nombre": "Ana", "apellido": "Torres", "dni": "66666666"})
+            for tipo, campo in (("ahorro", "tasa_interes"), ("corriente", "limite_descubierto")):
+                for valor in ("inf", "nan", float("inf"), -1, "abc", None):
+                    estado, datos = await _pedir(reader, writer, "POST", "/clientes/66666666/cuentas",
+                                                 {"tipo": tipo, campo: valor})
+                    assert estado == 400 and campo in datos["error"]
+            estado, datos = await _pedir(reader, writer, "GET", "/clientes/66666666")
+            assert estado == 200 and datos["cuentas"] == []
+            estado, cuenta = await _pedir(reader, writer, "POST", "/clientes/66666666/cuentas",
+                                          {"tipo": "corriente", "limite_descubierto": "250"})
+            assert estado == 201 and cuenta["limite_descubierto"] == 250.0
+        _con_servicio(prueba)
+
+    def test_cola_llena_responde_503(self):
+        async def prueba(servicio, reader, writer):
+            # sin trabajadores nadie vacía la cola: el segundo pedido no entra
+            for tarea in servicio._trabajadores:
+                tarea.cancel()
+            otro = await asyncio.open_connection("127.0.0.1", servicio._servidor.sockets[0].getsockname()[1])
+            primero = asyncio.create_task(_pedir(*otro, "GET", "/clientes"))
+            await asyncio.sleep(0.05)
+            estado, _ = await _pedir(reader, writer, "GET", "/clientes")
+            assert estado == 503
+            assert servicio.rechazados == 1
+            primero.cancel()
+            otro[1].close()
+        _con_servicio(prueba, tam_cola=1, espera_cola=0.05)
@@ -26,4 +26,30 @@ class TestTransaccion:
     def test_monto_negativo(self):
         """Prueba transacción con monto negativo"""
         with pytest.raises(ValueError):
-            Transaccion(tipo="ingreso", monto=-100, cuenta_numero="003")
\ No newline at end of file
+            Transaccion(tipo="ingreso", monto=-100, cuenta_numero="003")
+
+class TestTransaccionLigera:
+    """Tests de la Transaccion con __slots__, id perezoso y fecha en ns"""
+
+    def test_sin_dict(self):
+        trans = Transaccion("DEP", 10)
+        assert not hasattr(trans, "__dict__")
+
+    def test_id_estable(self):
+        trans = Transaccion("DEP", 10)
+        assert trans.id == trans.id
+        assert trans.to_dict()["id"] == trans.id
+
+    def test_fecha_exacta(self):
+        fecha = datetime(2024, 5, 17, 13, 45, 10, 987654)
+        trans = Transaccion("RET", 10, fecha)
+        assert trans.fecha == fecha
+        assert Transaccion("RET", 10, fecha_ns=trans.fecha_ns).fecha == fecha
+
+    def test_id_compartido_con_el_libro(self):
+        from libro_mayor import LibroMayor
+        libro = LibroMayor()
+        trans = Transaccion("DEP", 10)
+        libro.agregar_transaccion(trans, 10.0)
+        # el id se genera una sola vez, lo pida la vista del libro o el objeto original
+        assert libro[0].id == trans.id == libro[0].id